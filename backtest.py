@@ -0,0 +1,230 @@
+"""
+저장된 예측 모델의 롤링 원점(rolling-origin) 백테스트.
+
+train_offline.py 의 테스트 점수는 1스텝 예측(final_model.predict(X_test))만 잰다.
+여기서는 실제로 배포되는 7일 예측(재귀 / 직접)을 이력의 여러 시작점(원점)에서 다시 돌려
+horizon 별 MAE/RMSE/MAPE 곡선과 원점별 소요 시간을 구한다.
+
+    $ python backtest.py                          # LATEST 모델, 학습 구간 이후 하루 간격 원점
+    $ python backtest.py --step-hours 6 --workers 8
+    $ python backtest.py --start 2020-03-01       # 학습 구간 안쪽(in-sample) 원점까지 포함
+    $ python backtest.py --site oxley             # 다른 관측 지점 (지점 폴더의 모델/데이터)
+
+재귀 예측의 피처 상태는 원점마다 전체 이력으로 새로 만들지 않는다.
+상태 하나를 원점 순서대로 이어 붙이면서(extend) 원점마다 사본을 떠 프로세스 풀에 넘긴다.
+
+예측은 마지막 관측 시각 + k * 간격의 정규 시각에 놓이므로, 실제값도 행 위치가 아니라
+그 시각으로 맞춘다. 센서 데이터에 빠진 구간이 있으면 그 칸은 실제값이 없는 것으로 보고 평가에서 뺀다.
+"""
+import argparse
+import copy
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import lightgbm as lgb
+import numpy as np
+import pandas as pd
+
+import train_offline as T
+
+BACKTEST_DIR = Path(__file__).parent / "data" / "backtest"   # <모델 버전>/horizon.csv, origins.csv
+
+
+# =====================================================================
+# 원점 + 피처 상태
+# =====================================================================
+def origin_positions(index, start, n_steps, step_td, freq_td):
+    """
+    예측 시작 위치 목록. 원점 p 는 index[:p] 까지 보고 index[p - 1] + k * freq_td (k = 1..n_steps) 를 예측한다.
+    start 이후 step_td 시간 간격으로, 예측 구간 끝이 마지막 관측을 넘지 않는 위치를 고른다.
+    빠진 구간이 있어도 원점 간격은 행 수가 아니라 시간으로 유지된다.
+    """
+    first_time = index[T.HISTORY_SPAN - 1] if len(index) >= T.HISTORY_SPAN else None
+    last_time = index[-1] - n_steps * freq_td if len(index) else None
+    if first_time is None or last_time < first_time:
+        return []
+    times = pd.date_range(max(pd.Timestamp(start), first_time), last_time, freq=step_td)
+    # 각 원점 시각까지 관측된 행 수 = 위치 (빈 구간 안의 원점은 직전 관측으로 모인다)
+    positions = np.unique(index.searchsorted(times, side="right"))
+    return [int(p) for p in positions if p >= T.HISTORY_SPAN]
+
+
+def iter_origin_payloads(df, positions, meta):
+    """
+    원점마다 (위치, 예측 입력, 준비 시간(s)). 입력은 재귀면 피처 상태 사본, 직접이면 꼬리 구간.
+    재귀 상태는 직전 원점 상태에 그 사이 관측값만 이어 붙여 만든다.
+    """
+    state, prev = None, None
+    for p in positions:
+        t0 = time.perf_counter()
+        if meta["strategy"] == "direct":
+            payload = df.iloc[max(0, p - T.HISTORY_SPAN):p]
+        else:
+            if state is None:
+                state = T.IncrementalFeatureState(
+                    df.iloc[:p], meta["target_col"], exog_cols=meta["exog_cols"], lag_list=[2]
+                )
+            else:
+                state.extend(df.iloc[prev:p])
+            # 제출한 작업은 나중에 직렬화되므로, 계속 이어 붙일 원본 대신 사본을 넘긴다
+            payload = copy.deepcopy(state)
+        prev = p
+        yield p, payload, time.perf_counter() - t0
+
+
+# =====================================================================
+# 워커
+# =====================================================================
+_worker = {}
+
+
+def _init_worker(model_file, meta):
+    # 부스터는 워커마다 한 번만 읽는다 (작업마다 직렬화하지 않음)
+    _worker["booster"] = lgb.Booster(model_file=str(model_file))
+    _worker["meta"] = meta
+
+
+def _forecast_origin(p, payload):
+    booster, meta = _worker["booster"], _worker["meta"]
+    t0 = time.perf_counter()
+    if meta["strategy"] == "direct":
+        pred = T.forecast_from_artifact(payload, booster, meta)
+    else:
+        pred = T.roll_forward(
+            payload, booster, meta["n_steps"], pd.Timedelta(meta["freq"]), pd.Series(meta["feature_means"])
+        )
+    return p, pred.to_numpy(dtype=float), time.perf_counter() - t0
+
+
+# =====================================================================
+# 실행 + 집계
+# =====================================================================
+def run_backtest(df, model_file, meta, positions, workers=None):
+    """
+    원점별 예측을 프로세스 풀에서 돌린다.
+    (예측 행렬 (원점 수, n_steps), 실제값 행렬, 원점별 시간표) 를 돌려준다.
+    """
+    n_steps = meta["n_steps"]
+    freq_td = pd.Timedelta(meta["freq"])
+    y = df[meta["target_col"]].astype(float)
+    preds = np.full((len(positions), n_steps), np.nan)
+    # 실제값은 예측과 같은 정규 시각으로 맞춘다 (그 시각에 관측이 없으면 NaN)
+    lead = freq_td * np.arange(1, n_steps + 1)
+    actual = np.full_like(preds, np.nan)
+    for i, p in enumerate(positions):
+        actual[i] = y.reindex(df.index[p - 1] + lead).to_numpy()
+    row_of = {p: i for i, p in enumerate(positions)}
+    timings = pd.DataFrame(
+        {"origin": df.index[np.asarray(positions, dtype=int) - 1] + freq_td, "state_s": np.nan, "forecast_s": np.nan},
+        index=pd.Index(positions, name="position"),
+    )
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(model_file, meta)) as pool:
+        futures = []
+        for p, payload, t_state in iter_origin_payloads(df, positions, meta):
+            timings.loc[p, "state_s"] = t_state
+            futures.append(pool.submit(_forecast_origin, p, payload))
+        for fut in futures:
+            p, pred, t_fore = fut.result()
+            preds[row_of[p]] = pred
+            timings.loc[p, "forecast_s"] = t_fore
+
+    return preds, actual, timings.reset_index(drop=True)
+
+
+def horizon_metrics(preds, actual, freq_td):
+    """horizon(스텝)별 MAE/RMSE/MAPE(%) 와 평가에 쓰인 원점 수. 실제값이 NaN 인 칸은 뺀다."""
+    err = preds - actual
+    valid = ~np.isnan(err)
+    n = valid.sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mae = np.nanmean(np.abs(err), axis=0)
+        rmse = np.sqrt(np.nanmean(err ** 2, axis=0))
+        # mean_abs_percentage_error 와 같이 실제값이 0 에 가까운 칸은 뺀다
+        ape = np.where(np.abs(actual) > 1e-6, np.abs(err / actual), np.nan)
+        mape = np.nanmean(ape, axis=0) * 100.0
+
+    steps = np.arange(1, preds.shape[1] + 1)
+    return pd.DataFrame({
+        "step": steps,
+        "lead_time": pd.to_timedelta(steps * freq_td),
+        "mae": mae,
+        "rmse": rmse,
+        "mape": mape,
+        "n_origins": n,
+    })
+
+
+def daily_metrics(horizon, freq_td):
+    """horizon 곡선을 예측 일차(1일차, 2일차, ...)별 평균으로 묶는다."""
+    day = (horizon["step"] - 1) * freq_td // pd.Timedelta(days=1) + 1
+    return horizon.groupby(day.rename("day"))[["mae", "rmse", "mape"]].mean()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="저장된 모델의 롤링 원점 백테스트 (7일 예측 재현)")
+    parser.add_argument("--site", default=None, help="관측 지점 id (기본: 첫 지점)")
+    parser.add_argument("--model-dir", type=Path, default=None,
+                        help="모델 아티팩트 폴더 (버전별 하위 폴더 + LATEST, 기본: 지점 폴더의 models)")
+    parser.add_argument("--model-version", default=None, help="평가할 모델 버전 (기본: LATEST)")
+    parser.add_argument("--start", default=None,
+                        help="첫 원점 하한 시각 (기본: 모델 학습 데이터 마지막 시각 → 표본 외 평가)")
+    parser.add_argument("--step-hours", type=float, default=24,
+                        help="원점 간격(시간)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="예측 프로세스 수")
+    parser.add_argument("--out", type=Path, default=BACKTEST_DIR,
+                        help="결과 폴더 (<모델 버전>/horizon.csv, origins.csv)")
+    return parser.parse_args(argv)
+
+
+def main(args=None):
+    if args is None:
+        args = parse_args()
+
+    model_dir = T.site_output_paths(args.site, args.model_dir)["model_dir"]
+    booster, meta = T.load_model_artifact(model_dir, args.model_version)
+    version = meta["model_version"]
+    print("모델:", version, f"({meta['strategy']}, 학습 데이터 ~{meta['trained_until']})")
+
+    df, _, freq_td = T.load_training_frame(site=args.site)
+    if freq_td != pd.Timedelta(meta["freq"]):
+        raise ValueError(f"데이터 간격 {freq_td} 가 모델 학습 간격 {meta['freq']} 과 다릅니다.")
+
+    start = args.start or meta["trained_until"]
+    step_td = max(freq_td, pd.Timedelta(hours=args.step_hours))
+    positions = origin_positions(df.index, start, meta["n_steps"], step_td, freq_td)
+    if not positions:
+        raise ValueError(f"{start} 이후에 {meta['n_steps']} 스텝 실제값이 남는 원점이 없습니다 (--start 를 앞당기세요).")
+    print(f"원점: {len(positions)}개 ({df.index[positions[0] - 1]} ~ {df.index[positions[-1] - 1]} 까지 관측, "
+          f"{step_td} 간격)")
+
+    t0 = time.perf_counter()
+    preds, actual, timings = run_backtest(
+        df, model_dir / version / "model.txt", meta, positions, args.workers
+    )
+    wall = time.perf_counter() - t0
+
+    horizon = horizon_metrics(preds, actual, freq_td)
+    out_dir = args.out / version
+    out_dir.mkdir(parents=True, exist_ok=True)
+    horizon.to_csv(out_dir / "horizon.csv", index=False, encoding="utf-8-sig")
+    timings.to_csv(out_dir / "origins.csv", index=False, encoding="utf-8-sig")
+
+    print("\n=== 예측 일차별 성능 (horizon 평균) ===")
+    print(f"{'일차':>4} {'MAE':>8} {'RMSE':>8} {'MAPE(%)':>8}")
+    for day, row in daily_metrics(horizon, freq_td).iterrows():
+        print(f"{day:>4} {row['mae']:>8.4f} {row['rmse']:>8.4f} {row['mape']:>8.2f}")
+
+    print("\n=== 원점별 시간 ===")
+    print(f"상태 준비 : 평균 {timings['state_s'].mean() * 1000:8.1f} ms (첫 원점 {timings['state_s'].iloc[0] * 1000:.1f} ms)")
+    print(f"예측      : 평균 {timings['forecast_s'].mean() * 1000:8.1f} ms / 최대 {timings['forecast_s'].max() * 1000:.1f} ms")
+    print(f"전체      : {wall:.1f} s (워커 {args.workers}개)")
+    print(f'\n결과 저장: "{out_dir}"')
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,414 @@
+import argparse
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import train_offline as T
+
+
+# =====================================================================
+# 합성 센서 데이터
+# =====================================================================
+def make_synthetic_sensor_data(days, freq="10min", seed=0, nan_frac=0.0):
+    """df_final.csv 와 같은 컬럼 구성을 가진 10분 간격 합성 데이터."""
+    rng = np.random.default_rng(seed)
+    idx = pd.date_range("2020-01-01", periods=int(pd.Timedelta(days=days) / pd.Timedelta(freq)),
+                        freq=freq, name="Timestamp")
+    n = len(idx)
+    t = np.arange(n)
+    day = 2 * np.pi * t / 144
+
+    chl = 3 + np.sin(day) + 0.5 * np.sin(day / 365) + rng.normal(0, 0.05, n).cumsum() * 0.01
+    cols = {
+        T.RAW_COL: chl + rng.normal(0, 0.2, n),
+        T.TARGET_COL: chl,
+    }
+    for i, col in enumerate(T.EXOG_COLS):
+        cols[col] = 10 + 3 * np.sin(day + i) + rng.normal(0, 0.5, n)
+
+    df = pd.DataFrame(cols, index=idx)
+    if nan_frac > 0:
+        df = df.mask(rng.random(df.shape) < nan_frac)
+        df[T.TARGET_COL] = chl
+    return df
+
+
+def _timeit(fn, repeat):
+    best = np.inf
+    out = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+# =====================================================================
+# 벤치마크
+# =====================================================================
+def bench_features(days, repeat):
+    df = make_synthetic_sensor_data(days)
+    print(f"합성 데이터: {len(df):,} 행 ({days}일)")
+
+    t_old, (feats, _) = _timeit(
+        lambda: T.make_features_with_diff(df, T.TARGET_COL, exog_cols=T.EXOG_COLS, dropna=False),
+        repeat,
+    )
+    t_new, (X, names) = _timeit(
+        lambda: T.build_feature_matrix(df, T.TARGET_COL, exog_cols=T.EXOG_COLS),
+        repeat,
+    )
+
+    ref = feats.to_numpy(dtype=float)
+    err = np.nanmax(np.abs(ref - X) / np.maximum(1.0, np.abs(ref)))
+    print(f"make_features_with_diff : {t_old * 1000:8.1f} ms  ({feats.memory_usage().sum() / 1e6:.1f} MB)")
+    print(f"build_feature_matrix    : {t_new * 1000:8.1f} ms  ({X.nbytes / 1e6:.1f} MB)")
+    print(f"속도 향상: x{t_old / t_new:.1f} / 최대 상대 오차: {err:.2e}")
+
+
+def bench_strategy(days, n_origins):
+    df = make_synthetic_sensor_data(days)
+    freq_td = pd.Timedelta("10min")
+    n_steps = int(pd.Timedelta("7D") / freq_td)
+    steps_day = int(pd.Timedelta("1D") / freq_td)
+
+    # 마지막 (n_origins 일 + 7일) 구간에서 하루 간격으로 예측 시작점을 잡는다
+    origins = [len(df) - n_steps - k * steps_day for k in range(n_origins)][::-1]
+    train_end = df.index[origins[0] - 1]
+
+    X_mat, names = T.build_feature_matrix(df, T.TARGET_COL, exog_cols=T.EXOG_COLS)
+    valid = ~np.isnan(X_mat).any(axis=1) & (df.index <= train_end)
+    X_train = pd.DataFrame(X_mat[valid], index=df.index[valid], columns=names)
+    y_train = df.loc[valid, T.TARGET_COL]
+    feature_means = X_train.mean()
+
+    params = {
+        "objective": "regression",
+        "random_state": T.SEED,
+        "verbose": -1,
+        "n_estimators": 300,
+        "learning_rate": 0.05,
+        "num_leaves": 63,
+    }
+    print(f"합성 데이터: {len(df):,} 행 / 학습: {len(X_train):,} 행 / 시작점: {n_origins}개")
+
+    t0 = time.perf_counter()
+    step_model = T.LGBMRegressor(**params).fit(X_train, y_train)
+    t_fit_rec = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    direct_model = T.fit_direct_model(df, X_train, T.TARGET_COL, n_steps, freq_td, params)
+    t_fit_dir = time.perf_counter() - t0
+
+    results = {"recursive": ([], []), "direct": ([], [])}
+    for p in origins:
+        hist = df.iloc[:p]
+        actual = df[T.TARGET_COL].iloc[p:p + n_steps].to_numpy()
+        for name, fn, model in [
+            ("recursive", T.recursive_forecast, step_model),
+            ("direct", T.direct_forecast, direct_model),
+        ]:
+            t0 = time.perf_counter()
+            pred = fn(hist, model, T.TARGET_COL, n_steps, freq_td, feature_means, T.EXOG_COLS)
+            results[name][0].append(time.perf_counter() - t0)
+            results[name][1].append(np.abs(pred.to_numpy() - actual))
+
+    print(f"{'방식':<10} {'학습(s)':>8} {'예측/시작점(s)':>14} {'MAE':>8} {'MAE 1일차':>9} {'MAE 7일차':>9}")
+    for name, t_fit in [("recursive", t_fit_rec), ("direct", t_fit_dir)]:
+        times, errs = results[name]
+        err = np.mean(errs, axis=0)
+        print(f"{name:<10} {t_fit:>8.1f} {np.mean(times):>14.3f} {err.mean():>8.4f} "
+              f"{err[:steps_day].mean():>9.4f} {err[-steps_day:].mean():>9.4f}")
+
+
+_COLD_LOAD = """
+import sys, time
+import data_store
+t0 = time.perf_counter()
+df = data_store.load_sensor_data(sys.argv[1], sys.argv[2])
+print(time.perf_counter() - t0, df.memory_usage(deep=True).sum())
+"""
+
+
+def _cold_load(csv_path, store_path):
+    # 새 프로세스에서 재야 import/캐시 효과 없이 앱 첫 로드와 같은 조건이 된다
+    out = subprocess.run(
+        [sys.executable, "-c", _COLD_LOAD, str(csv_path), str(store_path)],
+        capture_output=True, text=True, check=True, cwd=Path(__file__).parent,
+    ).stdout.split()
+    return float(out[0]), int(out[1])
+
+
+def bench_load(days):
+    import data_store
+
+    df = make_synthetic_sensor_data(days).reset_index()
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = Path(tmp) / "df_final.csv"
+        store_path = Path(tmp) / "df_final.parquet"
+        df.to_csv(csv_path, index=False)
+        print(f"합성 데이터: {len(df):,} 행 ({days}일)")
+
+        t_csv, mem_csv = _cold_load(csv_path, store_path)
+        t0 = time.perf_counter()
+        data_store.convert_csv_to_store(csv_path, store_path)
+        t_conv = time.perf_counter() - t0
+        t_pq, mem_pq = _cold_load(csv_path, store_path)
+
+        print(f"CSV     : {t_csv * 1000:8.1f} ms  파일 {csv_path.stat().st_size / 1e6:6.1f} MB  메모리 {mem_csv / 1e6:6.1f} MB")
+        print(f"Parquet : {t_pq * 1000:8.1f} ms  파일 {store_path.stat().st_size / 1e6:6.1f} MB  메모리 {mem_pq / 1e6:6.1f} MB")
+        print(f"변환 시간: {t_conv:.2f} s / 콜드 로드 속도 향상: x{t_csv / t_pq:.1f}")
+
+
+def bench_downsample(days, width):
+    import plotly.express as px
+
+    from downsample import METHODS, downsample
+
+    df = make_synthetic_sensor_data(days, nan_frac=0.01)
+    series = df[T.RAW_COL]
+    print(f"합성 데이터: {len(series):,} 점 ({days}일) / 차트 폭 {width}px")
+
+    def render(x, y):
+        # 서버 쪽 비용: Figure 생성 + JSON 직렬화 (브라우저 렌더링 시간은 payload 크기에 비례)
+        return px.line(x=x, y=y).to_json()
+
+    t_raw, payload = _timeit(lambda: render(series.index, series.to_numpy()), 3)
+    print(f"{'방식':<8} {'점':>9} {'payload(KB)':>12} {'축소(ms)':>9} {'렌더(ms)':>9}")
+    print(f"{'원본':<8} {len(series):>9,} {len(payload) / 1e3:>12.1f} {0:>9.1f} {t_raw * 1000:>9.1f}")
+    for method in METHODS:
+        t_ds, (x, y) = _timeit(lambda: downsample(series.index, series.to_numpy(), width, method), 3)
+        t_render, payload = _timeit(lambda: render(x, y), 3)
+        print(f"{method:<8} {len(x):>9,} {len(payload) / 1e3:>12.1f} {t_ds * 1000:>9.1f} {t_render * 1000:>9.1f}")
+
+
+def _rerun_payload(static_serving):
+    from streamlit import config
+    from streamlit.testing.v1 import AppTest
+
+    config.set_option("server.enableStaticServing", static_serving)
+    at = AppTest.from_file(str(Path(__file__).parent / "streamlit_app.py"), default_timeout=300)
+    at.run()
+    # 매 실행마다 브라우저로 다시 보내는 마크다운/HTML 본문 크기
+    body = sum(len(el.value.encode("utf-8")) for el in at.markdown)
+    t0 = time.perf_counter()
+    at.run()
+    return body, time.perf_counter() - t0
+
+
+def bench_assets():
+    print(f"{'이미지 전달':<12} {'rerun 당 HTML(KB)':>18} {'rerun(ms)':>10}")
+    for name, static_serving in [("data URI", False), ("정적 서빙", True)]:
+        body, t = _rerun_payload(static_serving)
+        print(f"{name:<12} {body / 1e3:>18.1f} {t * 1000:>10.1f}")
+
+
+# =====================================================================
+# 회귀 감시용 묶음 (suite)
+# =====================================================================
+SUITE_SIZES = {"1m": 30, "1y": 365, "5y": 5 * 365}   # 10분 간격 합성 데이터 기간(일)
+BASELINE_DIR = Path(__file__).parent / ".benchmarks"  # <이름>.json
+SLOWDOWN_WARN = 1.2                                     # 기준 대비 이 배율 이상 느려지면 표시
+
+
+def _setup_features(df, tmp):
+    return lambda: T.make_features_with_diff(df, T.TARGET_COL, exog_cols=T.EXOG_COLS, dropna=False)
+
+
+def _setup_recursive(df, tmp):
+    # 모델 학습은 재지 않는다. 작은 모델로 예측 경로(피처 상태 + 7일 재귀)만 잰다
+    feats, y = T.make_features_with_diff(df.iloc[-30 * 144:], T.TARGET_COL, exog_cols=T.EXOG_COLS)
+    model = T.LGBMRegressor(n_estimators=50, random_state=T.SEED, verbose=-1).fit(feats, y)
+    freq_td = pd.Timedelta("10min")
+    n_steps = int(pd.Timedelta("7D") / freq_td)
+    return lambda: T.recursive_forecast(df, model, T.TARGET_COL, n_steps, freq_td, feats.mean(), T.EXOG_COLS)
+
+
+def _setup_load(df, tmp):
+    import data_store
+
+    csv_path, store_path = Path(tmp) / "df_final.csv", Path(tmp) / "df_final.parquet"
+    df.reset_index().to_csv(csv_path, index=False)
+    data_store.convert_csv_to_store(csv_path, store_path)
+    empty = Path(tmp) / "no_partitions"
+    return lambda: data_store.load_sensor_data(csv_path, store_path, partition_dir=empty)
+
+
+def _setup_explorer(df, tmp):
+    from data_store import TimeIndexedStore
+
+    store = TimeIndexedStore(df.reset_index())
+    end = df.index[-1].date()
+    start = end - pd.Timedelta(days=2)
+    # 탐색기 기본 구간(최근 3일) 조회 + 차트용 한 컬럼
+    return lambda: store.range_slice(start, end)[T.TARGET_COL].to_numpy()
+
+
+SUITE_TARGETS = {
+    "make_features_with_diff": _setup_features,
+    "recursive_forecast": _setup_recursive,
+    "load_sensor_data": _setup_load,
+    "explorer_filter": _setup_explorer,
+}
+
+
+def _peak_memory(fn):
+    """fn 한 번 실행 중 파이썬/NumPy 할당 최대치(바이트). 시간 측정과 따로 잰다 (tracemalloc 이 느려서)."""
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_suite(sizes, repeat):
+    """{크기: {대상: {"time_s", "peak_mb"}}}. 이 트리에 없는 대상(예전 커밋)은 None."""
+    results = {}
+    for size in sizes:
+        df = make_synthetic_sensor_data(SUITE_SIZES[size])
+        results[size] = {}
+        for name, setup in SUITE_TARGETS.items():
+            with tempfile.TemporaryDirectory() as tmp:
+                try:
+                    fn = setup(df, tmp)
+                except (ImportError, AttributeError):
+                    results[size][name] = None
+                    continue
+                t, _ = _timeit(fn, repeat)
+                results[size][name] = {"time_s": t, "peak_mb": _peak_memory(fn) / 1e6}
+            print(f"  {size:>3} {name:<24} {t * 1000:10.1f} ms", file=sys.stderr)
+    return results
+
+
+def _git(*args):
+    return subprocess.run(["git", *args], cwd=Path(__file__).parent,
+                          capture_output=True, text=True, check=True).stdout.strip()
+
+
+def run_suite_at_ref(ref, sizes, repeat):
+    """
+    git ref 의 소스로 같은 묶음을 돌린다. 임시 worktree 에 이 파일을 복사해 실행하므로
+    ref 쪽에 suite 가 없어도 되고, 그 트리에 없는 대상은 None 으로 남는다.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        tree = Path(tmp) / "tree"
+        _git("worktree", "add", "--detach", str(tree), ref)
+        try:
+            shutil.copy(__file__, tree / "_bench_suite.py")
+            out = Path(tmp) / "result.json"
+            subprocess.run(
+                [sys.executable, str(tree / "_bench_suite.py"), "suite", "--sizes", *sizes,
+                 "--repeat", str(repeat), "--json", str(out)],
+                cwd=tree, check=True,
+            )
+            return json.loads(out.read_text(encoding="utf-8"))["results"]
+        finally:
+            _git("worktree", "remove", "--force", str(tree))
+
+
+def print_suite(results, baseline=None, baseline_name=None):
+    header = f"{'크기':<4} {'대상':<24} {'시간(ms)':>10} {'최대 메모리(MB)':>15}"
+    if baseline is not None:
+        header += f" {baseline_name + '(ms)':>14} {'배율':>6}"
+    print(header)
+    for size, targets in results.items():
+        for name, r in targets.items():
+            line = f"{size:<4} {name:<24} "
+            line += "         –                –" if r is None else f"{r['time_s'] * 1000:>10.1f} {r['peak_mb']:>15.1f}"
+            base = (baseline or {}).get(size, {}).get(name)
+            if baseline is not None:
+                if base is None or r is None:
+                    line += f" {'–':>14} {'':>6}"
+                else:
+                    ratio = r["time_s"] / base["time_s"]
+                    flag = "  ⚠ 느려짐" if ratio >= SLOWDOWN_WARN else ""
+                    line += f" {base['time_s'] * 1000:>14.1f} {ratio:>5.2f}x{flag}"
+            print(line)
+
+
+def bench_suite(args):
+    """
+    전체 묶음을 재고, --save 면 기준으로 저장한다.
+    --compare 는 저장된 기준 이름이나 git ref (예: main) 를 받아 현재 트리와 나란히 보여준다.
+    """
+    results = run_suite(args.sizes, args.repeat)
+    if args.json is not None:
+        args.json.write_text(json.dumps({"results": results}, indent=2), encoding="utf-8")
+        return
+
+    baseline = None
+    if args.compare is not None:
+        path = BASELINE_DIR / f"{args.compare}.json"
+        if path.exists():
+            baseline = json.loads(path.read_text(encoding="utf-8"))["results"]
+        else:
+            print(f"기준 '{args.compare}' 이 없어 git ref 로 측정합니다...", file=sys.stderr)
+            baseline = run_suite_at_ref(args.compare, args.sizes, args.repeat)
+    print_suite(results, baseline, args.compare)
+
+    if args.save is not None:
+        BASELINE_DIR.mkdir(exist_ok=True)
+        path = BASELINE_DIR / f"{args.save}.json"
+        path.write_text(json.dumps({
+            "commit": _git("rev-parse", "--short", "HEAD"),
+            "created_at": pd.Timestamp.now().isoformat(),
+            "python": sys.version.split()[0],
+            "results": results,
+        }, indent=2), encoding="utf-8")
+        print(f'기준 저장: "{path}"')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="성능 벤치마크")
+    sub = parser.add_subparsers(dest="bench", required=True)
+
+    p_feat = sub.add_parser("features", help="피처 생성: pandas 경로 vs NumPy 일괄 경로")
+    p_feat.add_argument("--days", type=int, default=3 * 365)
+    p_feat.add_argument("--repeat", type=int, default=3)
+
+    p_strat = sub.add_parser("strategy", help="7일 예측: 재귀 vs 직접(다중 horizon)")
+    p_strat.add_argument("--days", type=int, default=365)
+    p_strat.add_argument("--origins", type=int, default=5)
+
+    p_load = sub.add_parser("load", help="센서 테이블 콜드 로드: CSV vs Parquet 저장소")
+    p_load.add_argument("--days", type=int, default=365)
+
+    p_ds = sub.add_parser("downsample", help="탐색기 차트: 원본 vs 다운샘플링 payload/렌더 시간")
+    p_ds.add_argument("--days", type=int, default=180)
+    p_ds.add_argument("--width", type=int, default=1200)
+
+    sub.add_parser("assets", help="대시보드 rerun 당 전송 HTML 크기: data URI vs 정적 파일 서빙")
+
+    p_suite = sub.add_parser("suite", help="회귀 감시: 피처/재귀 예측/로드/탐색기 조회 x 1개월·1년·5년")
+    p_suite.add_argument("--sizes", nargs="+", choices=list(SUITE_SIZES), default=list(SUITE_SIZES))
+    p_suite.add_argument("--repeat", type=int, default=3)
+    p_suite.add_argument("--save", metavar="NAME", help=f"결과를 기준으로 저장 ({BASELINE_DIR.name}/NAME.json)")
+    p_suite.add_argument("--compare", metavar="NAME_OR_REF",
+                         help="저장된 기준 이름 또는 git ref (예: main) 와 비교")
+    p_suite.add_argument("--json", type=Path, help=argparse.SUPPRESS)   # run_suite_at_ref 내부용
+
+    args = parser.parse_args()
+    if args.bench == "features":
+        bench_features(args.days, args.repeat)
+    elif args.bench == "strategy":
+        bench_strategy(args.days, args.origins)
+    elif args.bench == "load":
+        bench_load(args.days)
+    elif args.bench == "downsample":
+        bench_downsample(args.days, args.width)
+    elif args.bench == "assets":
+        bench_assets()
+    elif args.bench == "suite":
+        bench_suite(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,536 @@
+"""
+센서 데이터 저장소.
+
+df_final.csv 를 열 지향 Parquet 파일(float32 센서 컬럼 + int64 Timestamp)로
+변환해 두고, 대시보드와 학습 스크립트가 모두 이 파일을 우선 읽도록 한다.
+읽는 순서는 월별 파티션 저장소(ingest.py) → 단일 Parquet → CSV 이다.
+
+관측 지점이 여럿이면 data/sites.json 에 지점을 적고, 지점마다 같은 배치의 폴더
+(기본 data/sites/<지점>/)를 둔다. 목록이 없으면 data/ 바로 아래의 단일 지점(Colmslie Buoy)이다.
+
+    $ python data_store.py convert [--site ID]
+    $ python data_store.py sites
+"""
+import argparse
+import datetime
+import gzip
+import io
+import json
+import os
+import re
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+DATA_DIR   = Path(__file__).parent / "data"
+CSV_PATH   = DATA_DIR / "df_final.csv"
+STORE_PATH = DATA_DIR / "df_final.parquet"
+PARTITION_DIR = DATA_DIR / "sensor_store"   # 월별 파티션 (YYYY-MM.parquet) + manifest.json
+TIME_COL   = "Timestamp"
+FLOAT_DTYPE = np.float32   # 메모리/저장소 공통: 센서·기상 값은 float32 (유효숫자 7자리면 충분)
+SITES_PATH = DATA_DIR / "sites.json"   # 관측 지점 목록 {"sites": [...]} (없으면 DEFAULT_SITES)
+
+# 기존 단일 지점. 폴더가 data/ 자체라 원래 파일 배치를 그대로 쓴다
+DEFAULT_SITES = [{
+    "id": "colmslie",
+    "name": "Colmslie Buoy",
+    "river": "브리즈번 강",
+    "dir": ".",
+    "lat": -27.449204719754594,
+    "lon": 153.0834701552862,
+    "bbox": [153.08047, -27.45170, 153.08647, -27.44520],   # 지도 범위 (서, 남, 동, 북)
+}]
+
+
+def parquet_available():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+# =====================================================================
+# 관측 지점
+# =====================================================================
+def read_sites(path=SITES_PATH):
+    """
+    지점 목록 [{id, name, river, dir, lat, lon, bbox}, ...]. 첫 지점이 기본 지점이다.
+    id 와 좌표는 필수. dir(DATA_DIR 기준 상대 경로)를 생략하면 sites/<id>, bbox 를 생략하면 좌표 주변 약 300m.
+    """
+    path = Path(path)
+    if not path.exists():
+        return [dict(site) for site in DEFAULT_SITES]
+
+    sites = json.loads(path.read_text(encoding="utf-8"))["sites"]
+    if not sites:
+        raise ValueError(f"지점 목록이 비어 있습니다: {path}")
+    seen = set()
+    for site in sites:
+        # id 는 폴더 이름과 주소(?site=) 에 그대로 쓰인다
+        if not re.fullmatch(r"[A-Za-z0-9_-]+", site.get("id", "")):
+            raise ValueError(f"지점 id 는 영문/숫자/_/- 만 쓸 수 있습니다: {site.get('id')!r}")
+        if site["id"] in seen:
+            raise ValueError(f"중복된 지점 id: {site['id']}")
+        seen.add(site["id"])
+        if "lat" not in site or "lon" not in site:
+            raise ValueError(f"지점 {site['id']} 에 좌표(lat, lon)가 없습니다.")
+        site.setdefault("name", site["id"])
+        site.setdefault("dir", f"sites/{site['id']}")
+        site.setdefault("bbox", [site["lon"] - 0.003, site["lat"] - 0.003, site["lon"] + 0.003, site["lat"] + 0.003])
+    return sites
+
+
+def get_site(site=None, sites=None):
+    """id 로 지점 정보를 찾는다. site 가 None 이면 기본(첫) 지점."""
+    sites = read_sites() if sites is None else sites
+    if site is None:
+        return sites[0]
+    for info in sites:
+        if info["id"] == site:
+            return info
+    raise ValueError(f"알 수 없는 지점: {site} (가능: {[info['id'] for info in sites]})")
+
+
+def site_dir(site=None):
+    """지점 데이터 폴더. 원본/저장소/파티션뿐 아니라 학습 산출물(모델, 예측 파일)도 이 아래에 둔다."""
+    return DATA_DIR / get_site(site)["dir"]
+
+
+def site_paths(site=None):
+    """지점의 센서 데이터 경로. load_sensor_data(**site_paths(site)) 처럼 그대로 넘긴다."""
+    root = site_dir(site)
+    return {
+        "csv_path": root / CSV_PATH.name,
+        "store_path": root / STORE_PATH.name,
+        "partition_dir": root / PARTITION_DIR.name,
+    }
+
+
+# =====================================================================
+# 변환
+# =====================================================================
+def compact_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """메모리용 스키마: 실수 컬럼을 FLOAT_DTYPE 로 줄인다 (float64 대비 절반). df 를 바꿔 그대로 돌려준다."""
+    float_cols = df.select_dtypes(include="floating").columns
+    df[float_cols] = df[float_cols].astype(FLOAT_DTYPE)
+    return df
+
+
+def memory_report(df: pd.DataFrame) -> str:
+    """'N행 · X.X MB (float32 n, ...)' 형태의 메모리 사용량 요약 (object 컬럼은 실제 객체 크기까지)."""
+    nbytes = df.memory_usage(deep=True).sum()
+    dtypes = ", ".join(f"{dt} {n}" for dt, n in df.dtypes.astype(str).value_counts().items())
+    return f"{len(df):,}행 · {nbytes / 1e6:.1f} MB ({dtypes})"
+
+
+def day_codes(ts) -> pd.Series:
+    """시각 → 그날 0시 (datetime64). 날짜 비교/그룹용. datetime.date 객체 컬럼보다 작고 빠르다."""
+    return pd.Series(ts).dt.normalize()
+
+
+def to_store_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """저장용 스키마: 실수 컬럼은 float32, Timestamp 는 epoch ns(int64)."""
+    out = compact_frame(df.copy())
+    if TIME_COL in out.columns:
+        out[TIME_COL] = out[TIME_COL].to_numpy(dtype="datetime64[ns]").view(np.int64)
+    return out
+
+
+def from_store_frame(df: pd.DataFrame) -> pd.DataFrame:
+    if TIME_COL in df.columns and pd.api.types.is_integer_dtype(df[TIME_COL]):
+        df[TIME_COL] = df[TIME_COL].to_numpy(dtype=np.int64).view("datetime64[ns]")
+    return df
+
+
+def read_csv_source(csv_path=CSV_PATH) -> pd.DataFrame:
+    df = pd.read_csv(csv_path)
+    if TIME_COL in df.columns:
+        df[TIME_COL] = pd.to_datetime(df[TIME_COL])
+        df = df.sort_values(TIME_COL, kind="stable").reset_index(drop=True)
+    return compact_frame(df)
+
+
+def convert_csv_to_store(csv_path=CSV_PATH, store_path=STORE_PATH):
+    """CSV 를 읽어 Parquet 저장소를 새로 쓴다 (임시 파일에 쓴 뒤 교체)."""
+    df = read_csv_source(csv_path)
+    store_path = Path(store_path)
+    tmp = store_path.with_name(store_path.name + ".tmp")
+    to_store_frame(df).to_parquet(tmp, index=False)
+    os.replace(tmp, store_path)
+    return store_path
+
+
+# =====================================================================
+# 월별 파티션 저장소
+# =====================================================================
+def manifest_path(partition_dir=PARTITION_DIR):
+    return Path(partition_dir) / "manifest.json"
+
+
+def read_manifest(partition_dir=PARTITION_DIR):
+    """파티션 목록 {"columns": [...], "partitions": {"YYYY-MM": {rows, start, end}}} (없으면 None)."""
+    path = manifest_path(partition_dir)
+    if not path.exists() or not parquet_available():
+        return None
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def partition_file(key, partition_dir=PARTITION_DIR):
+    return Path(partition_dir) / f"{key}.parquet"
+
+
+def _to_time(value, end=False):
+    """날짜/시각 인자를 Timestamp 로. 날짜(date)로 받은 끝값은 그날 끝까지 포함한다."""
+    if value is None:
+        return None
+    ts = pd.Timestamp(value)
+    if end and isinstance(value, datetime.date) and not isinstance(value, datetime.datetime):
+        ts += pd.Timedelta(days=1)
+    return ts
+
+
+def _slice_time(df, start, end):
+    if TIME_COL not in df.columns or (start is None and end is None):
+        return df
+    ts = df[TIME_COL].to_numpy()
+    lo = 0 if start is None else ts.searchsorted(start.to_datetime64(), side="left")
+    hi = len(ts) if end is None else ts.searchsorted(end.to_datetime64(), side="left")
+    return df.iloc[lo:hi]
+
+
+def load_partitions(start=None, end=None, columns=None, partition_dir=PARTITION_DIR):
+    """[start, end) 구간에 걸친 월 파티션만 읽는다."""
+    manifest = read_manifest(partition_dir)
+    if manifest is None:
+        raise FileNotFoundError(manifest_path(partition_dir))
+
+    read_cols = None if columns is None else list(dict.fromkeys([TIME_COL] + list(columns)))
+    frames = []
+    for key, info in sorted(manifest["partitions"].items()):
+        if start is not None and pd.Timestamp(info["end"]) < start:
+            continue
+        if end is not None and pd.Timestamp(info["start"]) >= end:
+            continue
+        frames.append(pd.read_parquet(partition_file(key, partition_dir), columns=read_cols))
+
+    if not frames:
+        cols = manifest["columns"] if read_cols is None else read_cols
+        return from_store_frame(to_store_frame(pd.DataFrame(columns=cols)))
+
+    df = from_store_frame(pd.concat(frames, ignore_index=True))
+    df = _slice_time(df, start, end).reset_index(drop=True)
+    return df if columns is None else df[list(columns)]
+
+
+def partition_index(csv_path=CSV_PATH, store_path=STORE_PATH, partition_dir=PARTITION_DIR):
+    """
+    조각 단위 캐시용 목록 [(키, 시작, 끝, 버전)]. 조각은 [시작, 끝) 구간을 덮는다.
+    월 파티션 저장소는 달마다 하나 (버전은 그 달 행 수 · 마지막 시각 · 파일 수정 시각이라
+    다른 달에 측정값이 추가돼도 바뀌지 않는다). CSV/단일 Parquet 은 파일 전체가 한 조각 (시작/끝 None).
+    """
+    manifest = read_manifest(partition_dir)
+    if manifest is not None:
+        parts = []
+        for key, info in sorted(manifest["partitions"].items()):
+            start = pd.Timestamp(f"{key}-01")
+            mtime = partition_file(key, partition_dir).stat().st_mtime_ns
+            parts.append((key, start, start + pd.DateOffset(months=1), f"{info['rows']}:{info['end']}:{mtime}"))
+        return parts
+
+    version = sensor_data_version(csv_path, store_path, partition_dir)
+    return [] if version is None else [("all", None, None, version)]
+
+
+def partitions_in_range(parts, start=None, end=None):
+    """partition_index 목록 중 [start, end) 구간에 걸친 조각 (날짜로 준 end 는 그날 포함)."""
+    start, end = _to_time(start), _to_time(end, end=True)
+    return [
+        part for part in parts
+        if (part[1] is None or end is None or part[1] < end)
+        and (part[2] is None or start is None or part[2] > start)
+    ]
+
+
+# =====================================================================
+# 로드
+# =====================================================================
+def store_is_fresh(csv_path=CSV_PATH, store_path=STORE_PATH):
+    store_path, csv_path = Path(store_path), Path(csv_path)
+    if not store_path.exists() or not parquet_available():
+        return False
+    return not csv_path.exists() or store_path.stat().st_mtime >= csv_path.stat().st_mtime
+
+
+def sensor_data_source(csv_path=CSV_PATH, store_path=STORE_PATH, partition_dir=PARTITION_DIR):
+    """
+    load_sensor_data 가 실제로 읽을 파일 경로 (없으면 None).
+    파티션 저장소면 manifest.json 경로를 돌려준다 (추가될 때마다 내용이 바뀜).
+    """
+    if read_manifest(partition_dir) is not None:
+        return manifest_path(partition_dir)
+    if store_is_fresh(csv_path, store_path):
+        return Path(store_path)
+    if Path(csv_path).exists():
+        return Path(csv_path)
+    return None
+
+
+def sensor_data_version(csv_path=CSV_PATH, store_path=STORE_PATH, partition_dir=PARTITION_DIR):
+    """캐시 무효화용 데이터 버전 (읽을 파일 경로 + 수정 시각)."""
+    source = sensor_data_source(csv_path, store_path, partition_dir)
+    if source is None:
+        return None
+    return f"{source}:{source.stat().st_mtime_ns}"
+
+
+def load_sensor_data(csv_path=CSV_PATH, store_path=STORE_PATH, columns=None,
+                     start=None, end=None, partition_dir=PARTITION_DIR) -> pd.DataFrame:
+    """
+    Timestamp 오름차순 센서 테이블의 [start, end) 구간 (None 이면 전체).
+    날짜(date)로 준 end 는 그날까지 포함한다.
+    """
+    start, end = _to_time(start), _to_time(end, end=True)
+    source = sensor_data_source(csv_path, store_path, partition_dir)
+    if source is None:
+        raise FileNotFoundError(csv_path)
+
+    if source.name == "manifest.json":
+        return load_partitions(start, end, columns, partition_dir)
+
+    if source.suffix == ".parquet":
+        read_cols = None if columns is None else list(dict.fromkeys([TIME_COL] + list(columns)))
+        df = from_store_frame(pd.read_parquet(source, columns=read_cols))
+    else:
+        df = read_csv_source(source)
+    df = _slice_time(df, start, end)
+    return df[list(columns)] if columns is not None else df
+
+
+def iter_sensor_chunks(csv_path=CSV_PATH, store_path=STORE_PATH, partition_dir=PARTITION_DIR,
+                       chunk_rows=200_000):
+    """
+    load_sensor_data 와 같은 원본을 시간 순 조각으로 읽는다 (전체 테이블을 한 번에 올리지 않음).
+    파티션 저장소는 월 파티션 하나씩, Parquet 은 chunk_rows 행 배치, CSV 는 chunk_rows 행씩.
+    CSV 는 파일 순서 그대로 읽으므로 시간 순으로 정렬돼 있어야 한다.
+    """
+    source = sensor_data_source(csv_path, store_path, partition_dir)
+    if source is None:
+        raise FileNotFoundError(csv_path)
+
+    if source.name == "manifest.json":
+        for key in sorted(read_manifest(partition_dir)["partitions"]):
+            yield from_store_frame(pd.read_parquet(partition_file(key, partition_dir)))
+    elif source.suffix == ".parquet":
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(source).iter_batches(batch_size=chunk_rows):
+            yield from_store_frame(batch.to_pandas())
+    else:
+        for chunk in pd.read_csv(source, chunksize=chunk_rows):
+            if TIME_COL in chunk.columns:
+                chunk[TIME_COL] = pd.to_datetime(chunk[TIME_COL])
+            yield compact_frame(chunk)
+
+
+def sensor_data_bounds(csv_path=CSV_PATH, store_path=STORE_PATH, partition_dir=PARTITION_DIR):
+    """저장된 데이터의 (첫 시각, 마지막 시각). 파티션 저장소는 manifest 만 읽는다."""
+    manifest = read_manifest(partition_dir)
+    if manifest is not None:
+        parts = manifest["partitions"]
+        if not parts:
+            return None
+        return (pd.Timestamp(min(p["start"] for p in parts.values())),
+                pd.Timestamp(max(p["end"] for p in parts.values())))
+
+    if sensor_data_source(csv_path, store_path, partition_dir) is None:
+        return None
+    ts = load_sensor_data(csv_path, store_path, columns=[TIME_COL], partition_dir=partition_dir)[TIME_COL]
+    if ts.empty:
+        return None
+    return ts.iloc[0], ts.iloc[-1]
+
+
+# =====================================================================
+# 구간 조회
+# =====================================================================
+class TimeIndexedStore:
+    """
+    Timestamp 로 정렬된 읽기 전용 센서 테이블.
+    구간 조회는 DatetimeIndex.searchsorted 로 경계를 찾고 iloc 슬라이스(복사 없음)를 돌려준다.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        frame = df.set_index(TIME_COL)
+        if not frame.index.is_monotonic_increasing:
+            frame = frame.sort_index(kind="stable")
+        self.frame = frame
+        self.numeric_cols = [
+            col for col in frame.columns if pd.api.types.is_numeric_dtype(frame[col])
+        ]
+
+    def range_slice(self, start=None, end=None, columns=None) -> pd.DataFrame:
+        """[start, end) 구간 (날짜로 준 end 는 그날 포함). 원본과 메모리를 공유하는 슬라이스."""
+        start, end = _to_time(start), _to_time(end, end=True)
+        idx = self.frame.index
+        lo = 0 if start is None else idx.searchsorted(start, side="left")
+        hi = len(idx) if end is None else idx.searchsorted(end, side="left")
+        frame = self.frame if columns is None else self.frame[list(columns)]
+        return frame.iloc[lo:hi]
+
+
+# =====================================================================
+# 집계
+# =====================================================================
+# 탐색기용 다단계 집계 (이름, resample 규칙, 한 구간 길이). 거친 단계부터.
+ROLLUP_LEVELS = [
+    ("weekly", "W-MON", pd.Timedelta(days=7)),
+    ("daily",  "1D",    pd.Timedelta(days=1)),
+    ("hourly", "1h",    pd.Timedelta(hours=1)),
+]
+
+
+def build_rollup(frame: pd.DataFrame, rule, cols=None) -> pd.DataFrame:
+    """
+    Timestamp 인덱스 테이블을 rule 간격으로 묶은 집계표.
+    컬럼은 <col>_mean/_min/_max/_count, 인덱스는 각 구간의 시작 시각 (주 단위는 월요일).
+    """
+    cols = list(frame.columns) if cols is None else list(cols)
+    agg = frame[cols].resample(rule, label="left", closed="left").agg(["mean", "min", "max", "count"])
+    agg.columns = [f"{col}_{stat}" for col, stat in agg.columns]
+    agg.index.name = TIME_COL
+    return agg
+
+
+def merge_rollups(frames, rule) -> pd.DataFrame:
+    """
+    조각(월 파티션)별 build_rollup 결과를 rule 간격 하나의 집계표로 잇는다.
+    조각 경계에 걸친 구간(월을 넘는 주)은 count 가중 평균 · 최솟값 · 최댓값 · count 합으로 다시 합치고,
+    조각 사이 빈 구간은 count 0 (값 NaN) 행으로 채운다.
+    """
+    df = pd.concat(frames).sort_index(kind="stable")
+    if not df.index.is_unique:
+        g = df.groupby(level=0, sort=True)
+        merged = {}
+        for col in [c[:-len("_count")] for c in df.columns if c.endswith("_count")]:
+            count = df[f"{col}_count"]
+            total = (df[f"{col}_mean"].astype(np.float64) * count).where(count > 0, 0.0)
+            n = count.groupby(level=0, sort=True).sum()
+            merged[f"{col}_mean"] = total.groupby(level=0, sort=True).sum() / n.where(n > 0)
+            merged[f"{col}_min"] = g[f"{col}_min"].min()
+            merged[f"{col}_max"] = g[f"{col}_max"].max()
+            merged[f"{col}_count"] = n
+        df = pd.DataFrame(merged)[df.columns].astype(df.dtypes)
+
+    df = df.asfreq(rule)
+    counts = [c for c in df.columns if c.endswith("_count")]
+    df[counts] = df[counts].fillna(0).astype(np.int64)
+    return df
+
+
+def pick_rollup_level(start, end, min_points):
+    """[start, end] 구간을 min_points 개 이상으로 그릴 수 있는 가장 거친 집계 단계 (없으면 None = 원본)."""
+    start, end = _to_time(start), _to_time(end, end=True)
+    span = end - start
+    for name, _, step in ROLLUP_LEVELS:
+        if span / step >= min_points:
+            return name
+    return None
+
+
+def daily_summary(df: pd.DataFrame, value_cols, range_col) -> pd.DataFrame:
+    """
+    날짜별 요약표 (index: 그날 0시 datetime64).
+    각 value_cols 의 그날 마지막 유효값과 그 시각(<col>_time), range_col 의 최소/최대,
+    그날 마지막 측정 시각(last_time).
+    """
+    ts = df[TIME_COL]
+    day = day_codes(ts)
+    g = df.groupby(day, sort=True)
+
+    out = pd.DataFrame({"last_time": g[TIME_COL].max()})
+    for col in value_cols:
+        if col not in df.columns:
+            out[col] = np.nan
+            out[f"{col}_time"] = pd.NaT
+            continue
+        valid = df[col].notna().to_numpy()
+        gv = df.loc[valid, [TIME_COL, col]].groupby(day[valid], sort=True)
+        last = gv.last()
+        out[col] = last[col]
+        out[f"{col}_time"] = last[TIME_COL]
+
+    if range_col in df.columns:
+        out[f"{range_col}_min"] = g[range_col].min()
+        out[f"{range_col}_max"] = g[range_col].max()
+    else:
+        out[f"{range_col}_min"] = np.nan
+        out[f"{range_col}_max"] = np.nan
+
+    out.index.name = None
+    return out
+
+
+# =====================================================================
+# 내보내기
+# =====================================================================
+# 형식 → (MIME, 확장자)
+EXPORT_FORMATS = {
+    "csv":     ("text/csv", ".csv"),
+    "csv.gz":  ("application/gzip", ".csv.gz"),
+    "parquet": ("application/vnd.apache.parquet", ".parquet"),
+}
+
+
+def iter_csv_chunks(df: pd.DataFrame, chunk_rows=100_000, encoding="utf-8-sig"):
+    """df 를 chunk_rows 행씩 CSV bytes 로 만든다. 헤더(와 BOM)는 첫 조각에만 붙는다."""
+    for i, lo in enumerate(range(0, max(len(df), 1), chunk_rows)):
+        text = df.iloc[lo:lo + chunk_rows].to_csv(index=False, header=(i == 0))
+        yield text.encode(encoding if i == 0 else encoding.replace("-sig", ""))
+
+
+def export_table(df: pd.DataFrame, fmt="csv") -> bytes:
+    """내려받기용 파일 내용. CSV 는 조각 단위로 만들어 전체 문자열 사본을 만들지 않는다."""
+    if fmt == "csv":
+        return b"".join(iter_csv_chunks(df))
+    if fmt == "csv.gz":
+        buf = io.BytesIO()
+        with gzip.GzipFile(fileobj=buf, mode="wb", compresslevel=6, mtime=0) as gz:
+            for chunk in iter_csv_chunks(df):
+                gz.write(chunk)
+        return buf.getvalue()
+    if fmt == "parquet":
+        buf = io.BytesIO()
+        df.to_parquet(buf, index=False)
+        return buf.getvalue()
+    raise ValueError(f"알 수 없는 내보내기 형식: {fmt} (가능: {list(EXPORT_FORMATS)})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="센서 데이터 저장소 관리")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    p_conv = sub.add_parser("convert", help="df_final.csv → Parquet 변환")
+    p_conv.add_argument("--site", default=None, help="관측 지점 id (기본: 첫 지점)")
+    p_conv.add_argument("--csv", type=Path, default=None, help="기본: 지점 폴더의 df_final.csv")
+    p_conv.add_argument("--out", type=Path, default=None, help="기본: 지점 폴더의 df_final.parquet")
+
+    sub.add_parser("sites", help="관측 지점 목록과 지점별 데이터 원본/기간")
+
+    args = parser.parse_args()
+    if args.cmd == "convert":
+        paths = site_paths(args.site)
+        csv_path = args.csv or paths["csv_path"]
+        path = convert_csv_to_store(csv_path, args.out or paths["store_path"])
+        print(f'"{csv_path}" → "{path}" 변환 완료 ({path.stat().st_size / 1e6:.1f} MB)')
+    elif args.cmd == "sites":
+        for site in read_sites():
+            paths = site_paths(site["id"])
+            bounds = sensor_data_bounds(**paths)
+            period = "데이터 없음" if bounds is None else f"{bounds[0]} ~ {bounds[1]}"
+            print(f"{site['id']:<16} {site['name']:<24} {sensor_data_source(**paths)}  ({period})")
+
+
+if __name__ == "__main__":
+    main()
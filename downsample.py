@@ -0,0 +1,93 @@
+"""
+차트용 시계열 다운샘플링.
+
+10분 간격 원본을 그대로 그리면 몇 달만 골라도 수십만 점이 JSON 으로 브라우저에 넘어간다.
+차트 가로 픽셀 수에 맞춰 점을 줄인 뒤 그린다.
+
+- minmax : 구간마다 최솟값/최댓값 두 점을 남긴다. 조류 급증 같은 순간 피크가 사라지지 않는다.
+- lttb   : Largest-Triangle-Three-Buckets. 선 모양을 가장 비슷하게 유지한다.
+"""
+import numpy as np
+
+METHODS = ("minmax", "lttb")
+
+
+def _bucket_edges(n, n_buckets):
+    return np.linspace(0, n, n_buckets + 1).astype(np.int64)
+
+
+def minmax_indices(y, n_buckets):
+    """
+    각 구간의 (최솟값 위치, 최댓값 위치) 와 첫 점 · 마지막 점을 시간 순서로 모은 인덱스 (최대 2 * n_buckets + 2 개).
+    전부 NaN 인 구간은 첫 점(NaN)을 남겨 끊김을 유지한다.
+    """
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n_buckets <= 0 or 2 * n_buckets >= n:
+        return np.arange(n)
+
+    edges = _bucket_edges(n, n_buckets)
+    bucket = np.repeat(np.arange(n_buckets), np.diff(edges))
+    starts = edges[:-1]
+    nan = np.isnan(y)
+
+    # 구간 번호 → 값 순으로 정렬하면 각 구간의 첫 원소가 최솟값, 마지막이 최댓값
+    order_min = np.lexsort((np.where(nan, np.inf, y), bucket))
+    order_max = np.lexsort((np.where(nan, -np.inf, y), bucket))
+    i_min = order_min[starts]
+    i_max = order_max[edges[1:] - 1]
+
+    all_nan = np.logical_and.reduceat(nan, starts)
+    i_min = np.where(all_nan, starts, i_min)
+    i_max = np.where(all_nan, starts, i_max)
+
+    # 첫/마지막 점은 차트의 시간 범위가 줄지 않도록 늘 남긴다
+    return np.unique(np.concatenate([[0, n - 1], i_min, i_max]))
+
+
+def lttb_indices(x, y, n_out):
+    """LTTB 로 고른 n_out 개 점의 인덱스. NaN 인 점은 후보에서 빠진다 (결측 구간은 선으로 이어짐)."""
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    valid = np.flatnonzero(~np.isnan(y))
+    n = len(valid)
+    if n_out >= n or n_out < 3:
+        return valid
+
+    xs, ys = x[valid], y[valid]
+    # 첫 점과 마지막 점은 고정하고, 가운데를 (n_out - 2) 개 구간으로 나눈다
+    edges = 1 + _bucket_edges(n - 2, n_out - 2)
+    picked = np.empty(n_out, dtype=np.int64)
+    picked[0], picked[-1] = 0, n - 1
+
+    a = 0
+    for k in range(n_out - 2):
+        lo, hi = edges[k], edges[k + 1]
+        nlo, nhi = hi, edges[k + 2] if k + 2 < len(edges) else n
+        cx, cy = xs[nlo:nhi].mean(), ys[nlo:nhi].mean()
+
+        area = np.abs((xs[a] - cx) * (ys[lo:hi] - ys[a]) - (xs[a] - xs[lo:hi]) * (cy - ys[a]))
+        a = lo + int(area.argmax())
+        picked[k + 1] = a
+
+    return valid[picked]
+
+
+def downsample(x, y, width, method="minmax"):
+    """
+    차트 가로 픽셀(width)에 맞춰 (x, y) 를 줄인다. 픽셀당 한 점 이하가 되도록 고른다.
+    x 는 DatetimeIndex/datetime64 배열도 된다. 원본이 이미 충분히 작으면 그대로 돌려준다.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y, dtype=np.float64)
+    if len(y) <= width:
+        return x, y
+
+    if method == "minmax":
+        idx = minmax_indices(y, max(1, (width - 2) // 2))
+    elif method == "lttb":
+        xf = x.view(np.int64) if np.issubdtype(x.dtype, np.datetime64) else x
+        idx = lttb_indices(xf, y, width)
+    else:
+        raise ValueError(f"알 수 없는 다운샘플링 방식: {method} (가능: {METHODS})")
+    return x[idx], y[idx]
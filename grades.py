@@ -0,0 +1,124 @@
+"""
+클로로필 등급과 활동 추천 기준.
+
+대시보드 카드(한 시점)와 등급 이력 · 일별 예보(전체 시계열)가 같은 경계를 쓰도록 한곳에 둔다.
+classify_chl / build_activity_recommendation 은 값 하나, *_codes / *_array 는 배열 전체를 한 번에 분류한다.
+"""
+import numpy as np
+import pandas as pd
+
+# 클로로필 등급 경계 (µg/L): 좋음 < 4 ≤ 주의 < 8 ≤ 위험
+CHL_THRESHOLDS = (4, 8)
+
+# 등급 코드 → (라벨, 이모지, 색, 설명). classify_chl_codes 의 반환값이 인덱스
+CHL_LEVELS = [
+    ("좋음", "🟢", "#22c55e", "평상 수준으로, 산책·레저 활동에 비교적 안전한 상태입니다."),
+    ("주의", "🟡", "#eab308", "조류(녹조) 농도가 다소 높아진 상태입니다. 기상·강우에 따라 변동이 클 수 있습니다."),
+    ("위험", "🔴", "#ef4444", "조류(녹조) 농도가 높은 편입니다. 레저 활동 전 공식 안내를 꼭 확인해 주세요."),
+    ("정보 부족", "⚪", "#9ca3af", "데이터가 부족해 정확한 상태 진단이 어렵습니다."),
+]
+CHL_LABELS = [level[0] for level in CHL_LEVELS]
+CHL_COLORS = [level[2] for level in CHL_LEVELS]
+
+# 활동 추천 기준: 수온(°C) 범위, 탁도(NTU) 경계
+REC_TEMP_RANGE = (18, 26)
+REC_TURB_CALM = 50     # 이보다 낮고 조류 '좋음' + 적정 수온이면 레저 추천
+REC_TURB_ROUGH = 80    # 이 이상이면 (조류 등급과 상관없이) 물놀이 자제
+
+# 추천 코드 → (제목, 색, 안내). recommendation_codes 의 반환값이 인덱스
+REC_LEVELS = [
+    (
+        "레저 활동하기 좋은 날",
+        "#22c55e",
+        "카약·패들보드 등 가벼운 수상 레저와 물가 산책을 즐기기 좋습니다. "
+        "어린이 물놀이는 항상 보호자와 함께해 주세요.",
+    ),
+    (
+        "가벼운 활동 권장 (주의)",
+        "#eab308",
+        "일부 시간대에 조류가 다소 높을 수 있습니다. "
+        "카약·보트 등은 가능하지만, 물과의 직접 접촉은 줄이고 샤워 등 위생 관리를 신경 써 주세요.",
+    ),
+    (
+        "물놀이 자제 권고",
+        "#ef4444",
+        "수영·튜브 등 직접 물에 들어가는 활동은 가급적 피하는 것이 좋습니다. "
+        "강 주변 산책이나 조망 위주의 활동을 추천드립니다.",
+    ),
+    (
+        "데이터 부족",
+        "#9ca3af",
+        "센서 데이터가 충분하지 않아 오늘의 활동을 정확히 추천하기 어렵습니다. "
+        "현장 안내판·공식 공지를 함께 확인해 주세요.",
+    ),
+]
+
+
+def classify_chl(value: float):
+    if pd.isna(value):
+        return CHL_LEVELS[3]
+    if value < CHL_THRESHOLDS[0]:
+        return CHL_LEVELS[0]
+    if value < CHL_THRESHOLDS[1]:
+        return CHL_LEVELS[1]
+    return CHL_LEVELS[2]
+
+
+def classify_chl_codes(values):
+    """classify_chl 의 배열판. 값마다 CHL_LEVELS 인덱스 (0 좋음, 1 주의, 2 위험, 3 정보 부족)."""
+    v = np.asarray(values, dtype=float)
+    low, high = CHL_THRESHOLDS
+    return np.select([np.isnan(v), v < low, v < high], [3, 0, 1], default=2)
+
+
+def classify_chl_array(values):
+    """전체 시계열의 등급 (label, color 범주형 컬럼). Series 를 주면 인덱스를 그대로 쓴다."""
+    codes = classify_chl_codes(values)
+    return pd.DataFrame(
+        {
+            "label": pd.Categorical.from_codes(codes, categories=CHL_LABELS),
+            "color": pd.Categorical.from_codes(codes, categories=CHL_COLORS),
+        },
+        index=getattr(values, "index", None),
+    )
+
+
+def build_activity_recommendation(chl, temp, turb, label):
+    """조류/수온/탁도 + 등급으로 오늘의 활동 추천 멘트 생성."""
+    if any(pd.isna(x) for x in [chl, temp, turb]):
+        return REC_LEVELS[3]
+
+    low, high = REC_TEMP_RANGE
+    if label == "좋음" and low <= temp <= high and turb < REC_TURB_CALM:
+        return REC_LEVELS[0]
+    if label == "위험" or turb >= REC_TURB_ROUGH:
+        return REC_LEVELS[2]
+    return REC_LEVELS[1]
+
+
+def recommendation_codes(chl, temp, turb):
+    """build_activity_recommendation 의 배열판. 시점마다 REC_LEVELS 인덱스."""
+    chl, temp, turb = (np.asarray(x, dtype=float) for x in (chl, temp, turb))
+    grade = classify_chl_codes(chl)
+    low, high = REC_TEMP_RANGE
+    return np.select(
+        [
+            np.isnan(chl) | np.isnan(temp) | np.isnan(turb),
+            (grade == 0) & (temp >= low) & (temp <= high) & (turb < REC_TURB_CALM),
+            (grade == 2) | (turb >= REC_TURB_ROUGH),
+        ],
+        [3, 0, 2],
+        default=1,
+    )
+
+
+def build_activity_recommendation_array(chl, temp, turb):
+    """전체 시계열의 추천 (title, color 범주형 컬럼). chl 이 Series 면 인덱스를 그대로 쓴다."""
+    codes = recommendation_codes(chl, temp, turb)
+    return pd.DataFrame(
+        {
+            "title": pd.Categorical.from_codes(codes, categories=[r[0] for r in REC_LEVELS]),
+            "color": pd.Categorical.from_codes(codes, categories=[r[1] for r in REC_LEVELS]),
+        },
+        index=getattr(chl, "index", None),
+    )
@@ -0,0 +1,125 @@
+"""
+새 센서 측정값을 월별 파티션 저장소에 이어 붙인다 (append-only).
+
+    $ python ingest.py new_readings.csv          # 새 측정값 추가
+    $ python ingest.py data/df_final.csv         # 빈 저장소에 전체 이력 적재
+    $ python ingest.py --site oxley new.csv      # 다른 관측 지점 (data/sites.json) 저장소에 추가
+
+들어오는 측정값은 Timestamp 가 엄격히 증가해야 하고(중복 없음),
+이미 저장된 마지막 시각 이후여야 한다. 조건을 어기면 아무것도 쓰지 않고 ValueError.
+"""
+import argparse
+import json
+import os
+from pathlib import Path
+
+import pandas as pd
+
+from data_store import (
+    PARTITION_DIR,
+    TIME_COL,
+    from_store_frame,
+    manifest_path,
+    partition_file,
+    read_manifest,
+    site_paths,
+    to_store_frame,
+)
+
+
+def validate_readings(new: pd.DataFrame, manifest=None) -> pd.DataFrame:
+    """형식/순서를 검사하고 Timestamp 를 datetime 으로 바꾼 사본을 돌려준다."""
+    if TIME_COL not in new.columns:
+        raise ValueError(f"'{TIME_COL}' 컬럼이 없습니다.")
+
+    new = new.copy()
+    new[TIME_COL] = pd.to_datetime(new[TIME_COL])
+    ts = new[TIME_COL]
+
+    if ts.isna().any():
+        raise ValueError(f"비어 있는 {TIME_COL} 가 {int(ts.isna().sum())}개 있습니다.")
+    if not ts.is_unique:
+        dup = ts[ts.duplicated()].iloc[0]
+        raise ValueError(f"중복된 {TIME_COL} 가 있습니다: {dup}")
+    if not ts.is_monotonic_increasing:
+        pos = int((ts.diff() < pd.Timedelta(0)).to_numpy().argmax())
+        raise ValueError(f"{TIME_COL} 가 증가 순서가 아닙니다: {ts.iloc[pos - 1]} → {ts.iloc[pos]}")
+
+    if manifest and manifest["partitions"]:
+        last = max(pd.Timestamp(p["end"]) for p in manifest["partitions"].values())
+        if not ts.empty and ts.iloc[0] <= last:
+            raise ValueError(f"이미 저장된 구간과 겹칩니다: 저장소 마지막 {last}, 새 데이터 시작 {ts.iloc[0]}")
+
+        expected = manifest["columns"]
+        if list(new.columns) != expected:
+            missing = sorted(set(expected) - set(new.columns))
+            extra = sorted(set(new.columns) - set(expected))
+            if missing or extra:
+                raise ValueError(f"컬럼 구성이 저장소와 다릅니다. 누락: {missing}, 추가: {extra}")
+            new = new[expected]
+
+    return new
+
+
+def _write_atomic(df, path):
+    tmp = path.with_name(path.name + ".tmp")
+    df.to_parquet(tmp, index=False)
+    os.replace(tmp, path)
+
+
+def append_readings(new: pd.DataFrame, partition_dir=PARTITION_DIR):
+    """검증한 측정값을 해당 월 파티션에 추가하고 manifest 를 갱신한다. 추가된 행 수를 돌려준다."""
+    partition_dir = Path(partition_dir)
+    manifest = read_manifest(partition_dir)
+    new = validate_readings(new, manifest)
+    if new.empty:
+        return 0
+
+    partition_dir.mkdir(parents=True, exist_ok=True)
+    if manifest is None:
+        manifest = {"columns": list(new.columns), "partitions": {}}
+
+    months = new[TIME_COL].dt.strftime("%Y-%m")
+    for key, chunk in new.groupby(months, sort=True):
+        path = partition_file(key, partition_dir)
+        chunk = to_store_frame(chunk)
+        # 월 파티션은 한 달치(10분 간격 약 4,500행)라 다시 써도 비용이 작다
+        if path.exists():
+            chunk = pd.concat([pd.read_parquet(path), chunk], ignore_index=True)
+        _write_atomic(chunk, path)
+
+        ts = from_store_frame(chunk[[TIME_COL]].copy())[TIME_COL]
+        manifest["partitions"][key] = {
+            "rows": len(chunk),
+            "start": ts.iloc[0].isoformat(),
+            "end": ts.iloc[-1].isoformat(),
+        }
+
+    # 파티션을 모두 쓴 뒤 manifest 를 마지막에 교체해야 읽는 쪽이 반쯤 쓴 상태를 보지 않는다
+    tmp = manifest_path(partition_dir).with_suffix(".json.tmp")
+    tmp.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(tmp, manifest_path(partition_dir))
+    return len(new)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="센서 측정값 추가 적재")
+    parser.add_argument("files", nargs="+", type=Path, help="추가할 CSV/Parquet 파일 (시간 순서대로)")
+    parser.add_argument("--site", default=None, help="관측 지점 id (기본: 첫 지점)")
+    parser.add_argument("--store", type=Path, default=None,
+                        help=f"파티션 저장소 경로 (기본: 지점 폴더의 {PARTITION_DIR.name})")
+    args = parser.parse_args()
+    store = args.store or site_paths(args.site)["partition_dir"]
+
+    for path in args.files:
+        if path.suffix == ".parquet":
+            new = from_store_frame(pd.read_parquet(path))
+        else:
+            new = pd.read_csv(path)
+        n = append_readings(new, store)
+        manifest = read_manifest(store)
+        print(f'"{path}": {n:,} 행 추가 (파티션 {len(manifest["partitions"])}개)')
+
+
+if __name__ == "__main__":
+    main()
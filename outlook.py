@@ -0,0 +1,73 @@
+"""
+일별 예보 카드의 행 HTML.
+
+streamlit 없이도 불러 쓸 수 있도록 앱에서 분리해 둔다 (예측 일별 min/max/mean → 카드 행).
+"""
+import numpy as np
+import pandas as pd
+
+from grades import CHL_LEVELS, classify_chl_codes
+
+WEEKDAYS_KR = np.array(["월", "화", "수", "목", "금", "토", "일"])
+
+OUTLOOK_ROW_TEMPLATE = """
+  <div class="week-row">
+    <div class="week-day">{day_label}</div>
+    <div class="week-status">
+      <span class="week-emoji">{emoji}</span>
+      <span class="week-status-text">{label}</span>
+    </div>
+    <div class="week-mean">{mean_txt}</div>
+    <div class="week-min">{d_min:.1f}</div>
+    <div class="week-range-track">
+      <div class="week-range-bar"
+           style="left:{left_pct:.1f}%; width:{width_pct:.1f}%; background-color:{color};"></div>
+      <div class="week-mean-marker"
+           style="left:{mean_marker_left:.1f}%;"
+           title="평균 {mean_txt} µg/L"></div>
+    </div>
+    <div class="week-max">{d_max:.1f}</div>
+  </div>
+"""
+
+
+def render_outlook_rows(daily, today_date):
+    """일별 예보 카드의 행 HTML. 등급·막대 위치를 열 단위로 한 번에 계산해 템플릿에 채운다."""
+    d_min = daily["min"].to_numpy(dtype=float)
+    d_max = daily["max"].to_numpy(dtype=float)
+    d_mean = daily["mean"].to_numpy(dtype=float)
+
+    global_min = daily["min"].min()
+    global_max = daily["max"].max()
+    if pd.notna(global_min) and pd.notna(global_max) and global_max > global_min:
+        denom = float(global_max - global_min)
+        # 예측값이 전부 빈 날은 막대를 맨 왼쪽에 최소 폭(5%)으로 그린다
+        left_pct = np.nan_to_num(np.clip((d_min - global_min) / denom * 100, 0, 100), nan=0.0)
+        width_pct = np.fmax(5, np.minimum((d_max - d_min) / denom * 100, 100 - left_pct))
+        mean_marker_left = np.where(
+            np.isnan(d_mean), 50.0, np.clip((d_mean - global_min) / denom * 100, 0, 100)
+        )
+    else:
+        left_pct = np.zeros(len(daily))
+        width_pct = np.full(len(daily), 100.0)
+        mean_marker_left = np.full(len(daily), 50.0)
+
+    dates = daily["date"]
+    md = dates.dt.strftime("%m/%d")
+    is_today = (dates == pd.Timestamp(today_date)).to_numpy() if today_date is not None else False
+    day_label = np.where(is_today, "오늘", WEEKDAYS_KR[dates.dt.dayofweek.to_numpy()]) + " (" + md + ")"
+
+    levels = np.array(CHL_LEVELS)[classify_chl_codes(d_mean)]
+    rows = pd.DataFrame({
+        "day_label": day_label,
+        "label": levels[:, 0],
+        "emoji": levels[:, 1],
+        "color": levels[:, 2],
+        "mean_txt": np.where(np.isnan(d_mean), "–", pd.Series(d_mean).map("{:.1f}".format)),
+        "d_min": d_min,
+        "d_max": d_max,
+        "left_pct": left_pct,
+        "width_pct": width_pct,
+        "mean_marker_left": mean_marker_left,
+    })
+    return "".join(OUTLOOK_ROW_TEMPLATE.format_map(row) for row in rows.to_dict("records"))
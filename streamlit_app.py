@@ -5,9 +5,49 @@ import numpy as np
 from pathlib import Path
 import datetime
 import base64
+import contextlib
+import functools
+import json
 import mimetypes
+import os
+import time
 import plotly.express as px
 import plotly.graph_objects as go
+from streamlit.logger import get_logger
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from data_store import (
+    EXPORT_FORMATS,
+    ROLLUP_LEVELS,
+    TimeIndexedStore,
+    build_rollup,
+    compact_frame,
+    daily_summary,
+    day_codes,
+    export_table,
+    get_site,
+    load_sensor_data,
+    memory_report,
+    merge_rollups,
+    partition_index,
+    partitions_in_range,
+    pick_rollup_level,
+    read_sites,
+    sensor_data_bounds,
+    sensor_data_version,
+    site_dir,
+    site_paths,
+)
+from downsample import downsample, minmax_indices
+from grades import (
+    CHL_COLORS,
+    CHL_LABELS,
+    CHL_LEVELS,
+    build_activity_recommendation,
+    classify_chl,
+    classify_chl_codes,
+)
+from outlook import render_outlook_rows
 
 # ============================================================
 # 기본 설정
@@ -18,60 +58,523 @@ st.set_page_config(
     layout="wide",
 )
 
+# 섹션 실행 시간은 `streamlit run ... --logger.level=info` 로 볼 수 있다
+logger = get_logger(__name__)
+
+
+# ============================================================
+# 섹션 실행 시간 / 계측 모드
+# ============================================================
+# 계측 모드: 환경변수 DASHBOARD_PROFILE=1 또는 주소 뒤에 ?profile=1.
+# 켜면 사이드바에 계측 패널이 뜨고, 실행(rerun)마다 섹션별 시간과 캐시 호출/미스를 JSON Lines 로 남긴다.
+PROFILE_ENV = "DASHBOARD_PROFILE"
+PROFILE_LOG = Path(os.environ.get("DASHBOARD_PROFILE_LOG", Path(__file__).parent / "data" / "profile_log.jsonl"))
+
+
+def profiling_enabled():
+    return os.environ.get(PROFILE_ENV) == "1" or st.query_params.get("profile") == "1"
+
+
+def write_profile_record(record, path=PROFILE_LOG):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a", encoding="utf-8") as f:
+        f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+
+
+def begin_profile_run(kind):
+    """이번 실행의 계측 기록을 연다 (kind: "full" 또는 "fragment:<섹션>"). 계측 모드가 아니면 아무것도 안 한다."""
+    if not st.session_state.get("profiling"):
+        st.session_state["profile_run"] = None
+        return
+    runs = st.session_state.get("profile_runs", 0) + 1
+    st.session_state["profile_runs"] = runs
+    st.session_state["profile_run"] = {
+        "run": runs,
+        "kind": kind,
+        "started_at": pd.Timestamp.now().isoformat(),
+        "t0": time.perf_counter(),
+        "sections": {},
+        "cache": {},
+    }
+
+
+def end_profile_run():
+    run = st.session_state.get("profile_run")
+    st.session_state["profile_run"] = None
+    if run is None:
+        return
+    run["total_ms"] = (time.perf_counter() - run.pop("t0")) * 1000
+    write_profile_record(run)
+
+
+def record_timing(name, t0):
+    """t0(perf_counter) 부터 지금까지를 name 구간 시간으로 세션 누계와 이번 실행 기록에 더한다."""
+    ms = (time.perf_counter() - t0) * 1000
+    stats = st.session_state.setdefault("section_timings", {})
+    entry = stats.setdefault(name, {"runs": 0, "last_ms": 0.0, "total_ms": 0.0})
+    entry["runs"] += 1
+    entry["last_ms"] = ms
+    entry["total_ms"] += ms
+    logger.info("section %s: %.1f ms (run %d)", name, ms, entry["runs"])
+
+    run = st.session_state.get("profile_run")
+    if run is not None:
+        run["sections"][name] = run["sections"].get(name, 0.0) + ms
+
+
+@contextlib.contextmanager
+def section_timer(name):
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_timing(name, t0)
+
+
+def timed_section(name):
+    """
+    섹션 렌더 함수의 실행 시간/횟수를 세션에 기록하는 데코레이터.
+    st.fragment 아래에 붙이면 그 섹션만 다시 실행될 때도 따로 집계되고, 계측 모드에서는 별도 실행 기록으로 남는다.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            # 전체 실행 중이 아니면(기록이 닫혀 있으면) 이 섹션만 다시 실행된 것
+            fragment_run = st.session_state.get("profiling") and st.session_state.get("profile_run") is None
+            if fragment_run:
+                begin_profile_run(f"fragment:{name}")
+            try:
+                with section_timer(name):
+                    return fn(*args, **kwargs)
+            finally:
+                if fragment_run:
+                    end_profile_run()
+        return wrapper
+    return decorator
+
+
+def _count_cache(name, kind):
+    # 내려받기 파일 생성처럼 스크립트 실행 밖(서버 스레드)에서 불리면 세션이 없다
+    if get_script_run_ctx() is None or not st.session_state.get("profiling"):
+        return
+    total = st.session_state.setdefault("cache_stats", {}).setdefault(name, {"calls": 0, "misses": 0})
+    total[kind] += 1
+    run = st.session_state.get("profile_run")
+    if run is not None:
+        run["cache"].setdefault(name, {"calls": 0, "misses": 0})[kind] += 1
+
+
+def profiled_cache(cache):
+    """
+    st.cache_data(...) / st.cache_resource(...) 를 감싸 계측 모드에서 호출 수와
+    미스 수(본문이 실제로 실행된 횟수)를 센다. 적중 = 호출 - 미스.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def body(*args, **kwargs):
+            _count_cache(fn.__name__, "misses")
+            return fn(*args, **kwargs)
+
+        cached = cache(body)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            _count_cache(fn.__name__, "calls")
+            return cached(*args, **kwargs)
+
+        wrapper.clear = cached.clear
+        return wrapper
+    return decorator
+
+
+def render_profile_panel():
+    """사이드바 계측 패널: 섹션별 실행 횟수/시간, 로더 캐시 적중률."""
+    with st.sidebar.expander("🛠 계측", expanded=True):
+        st.caption(f"실행 {st.session_state.get('profile_runs', 0)}회 (섹션만 다시 실행 포함) · 기록: {PROFILE_LOG}")
+
+        timings = pd.DataFrame.from_dict(st.session_state.get("section_timings", {}), orient="index")
+        if not timings.empty:
+            timings["avg_ms"] = timings["total_ms"] / timings["runs"]
+            st.dataframe(timings[["runs", "last_ms", "avg_ms"]].round(1), use_container_width=True)
+
+        cache = pd.DataFrame.from_dict(st.session_state.get("cache_stats", {}), orient="index")
+        if not cache.empty:
+            cache["hits"] = cache["calls"] - cache["misses"]
+            cache["hit_rate"] = (cache["hits"] / cache["calls"]).map("{:.0%}".format)
+            st.dataframe(cache[["calls", "hits", "misses", "hit_rate"]], use_container_width=True)
+
+
+def run_export(export_args, profiling):
+    """내려받기 파일 생성 (버튼을 눌렀을 때 스크립트 밖에서 불린다). 계측 모드면 걸린 시간을 따로 남긴다."""
+    t0 = time.perf_counter()
+    data = get_export(*export_args)
+    if profiling:
+        ms = (time.perf_counter() - t0) * 1000
+        logger.info("export %s: %.1f ms", export_args[2], ms)
+        write_profile_record({
+            "kind": "export",
+            "started_at": pd.Timestamp.now().isoformat(),
+            "site": export_args[0],
+            "format": export_args[2],
+            "bytes": len(data),
+            "total_ms": ms,
+        })
+    return data
+
+
+st.session_state["profiling"] = profiling_enabled()
+begin_profile_run("full")
+
+
+# ============================================================
+# 관측 지점
+# ============================================================
+# 지점 목록은 data/sites.json (없으면 Colmslie Buoy 한 곳). 아래 로더는 모두 지점 id 를 캐시 키에 넣고
+# 고른 지점의 파일만 읽는다. 원본 테이블 캐시는 2개까지라 지점을 오가도 메모리는 지점 두 곳 분량까지만 쓴다.
+SITES = read_sites()
+SITE_CACHE_ENTRIES = max(2, len(SITES))   # 예보처럼 작은 캐시는 지점마다 하나씩
+
+
+def select_site():
+    """사이드바 지점 선택 (지점이 하나면 생략). 주소의 ?site= 로 시작 지점을 정하고, 고르면 주소도 바꾼다."""
+    names = {site["id"]: site["name"] for site in SITES}
+    if len(names) == 1:
+        return SITES[0]["id"]
+    if "site" not in st.session_state:
+        requested = st.query_params.get("site")
+        st.session_state["site"] = requested if requested in names else SITES[0]["id"]
+    site = st.sidebar.selectbox("📍 관측 지점", options=list(names), format_func=names.get, key="site")
+    st.query_params["site"] = site
+    return site
+
+
+def map_embed_url(site_info):
+    """OpenStreetMap 임베드 주소 (지점 bbox 범위 + 지점 마커)."""
+    west, south, east, north = site_info["bbox"]
+    return (
+        "https://www.openstreetmap.org/export/embed.html"
+        f"?bbox={west}%2C{south}%2C{east}%2C{north}&layer=mapnik"
+        f"&marker={site_info['lat']}%2C{site_info['lon']}"
+    )
+
+
+site = select_site()
+site_info = get_site(site, SITES)
+site_label = f"{site_info['river']}({site_info['name']})" if site_info.get("river") else site_info["name"]
+
+
 # ============================================================
 # 데이터 로드
 # ============================================================
-@st.cache_data
-def get_water_data():
-    DATA_FILENAME = Path(__file__).parent / "data" / "df_final.csv"
-    if not DATA_FILENAME.exists():
-        st.error(f"데이터 파일을 찾을 수 없습니다: {DATA_FILENAME}")
-        return pd.DataFrame()
-    df = pd.read_csv(DATA_FILENAME)
-    if "Timestamp" in df.columns:
-        df["Timestamp"] = pd.to_datetime(df["Timestamp"])
-        df["date"] = df["Timestamp"].dt.date
-    elif "date" in df.columns:
-        df["date"] = pd.to_datetime(df["date"]).dt.date
-    return df
-
-
-@st.cache_data
-def load_future_forecast():
-    path = Path(__file__).parent / "data" / "future_week_forecast.csv"
+@profiled_cache(st.cache_data)
+def get_data_bounds(site, data_version):
+    """지점 센서 데이터의 (첫 시각, 마지막 시각). 파티션 저장소는 manifest 만 읽는다."""
+    if data_version is None:
+        return None
+    return sensor_data_bounds(**site_paths(site))
+
+
+@profiled_cache(st.cache_data(max_entries=2 * SITE_CACHE_ENTRIES))
+def get_partition_index(site, data_version):
+    """지점 저장소의 조각 목록 (월 파티션마다 하나, 단일 파일이면 하나). manifest 만 읽는다."""
+    if data_version is None:
+        return []
+    return partition_index(**site_paths(site))
+
+
+@profiled_cache(st.cache_resource(max_entries=8))
+def get_partition_store(site, key, start, end, version):
+    """한 조각(월 파티션)의 Timestamp 인덱스 테이블. 세션끼리 공유하며 읽기 전용으로만 쓴다."""
+    store = TimeIndexedStore(load_sensor_data(**site_paths(site), start=start, end=end))
+    logger.info("센서 테이블 (%s %s): %s", site, key, memory_report(store.frame))
+    return store
+
+
+def get_explorer_range(site, data_version, start_date, end_date):
+    """
+    탐색기용 [start_date, end_date] 구간 (Timestamp 인덱스, 날짜로 준 끝은 그날 포함).
+    구간에 걸친 조각만 읽고, 조각 하나면 복사 없는 슬라이스를 돌려준다.
+    """
+    parts = get_partition_index(site, data_version)
+    if not parts:
+        return pd.DataFrame(index=pd.DatetimeIndex([], name="Timestamp"))
+    frames = [
+        get_partition_store(site, *part).range_slice(start_date, end_date)
+        for part in partitions_in_range(parts, start_date, end_date)
+    ]
+    if not frames:
+        # 구간이 빈 달에만 걸치면 최신 조각의 컬럼 구성으로 빈 표
+        return get_partition_store(site, *parts[-1]).frame.iloc[:0]
+    return frames[0] if len(frames) == 1 else pd.concat(frames)
+
+
+EXPLORER_TABLE_ROWS = 300   # 탐색기 표에 보여줄 마지막 행 수
+
+
+@profiled_cache(st.cache_data(max_entries=16))
+def get_explorer_table(site, data_version, start_date, end_date, rows=EXPLORER_TABLE_ROWS):
+    """[start_date, end_date] 구간의 마지막 rows 행. 구간 끝쪽 조각부터 거꾸로, 행이 찰 때까지만 읽는다."""
+    parts = get_partition_index(site, data_version)
+    if not parts:
+        return pd.DataFrame(columns=["Timestamp"])
+    frames, n = [], 0
+    for part in reversed(partitions_in_range(parts, start_date, end_date)):
+        frame = get_partition_store(site, *part).range_slice(start_date, end_date)
+        frames.append(frame.iloc[-rows:])
+        n += len(frames[-1])
+        if n >= rows:
+            break
+    if not frames:
+        frames = [get_partition_store(site, *parts[-1]).frame.iloc[:0]]
+    return pd.concat(frames[::-1]).iloc[-rows:].reset_index()
+
+
+@profiled_cache(st.cache_data(max_entries=2 * SITE_CACHE_ENTRIES))
+def get_numeric_columns(site, data_version):
+    """탐색기에서 고를 수 있는 수치형 지표 (최신 조각의 컬럼 구성)."""
+    parts = get_partition_index(site, data_version)
+    if not parts:
+        return []
+    return get_partition_store(site, *parts[-1]).numeric_cols
+
+
+# 차트 가로 픽셀 (대략값). 다운샘플링은 픽셀당 한 점 이하로 줄인다
+EXPLORER_CHART_WIDTH = 1200
+FORECAST_CHART_WIDTH = 800
+
+
+ROLLUP_LABELS = {None: "10분 원본", "hourly": "1시간 집계", "daily": "1일 집계", "weekly": "1주 집계"}
+
+
+@profiled_cache(st.cache_data(persist="disk"))
+def get_partition_rollups(site, key, start, end, version):
+    """
+    한 조각의 시간/일/주 단위 mean·min·max·count 집계표 (조각 버전마다 한 번 계산, 디스크에 남김).
+    주 단위는 조각 경계에서 잘린 구간일 수 있어 merge_rollups 로 합쳐 쓴다.
+    """
+    frame = load_sensor_data(**site_paths(site), start=start, end=end).set_index("Timestamp")
+    frame = frame.select_dtypes(include="number")
+    return {name: build_rollup(frame, rule) for name, rule, _ in ROLLUP_LEVELS}
+
+
+@st.cache_data(max_entries=64)
+def get_explorer_series(site, data_version, column, start_date, end_date, width):
+    """
+    탐색기 차트용 (집계 단계, 시각, 값, 최솟값, 최댓값). (지표, 기간, 폭) 마다 한 번만 계산한다.
+    기간이 길면 차트 폭의 1/4 이상 점이 나오는 가장 거친 집계표를 쓰고 (평균 + 최소/최대 음영),
+    짧으면 원본을 차트 폭에 맞춰 줄인다 (최솟값/최댓값은 None).
+    """
+    level = pick_rollup_level(start_date, end_date, width // 4)
+    if level is None:
+        series = get_explorer_range(site, data_version, start_date, end_date)[column]
+        x, y = downsample(series.index, series.to_numpy(), width, method="minmax")
+        return level, x, y, None, None
+
+    rule, step = next((rule, step) for name, rule, step in ROLLUP_LEVELS if name == level)
+    # 집계 구간의 시작 시각이 인덱스라, start_date 가 걸친 첫 구간까지 포함되도록 한 구간 앞에서 자른다
+    start = pd.Timestamp(start_date) - step + pd.Timedelta(1, "ns")
+    # 마지막 구간은 end_date 다음 날부터 한 구간 길이만큼 더 걸칠 수 있다
+    end = pd.Timestamp(end_date) + pd.Timedelta(days=1) + step
+    parts = partitions_in_range(get_partition_index(site, data_version), start, end)
+    if not parts:
+        return level, np.array([], dtype="datetime64[ns]"), np.array([]), np.array([]), np.array([])
+    rollup = merge_rollups([get_partition_rollups(site, *part)[level] for part in parts], rule)
+    df = TimeIndexedStore(rollup.reset_index()).range_slice(start, end_date)
+    y = df[f"{column}_mean"].to_numpy()
+    idx = minmax_indices(y, max(1, (width - 2) // 2)) if len(y) > width else slice(None)
+    return (
+        level,
+        df.index.to_numpy()[idx],
+        y[idx],
+        df[f"{column}_min"].to_numpy()[idx],
+        df[f"{column}_max"].to_numpy()[idx],
+    )
+
+
+@st.cache_data(max_entries=16)
+def get_forecast_line(x, y, width):
+    """주간 예보 라인 차트용 (시각, 값) 배열."""
+    return downsample(x, y, width, method="minmax")
+
+
+@st.cache_data(max_entries=8)
+def get_export(site, data_version, fmt, start_date=None, end_date=None):
+    """
+    내려받기 파일 (지점 · 데이터 버전 · 형식 · 기간마다 한 번 생성). 버튼을 눌렀을 때만 호출된다.
+    기간을 주면 그 구간의 파티션만 읽는다.
+    """
+    df = load_sensor_data(**site_paths(site), start=start_date, end=end_date)
+    return export_table(df, fmt)
+
+
+HERO_COLS = ["Chlorophyll_Kalman", "Temperature_Kalman", "Turbidity_Kalman", "Dissolved Oxygen_Kalman"]
+
+
+@profiled_cache(st.cache_data(persist="disk"))
+def get_partition_summary(site, key, start, end, version):
+    """
+    한 조각(월 파티션)의 날짜 → 그날 마지막 유효 지표/시각 + 클로로필 최소·최대.
+    조각 버전마다 한 번 계산하고 디스크에 남겨, 재시작이나 다른 달 추가 뒤에도 다시 읽지 않는다.
+    """
+    df = load_sensor_data(**site_paths(site), start=start, end=end)
+    if df.empty or "Timestamp" not in df.columns:
+        return {}
+    return daily_summary(df, HERO_COLS, "Chlorophyll_Kalman").to_dict("index")
+
+
+def get_day_summary(site, data_version, day):
+    """선택 날짜의 요약 (없으면 빈 dict). 그날이 든 조각 하나만 읽는다."""
+    day = pd.Timestamp(day)
+    for part in partitions_in_range(get_partition_index(site, data_version), day, day + pd.Timedelta(days=1)):
+        info = get_partition_summary(site, *part).get(day)
+        if info is not None:
+            return info
+    return {}
+
+
+@profiled_cache(st.cache_data(persist="disk"))
+def get_partition_risk_counts(site, key, start, end, version):
+    """한 조각의 일별 클로로필 등급 측정 건수 (조각 버전마다 한 번 계산, 디스크에 남김)."""
+    df = load_sensor_data(**site_paths(site), start=start, end=end)
+    if "Chlorophyll_Kalman" not in df.columns:
+        return pd.DataFrame(columns=CHL_LABELS)
+    codes = classify_chl_codes(df["Chlorophyll_Kalman"].to_numpy())
+    onehot = pd.DataFrame(
+        codes[:, None] == np.arange(len(CHL_LEVELS)),
+        index=pd.DatetimeIndex(df["Timestamp"]), columns=CHL_LABELS,
+    )
+    return onehot.resample("D", label="left", closed="left").sum()
+
+
+@st.cache_data(max_entries=4)
+def get_risk_timeline(site, data_version, freq):
+    """
+    전체 기간 클로로필 등급 분포를 freq(일 "D" / 주 "W-MON") 단위로 센 표.
+    컬럼은 CHL_LABELS, 값은 그 구간의 측정 건수. 월 파티션별 일 단위 건수를 합쳐 만든다
+    (하루는 한 달 안에 있으므로 조각 경계에서 나뉘지 않는다).
+    """
+    daily = [get_partition_risk_counts(site, *part) for part in get_partition_index(site, data_version)]
+    daily = [counts for counts in daily if not counts.empty]
+    if not daily:
+        return pd.DataFrame(columns=CHL_LABELS)
+    counts = pd.concat(daily)
+    if freq != "D":
+        counts = counts.resample(freq, label="left", closed="left").sum()
+    return counts[counts.sum(axis=1) > 0]
+
+
+# 기본 지점 경로. 다른 지점은 지점 폴더 아래 같은 이름 (train_offline.site_output_paths 와 같은 배치)
+FORECAST_PATH = Path(__file__).parent / "data" / "future_week_forecast.csv"
+MODEL_DIR = Path(__file__).parent / "data" / "models"   # train_offline.py 가 저장한 모델 (LATEST)
+FORECAST_TTL = 3600   # 실시간 예보 캐시 유지 시간(초)
+
+
+def site_forecast_path(site):
+    return site_dir(site) / FORECAST_PATH.name
+
+
+def site_model_dir(site):
+    return site_dir(site) / MODEL_DIR.name
+
+
+def latest_model_version(model_dir=MODEL_DIR):
+    latest = model_dir / "LATEST"
+    if not latest.exists():
+        return None
+    return latest.read_text(encoding="utf-8").strip() or None
+
+
+def forecast_version(site, newest_time):
+    """
+    지점 예보 버전. 저장된 모델이 있으면 "model:<모델 버전>@<최신 측정 시각>" (새 측정값이 들어오면 바뀜),
+    없으면 예측 파일 경로 + 수정 시각 (train_offline.py 가 다시 쓰면 바뀜).
+    """
+    path = site_forecast_path(site)
+    model_version = latest_model_version(site_model_dir(site))
+    if model_version is not None and newest_time is not None:
+        return f"model:{model_version}@{newest_time.isoformat()}"
+    if not path.exists():
+        return None
+    return f"{path}:{path.stat().st_mtime_ns}"
+
+
+@profiled_cache(st.cache_resource(max_entries=SITE_CACHE_ENTRIES))
+def get_live_forecaster(site, model_version):
+    """지점 모델을 한 번만 읽어 세션끼리 공유한다. 관측 이력의 증분 피처 상태도 여기에 쌓인다."""
+    # 학습 쪽 의존성(optuna 등)은 모델이 있을 때만 불러온다
+    from train_offline import LiveForecaster, load_model_artifact
+
+    booster, meta = load_model_artifact(site_model_dir(site), model_version)
+    return LiveForecaster(booster, meta)
+
+
+def load_seed_window(site, newest_time, freq_td, rows):
+    """
+    예보 상태를 처음 만들 때 읽는 최근 구간 (마지막 rows 행 이상).
+    결측 구간 때문에 행이 모자라면 데이터 시작에 닿을 때까지 읽는 기간을 두 배씩 넓힌다.
+    """
+    first_time = sensor_data_bounds(**site_paths(site))[0]
+    span = freq_td * rows
+    while True:
+        start = newest_time - span
+        df = load_sensor_data(**site_paths(site), start=start)
+        if len(df) >= rows or start <= first_time:
+            return df
+        span *= 2
+
+
+def compute_live_forecast(site, model_version, newest_time):
+    from train_offline import HISTORY_SPAN
+
+    forecaster = get_live_forecaster(site, model_version)
+    # 처음에는 피처 계산에 필요한 최근 구간만, 이후에는 마지막으로 반영한 시각 이후 측정값만 읽어 상태에 이어 붙인다
+    if forecaster.last_idx is None:
+        df = load_seed_window(site, newest_time, forecaster.freq_td, HISTORY_SPAN)
+    else:
+        df = load_sensor_data(**site_paths(site), start=forecaster.last_idx)
+    df = df.set_index("Timestamp")
+    float_cols = df.select_dtypes(include="float32").columns
+    df[float_cols] = df[float_cols].astype(np.float64)
+    forecaster.update(df)
+
+    future = forecaster.forecast()
+    return compact_frame(future.rename("Forecast_Chlorophyll_Kalman").rename_axis("Timestamp").reset_index())
+
+
+def read_forecast_csv(path=FORECAST_PATH):
     if not path.exists():
         return None
     df_fore = pd.read_csv(path, parse_dates=["Timestamp"])
     if "Forecast_Chlorophyll_Kalman" not in df_fore.columns:
         return None
     df_fore = df_fore.sort_values("Timestamp").reset_index(drop=True)
-    return df_fore
+    return compact_frame(df_fore)
 
 
-df = get_water_data()
-forecast_df = load_future_forecast()
+@profiled_cache(st.cache_data(max_entries=SITE_CACHE_ENTRIES, ttl=FORECAST_TTL))
+def load_future_forecast(site, forecast_version):
+    if forecast_version is None:
+        return None
+    if forecast_version.startswith("model:"):
+        model_version, newest_time = forecast_version[len("model:"):].split("@")
+        try:
+            return compute_live_forecast(site, model_version, pd.Timestamp(newest_time))
+        except (FileNotFoundError, ValueError) as e:
+            logger.warning("저장된 모델로 %s 예보를 만들지 못해 예측 파일을 사용합니다: %s", site, e)
+    return read_forecast_csv(site_forecast_path(site))
+
+
+# 데이터 버전(파일 경로 + 수정 시각)을 캐시 키에 넣어 새 측정값이 들어오면 다시 읽는다
+with section_timer("data_load"):
+    data_version = sensor_data_version(**site_paths(site))
+    if data_version is None:
+        st.error(f"{site_info['name']} 데이터 파일을 찾을 수 없습니다: {site_paths(site)['csv_path']}")
+    data_bounds = get_data_bounds(site, data_version)
+    forecast_ver = forecast_version(site, data_bounds[1] if data_bounds is not None else None)
 
 # ============================================================
 # 도메인 헬퍼
 # ============================================================
-def classify_chl(value: float):
-    if pd.isna(value):
-        return "정보 부족", "⚪", "#9ca3af", "데이터가 부족해 정확한 상태 진단이 어렵습니다."
-    if value < 4:
-        return "좋음", "🟢", "#22c55e", "평상 수준으로, 산책·레저 활동에 비교적 안전한 상태입니다."
-    if value < 8:
-        return "주의", "🟡", "#eab308", "조류(녹조) 농도가 다소 높아진 상태입니다. 기상·강우에 따라 변동이 클 수 있습니다."
-    return "위험", "🔴", "#ef4444", "조류(녹조) 농도가 높은 편입니다. 레저 활동 전 공식 안내를 꼭 확인해 주세요."
-
-
-def get_last_valid(df_local: pd.DataFrame, col: str):
-    if df_local is None or df_local.empty:
-        return np.nan
-    if col not in df_local.columns:
-        return np.nan
-    return df_local[col].dropna().iloc[-1] if df_local[col].notna().any() else np.nan
-
-
 def add_risk_bands_plotly(fig, y_max: float):
     """Plotly 그래프에 위험 구간 밴드(0–4, 4–8, 8+) 추가."""
     fig.add_hrect(y0=0, y1=4, line_width=0, fillcolor="#22c55e", opacity=0.12)
@@ -81,39 +584,30 @@ def add_risk_bands_plotly(fig, y_max: float):
     fig.add_hline(y=8, line_dash="dot", line_color="#ef4444", line_width=1)
 
 
-def build_activity_recommendation(chl, temp, turb, label):
-    """조류/수온/탁도 + 등급으로 오늘의 활동 추천 멘트 생성."""
-    if any(pd.isna(x) for x in [chl, temp, turb]):
-        return (
-            "데이터 부족",
-            "#9ca3af",
-            "센서 데이터가 충분하지 않아 오늘의 활동을 정확히 추천하기 어렵습니다. "
-            "현장 안내판·공식 공지를 함께 확인해 주세요.",
-        )
+# ============================================================
+# 일별 예보 카드
+# ============================================================
+OUTLOOK_HORIZONS = [7, 30, 90]   # 카드로 보여줄 수 있는 예보 기간(일)
 
-    if label == "좋음" and 18 <= temp <= 26 and turb < 50:
-        color = "#22c55e"
-        title = "레저 활동하기 좋은 날"
-        msg = (
-            "카약·패들보드 등 가벼운 수상 레저와 물가 산책을 즐기기 좋습니다. "
-            "어린이 물놀이는 항상 보호자와 함께해 주세요."
-        )
-    elif label == "위험" or turb >= 80:
-        color = "#ef4444"
-        title = "물놀이 자제 권고"
-        msg = (
-            "수영·튜브 등 직접 물에 들어가는 활동은 가급적 피하는 것이 좋습니다. "
-            "강 주변 산책이나 조망 위주의 활동을 추천드립니다."
-        )
-    else:
-        color = "#eab308"
-        title = "가벼운 활동 권장 (주의)"
-        msg = (
-            "일부 시간대에 조류가 다소 높을 수 있습니다. "
-            "카약·보트 등은 가능하지만, 물과의 직접 접촉은 줄이고 샤워 등 위생 관리를 신경 써 주세요."
-        )
 
-    return title, color, msg
+@st.cache_data(max_entries=8)
+def get_daily_outlook(site, forecast_version, horizon_days):
+    """예측값의 일별 min/max/mean (앞에서부터 horizon_days 일). 예측 파일 버전마다 한 번 계산."""
+    df_fore = load_future_forecast(site, forecast_version)
+    if df_fore is None or df_fore.empty:
+        return pd.DataFrame(columns=["date", "min", "max", "mean"])
+    daily = (
+        df_fore.groupby(day_codes(df_fore["Timestamp"]))["Forecast_Chlorophyll_Kalman"]
+        .agg(["min", "max", "mean"])
+        .rename_axis("date")
+        .reset_index()
+    )
+    return daily.sort_values("date").head(horizon_days).reset_index(drop=True)
+
+
+@st.cache_data(max_entries=8)
+def get_outlook_rows_html(site, forecast_version, horizon_days, today_date):
+    return render_outlook_rows(get_daily_outlook(site, forecast_version, horizon_days), today_date)
 
 
 # ============================================================
@@ -131,140 +625,51 @@ icon_danger = STATIC_DIR / "icon_danger.png"
 icon_unknown = STATIC_DIR / "icon_unknown.png"
 
 
-def get_base64_image(path: Path):
-    if not path.exists():
-        return None
-    mime_type, _ = mimetypes.guess_type(str(path))
+@st.cache_resource(max_entries=16)
+def _encode_data_uri(path: str, mtime_ns: int):
+    # mtime_ns 는 캐시 키로만 쓴다 (파일이 바뀌면 다시 인코딩)
+    mime_type, _ = mimetypes.guess_type(path)
     mime_type = mime_type or "image/png"
     with open(path, "rb") as f:
         b64 = base64.b64encode(f.read()).decode("utf-8")
     return f"data:{mime_type};base64,{b64}"
 
 
+def get_base64_image(path: Path):
+    if not path.exists():
+        return None
+    return _encode_data_uri(str(path), path.stat().st_mtime_ns)
+
+
+def get_asset_url(path: Path):
+    """
+    이미지 주소. 정적 파일 서빙(.streamlit/config.toml 의 enableStaticServing)이 켜져 있으면
+    app/static/ URL 을 돌려줘 브라우저가 한 번 받아 캐시하게 하고, 꺼져 있으면 data URI 로 넣는다.
+    """
+    if not path.exists():
+        return None
+    if st.get_option("server.enableStaticServing") and path.parent == STATIC_DIR:
+        # 파일이 바뀌면 주소도 바뀌도록 수정 시각을 붙인다
+        return f"app/static/{path.name}?v={path.stat().st_mtime_ns}"
+    return get_base64_image(path)
+
+
 # ============================================================
 # 기본 정보 계산 + 지표 조회 날짜 결정
 # ============================================================
-if "Timestamp" in df.columns and not df.empty:
-    df = df.sort_values("Timestamp")
-    latest_row = df.iloc[-1]
-    latest_time = latest_row["Timestamp"]
+if data_bounds is not None:
+    latest_time = data_bounds[1]
     today_date = latest_time.date()
+    date_bounds = (data_bounds[0].date(), today_date)
 else:
-    latest_row = df.iloc[-1] if not df.empty else None
-    latest_time = (
-        latest_row["Timestamp"]
-        if latest_row is not None and "Timestamp" in latest_row.index
-        else None
-    )
-    today_date = df["date"].iloc[-1] if "date" in df.columns and not df.empty else None
-
-# 지표 조회 날짜 기본값/선택값
-if not df.empty and "date" in df.columns:
-    available_dates = sorted(df["date"].unique())
-    default_date = today_date or available_dates[-1]
-
-    if "metric_date" in st.session_state:
-        sd = st.session_state["metric_date"]
-        if isinstance(sd, pd.Timestamp):
-            sd = sd.date()
-        elif isinstance(sd, datetime.datetime):
-            sd = sd.date()
-        if sd < available_dates[0] or sd > available_dates[-1]:
-            sd = default_date
-        selected_date = sd
-    else:
-        selected_date = default_date
-else:
-    available_dates = None
-    selected_date = today_date
-
-# 선택 날짜 기준 데이터프레임
-if not df.empty and "date" in df.columns and selected_date is not None:
-    sel_df = df[df["date"] == selected_date]
-else:
-    sel_df = df.copy()
-
-# 선택 날짜 기준 현재값
-sel_chl = get_last_valid(sel_df, "Chlorophyll_Kalman")
-sel_temp = get_last_valid(sel_df, "Temperature_Kalman")
-sel_turb = get_last_valid(sel_df, "Turbidity_Kalman")
-sel_do = get_last_valid(sel_df, "Dissolved Oxygen_Kalman")
-
-# 선택 날짜 기준 마지막 시각
-if not sel_df.empty and "Timestamp" in sel_df.columns:
-    sel_time = sel_df["Timestamp"].iloc[-1]
-else:
-    sel_time = latest_time
-
-# 선택 날짜 기준 범위 텍스트
-if (
-    "Chlorophyll_Kalman" in sel_df.columns
-    and not sel_df["Chlorophyll_Kalman"].dropna().empty
-):
-    sel_min = sel_df["Chlorophyll_Kalman"].min()
-    sel_max = sel_df["Chlorophyll_Kalman"].max()
-    if today_date is not None and selected_date == today_date:
-        hero_range_text = f"오늘 범위: {sel_min:.1f} ~ {sel_max:.1f} µg/L"
-    else:
-        hero_range_text = (
-            f"{selected_date.strftime('%m/%d')} 범위: {sel_min:.1f} ~ {sel_max:.1f} µg/L"
-        )
-else:
-    hero_range_text = "범위: 데이터 없음"
-
-# 선택 날짜 기준 등급 → 배경/아이콘에 사용
-hero_label, hero_emoji, hero_color, _ = classify_chl(sel_chl)
-
-# 배경 이미지
-if hero_label == "좋음":
-    chosen_img = img_good
-elif hero_label == "주의":
-    chosen_img = img_warning
-elif hero_label == "위험":
-    chosen_img = img_danger
-else:
-    chosen_img = img_unknown
-
-bg_data_uri = get_base64_image(chosen_img)
-bg_css_url = bg_data_uri if bg_data_uri else None
-
-# TODAY 카드용 상태 아이콘
-if hero_label == "좋음":
-    hero_icon_path = icon_good
-elif hero_label == "주의":
-    hero_icon_path = icon_warning
-elif hero_label == "위험":
-    hero_icon_path = icon_danger
-else:
-    hero_icon_path = icon_unknown
-
-hero_icon_uri = get_base64_image(hero_icon_path) if hero_icon_path is not None else None
-
+    latest_time = None
+    today_date = None
+    date_bounds = None
 
 # ============================================================
 # CSS 스타일
 # ============================================================
-css_block = "<style>"
-
-if bg_css_url:
-    css_block += f"""
-.stApp {{
-    background-image: url("{bg_css_url}");
-    background-size: cover;
-    background-position: center;
-    background-repeat: no-repeat;
-    color: #e5e7eb;
-}}
-"""
-else:
-    css_block += """
-.stApp {
-    background-color: #020617;
-    color: #e5e7eb;
-}
-"""
-
-css_block += """
+css_block = """<style>
 .block-container {
     padding-top: 2.8rem;
     padding-bottom: 2rem;
@@ -609,7 +1014,7 @@ st.markdown(css_block, unsafe_allow_html=True)
 # ============================================================
 st.markdown('<div class="main-title">브리즈번 수질 알리미</div>', unsafe_allow_html=True)
 st.markdown(
-    '<div class="sub-title">브리즈번 강(Colmslie Buoy) 수질을 날씨앱처럼 한눈에 확인하세요.</div>',
+    f'<div class="sub-title">{site_label} 수질을 날씨앱처럼 한눈에 확인하세요.</div>',
     unsafe_allow_html=True,
 )
 st.markdown(
@@ -626,77 +1031,177 @@ st.write("")
 # ============================================================
 # 1. 오늘의 브리즈번 강 상태
 # ============================================================
-col_hero_main, col_hero_side = st.columns([2, 1.4])
-
-with col_hero_side:
-    st.markdown('<div class="small-title">현재 주요 지표</div>', unsafe_allow_html=True)
-
-    if not df.empty and "date" in df.columns and available_dates is not None:
-        st.date_input(
-            "지표 조회 날짜",
-            value=selected_date,
-            min_value=available_dates[0],
-            max_value=available_dates[-1],
-            key="metric_date",
-        )
+def background_css(bg_css_url):
+    """등급별 배경 이미지 스타일 (지표 조회 날짜에 따라 바뀌므로 히어로 섹션에서 넣는다)."""
+    css_block = "<style>"
+
+    if bg_css_url:
+        css_block += f"""
+.stApp {{
+    background-image: url("{bg_css_url}");
+    background-size: cover;
+    background-position: center;
+    background-repeat: no-repeat;
+    color: #e5e7eb;
+}}
+"""
     else:
-        st.write("데이터가 부족하여 날짜 선택이 어렵습니다.")
+        css_block += """
+.stApp {
+    background-color: #020617;
+    color: #e5e7eb;
+}
+"""
+    return css_block + "</style>"
+
+
+@st.fragment
+@timed_section("hero")
+def render_hero_section(site, site_info, data_version, date_bounds, today_date, latest_time):
+    """날짜 선택 → 주요 지표 · 추천 활동 · 히어로 카드 · 배경. 날짜를 바꾸면 이 섹션만 다시 그린다."""
+    # 지표 조회 날짜 기본값/선택값
+    if date_bounds is not None:
+        default_date = today_date
+
+        if "metric_date" in st.session_state:
+            sd = st.session_state["metric_date"]
+            if isinstance(sd, pd.Timestamp):
+                sd = sd.date()
+            elif isinstance(sd, datetime.datetime):
+                sd = sd.date()
+            if sd < date_bounds[0] or sd > date_bounds[1]:
+                sd = default_date
+            selected_date = sd
+        else:
+            selected_date = default_date
+    else:
+        selected_date = today_date
+
+    # 선택 날짜 요약 (그날이 든 월 파티션의 일별 요약표에서 조회)
+    sel_info = get_day_summary(site, data_version, selected_date) if selected_date is not None else {}
+
+    # 선택 날짜 기준 현재값
+    sel_chl = sel_info.get("Chlorophyll_Kalman", np.nan)
+    sel_temp = sel_info.get("Temperature_Kalman", np.nan)
+    sel_turb = sel_info.get("Turbidity_Kalman", np.nan)
+    sel_do = sel_info.get("Dissolved Oxygen_Kalman", np.nan)
+
+    # 선택 날짜 기준 마지막 시각
+    sel_time = sel_info.get("last_time", latest_time)
+
+    # 선택 날짜 기준 범위 텍스트
+    sel_min = sel_info.get("Chlorophyll_Kalman_min", np.nan)
+    sel_max = sel_info.get("Chlorophyll_Kalman_max", np.nan)
+    if pd.notna(sel_min) and pd.notna(sel_max):
+        if today_date is not None and selected_date == today_date:
+            hero_range_text = f"오늘 범위: {sel_min:.1f} ~ {sel_max:.1f} µg/L"
+        else:
+            hero_range_text = (
+                f"{selected_date.strftime('%m/%d')} 범위: {sel_min:.1f} ~ {sel_max:.1f} µg/L"
+            )
+    else:
+        hero_range_text = "범위: 데이터 없음"
+
+    # 선택 날짜 기준 등급 → 배경/아이콘에 사용
+    hero_label, hero_emoji, hero_color, _ = classify_chl(sel_chl)
+
+    # 배경 이미지
+    if hero_label == "좋음":
+        chosen_img = img_good
+    elif hero_label == "주의":
+        chosen_img = img_warning
+    elif hero_label == "위험":
+        chosen_img = img_danger
+    else:
+        chosen_img = img_unknown
 
-    c1, c2 = st.columns(2)
-    with c1:
-        temp_text = "–" if pd.isna(sel_temp) else f"{sel_temp:.1f} °C"
-        st.markdown(
-            f"""
+    bg_css_url = get_asset_url(chosen_img)
+
+    # TODAY 카드용 상태 아이콘
+    if hero_label == "좋음":
+        hero_icon_path = icon_good
+    elif hero_label == "주의":
+        hero_icon_path = icon_warning
+    elif hero_label == "위험":
+        hero_icon_path = icon_danger
+    else:
+        hero_icon_path = icon_unknown
+
+    hero_icon_uri = get_asset_url(hero_icon_path) if hero_icon_path is not None else None
+
+    st.markdown(background_css(bg_css_url), unsafe_allow_html=True)
+
+    col_hero_main, col_hero_side = st.columns([2, 1.4])
+
+    with col_hero_side:
+        st.markdown('<div class="small-title">현재 주요 지표</div>', unsafe_allow_html=True)
+
+        if date_bounds is not None:
+            st.date_input(
+                "지표 조회 날짜",
+                value=selected_date,
+                min_value=date_bounds[0],
+                max_value=date_bounds[1],
+                key="metric_date",
+            )
+        else:
+            st.write("데이터가 부족하여 날짜 선택이 어렵습니다.")
+
+        c1, c2 = st.columns(2)
+        with c1:
+            temp_text = "–" if pd.isna(sel_temp) else f"{sel_temp:.1f} °C"
+            st.markdown(
+                f"""
 <div class="chip-box">
   <div class="chip-label">수온</div>
   <div class="chip-value">{temp_text}</div>
 </div>
 """,
-            unsafe_allow_html=True,
-        )
-    with c2:
-        turb_text = "–" if pd.isna(sel_turb) else f"{sel_turb:.1f} NTU"
-        st.markdown(
-            f"""
+                unsafe_allow_html=True,
+            )
+        with c2:
+            turb_text = "–" if pd.isna(sel_turb) else f"{sel_turb:.1f} NTU"
+            st.markdown(
+                f"""
 <div class="chip-box">
   <div class="chip-label">탁도</div>
   <div class="chip-value">{turb_text}</div>
 </div>
 """,
-            unsafe_allow_html=True,
-        )
+                unsafe_allow_html=True,
+            )
 
-    c3, c4 = st.columns(2)
-    with c3:
-        do_text = "–" if pd.isna(sel_do) else f"{sel_do:.1f} mg/L"
-        st.markdown(
-            f"""
+        c3, c4 = st.columns(2)
+        with c3:
+            do_text = "–" if pd.isna(sel_do) else f"{sel_do:.1f} mg/L"
+            st.markdown(
+                f"""
 <div class="chip-box">
   <div class="chip-label">용존산소</div>
   <div class="chip-value">{do_text}</div>
 </div>
 """,
-            unsafe_allow_html=True,
-        )
-    with c4:
-        time_txt = sel_time.strftime("%Y-%m-%d %H:%M") if sel_time is not None else "정보 없음"
-        st.markdown(
-            f"""
+                unsafe_allow_html=True,
+            )
+        with c4:
+            time_txt = sel_time.strftime("%Y-%m-%d %H:%M") if sel_time is not None else "정보 없음"
+            st.markdown(
+                f"""
 <div class="chip-box">
   <div class="chip-label">마지막 업데이트</div>
   <div class="chip-value">{time_txt}</div>
 </div>
 """,
-            unsafe_allow_html=True,
-        )
+                unsafe_allow_html=True,
+            )
 
-    chl_label_for_rec, _, _, _ = classify_chl(sel_chl)
-    rec_title, rec_color, rec_msg = build_activity_recommendation(
-        sel_chl, sel_temp, sel_turb, chl_label_for_rec
-    )
+        chl_label_for_rec, _, _, _ = classify_chl(sel_chl)
+        rec_title, rec_color, rec_msg = build_activity_recommendation(
+            sel_chl, sel_temp, sel_turb, chl_label_for_rec
+        )
 
-    st.markdown(
-        f"""
+        st.markdown(
+            f"""
 <div class="recommend-card">
   <div class="recommend-title">
     <span style="color:{rec_color}; font-size:0.9rem;">●</span>
@@ -708,17 +1213,17 @@ with col_hero_side:
   </div>
 </div>
 """,
-        unsafe_allow_html=True,
-    )
+            unsafe_allow_html=True,
+        )
 
-with col_hero_main:
-    chl_text = "–" if pd.isna(sel_chl) else f"{sel_chl:.1f}"
-    icon_html = f'<img class="hero-icon" src="{hero_icon_uri}" />' if hero_icon_uri is not None else ""
+    with col_hero_main:
+        chl_text = "–" if pd.isna(sel_chl) else f"{sel_chl:.1f}"
+        icon_html = f'<img class="hero-icon" src="{hero_icon_uri}" />' if hero_icon_uri is not None else ""
 
-    hero_html = f"""
+        hero_html = f"""
 <div class="card hero-card">
-  <div class="hero-title">TODAY • BRISBANE RIVER • COLMSLIE</div>
-  <div class="hero-location">브리즈번 강 조류 농도</div>
+  <div class="hero-title">TODAY • {site_info["name"].upper()}</div>
+  <div class="hero-location">{site_info.get("river") or site_info["name"]} 조류 농도</div>
 
   {icon_html}
 
@@ -738,224 +1243,190 @@ with col_hero_main:
   </div>
 </div>
 """
-    st.markdown(hero_html, unsafe_allow_html=True)
+        st.markdown(hero_html, unsafe_allow_html=True)
+
+
+render_hero_section(site, site_info, data_version, date_bounds, today_date, latest_time)
 
 # ============================================================
 # 2. 이번주 조류량 예측 + 위치 지도
 # ============================================================
-st.markdown('<div class="section-title">이번주 조류량 예측</div>', unsafe_allow_html=True)
-st.markdown(
-    '<div class="info-text">예측 모델을 이용해 앞으로 7일 동안의 일별 조류 농도 범위(최저·최고)와 전체 추세를 함께 보여줍니다.</div>',
-    unsafe_allow_html=True,
-)
-
-if forecast_df is None or forecast_df.empty:
-    st.info("예측 파일(future_week_forecast.csv)을 찾을 수 없어, 주간 예보를 표시할 수 없습니다.")
-else:
-    df_fore = forecast_df.copy()
-    df_fore["date"] = df_fore["Timestamp"].dt.date
-
-    daily = (
-        df_fore.groupby("date")["Forecast_Chlorophyll_Kalman"]
-        .agg(["min", "max", "mean"])
-        .reset_index()
+@st.fragment
+@timed_section("weekly")
+def render_weekly_section(site_info, forecast_ver, today_date):
+    """주간 예보 라인 그래프 · 일별 카드 · 지점 지도. 조회 일자를 바꾸면 이 섹션만 다시 그린다."""
+    site = site_info["id"]
+    st.markdown('<div class="section-title">이번주 조류량 예측</div>', unsafe_allow_html=True)
+    st.markdown(
+        '<div class="info-text">예측 모델을 이용해 앞으로 7일 동안의 일별 조류 농도 범위(최저·최고)와 전체 추세를 함께 보여줍니다.</div>',
+        unsafe_allow_html=True,
     )
-    daily = daily.sort_values("date").head(7)
 
-    if daily.empty:
-        st.warning("주간 예보 데이터가 없습니다.")
+    forecast_df = load_future_forecast(site, forecast_ver)
+    if forecast_ver is not None and forecast_ver.startswith("model:"):
+        model_version, newest = forecast_ver[len("model:"):].split("@")
+        st.caption(f"모델 {model_version} · {pd.Timestamp(newest):%Y-%m-%d %H:%M} 측정값까지 반영한 예보")
+    if forecast_df is None or forecast_df.empty:
+        st.info("예측 파일(future_week_forecast.csv)을 찾을 수 없어, 주간 예보를 표시할 수 없습니다.")
     else:
-        global_min = daily["min"].min()
-        global_max = daily["max"].max()
-        denom = (
-            global_max - global_min
-            if pd.notna(global_min) and pd.notna(global_max) and global_max > global_min
-            else None
-        )
-
-        weekdays_kr = ["월", "화", "수", "목", "금", "토", "일"]
-
-        period_start = daily["date"].min()
-        period_end = daily["date"].max()
-        period_text = f"{period_start.strftime('%m월 %d일')} ~ {period_end.strftime('%m월 %d일')}"
-
-        # ----- 라인 그래프 조회 바 -----
-        st.markdown(
-            '<div class="info-text" style="margin-top:0.4rem; margin-bottom:0.15rem;">라인 그래프 조회 일자</div>',
-            unsafe_allow_html=True,
-        )
-        line_date_options = [None] + list(daily["date"])
-
-        selected_line_date = st.selectbox(
-            "",
-            options=line_date_options,
-            index=0,
-            format_func=lambda d: "전체 기간" if d is None else d.strftime("%m/%d"),
-            label_visibility="collapsed",
-        )
-
-        if selected_line_date is None:
-            mask = (df_fore["date"] >= period_start) & (df_fore["date"] <= period_end)
+        df_fore = forecast_df.copy()
+        df_fore["date"] = day_codes(df_fore["Timestamp"])
+
+        # 예측 파일이 30일/90일치를 담고 있으면 더 긴 예보 기간도 고를 수 있다
+        n_fore_days = df_fore["date"].nunique()
+        horizon_options = [h for h in OUTLOOK_HORIZONS if h <= n_fore_days] or OUTLOOK_HORIZONS[:1]
+        if len(horizon_options) > 1:
+            horizon_days = st.radio(
+                "예보 기간",
+                options=horizon_options,
+                format_func=lambda h: f"{h}일",
+                horizontal=True,
+            )
         else:
-            mask = df_fore["date"] == selected_line_date
-
-        line_df = df_fore.loc[mask].copy().sort_values("Timestamp")
-
-        # ✅ 선택 기간(전체/하루) 기준으로 "최대 예보" 다시 계산
-        max_info_html = ""
-        if not line_df.empty and line_df["Forecast_Chlorophyll_Kalman"].notna().any():
-            idxmax = line_df["Forecast_Chlorophyll_Kalman"].idxmax()
-            max_future_value = line_df.loc[idxmax, "Forecast_Chlorophyll_Kalman"]
-            max_future_time = line_df.loc[idxmax, "Timestamp"]
+            horizon_days = horizon_options[0]
 
-            if pd.notna(max_future_value) and pd.notna(max_future_time):
-                lab, emo, _, _ = classify_chl(max_future_value)
-                t_txt = max_future_time.strftime("%Y-%m-%d %H:%M")
+        daily = get_daily_outlook(site, forecast_ver, horizon_days)
 
-                prefix_txt = "이번주 전체 기간 중" if selected_line_date is None else f"{selected_line_date.strftime('%m/%d')} 기간 중"
-
-                date_color = "#60a5fa"
-                value_color = "#f97316"
-
-                max_info_html = (
-                    f"<span style='color:{date_color}; font-weight:800;'>{prefix_txt}</span> 가장 조류 농도가 높게 예보된 시점은 "
-                    f"<span style='color:{date_color}; font-weight:800;'>{t_txt}</span>이며, "
-                    f"예측값은 약 <span style='color:{value_color}; font-weight:900;'>{max_future_value:.1f} µg/L</span>"
-                    f" ({emo} {lab}) 입니다."
-                )
-
-        # 시간별 예측 라인 그래프
-        if not line_df.empty:
-            y_max = max(line_df["Forecast_Chlorophyll_Kalman"].max(), 10)
+        if daily.empty:
+            st.warning("주간 예보 데이터가 없습니다.")
+        else:
+            period_start = daily["date"].min()
+            period_end = daily["date"].max()
+            period_text = f"{period_start.strftime('%m월 %d일')} ~ {period_end.strftime('%m월 %d일')}"
+
+            # ----- 라인 그래프 조회 바 -----
+            st.markdown(
+                '<div class="info-text" style="margin-top:0.4rem; margin-bottom:0.15rem;">라인 그래프 조회 일자</div>',
+                unsafe_allow_html=True,
+            )
+            line_date_options = [None] + list(daily["date"])
+
+            selected_line_date = st.selectbox(
+                "",
+                options=line_date_options,
+                index=0,
+                format_func=lambda d: "전체 기간" if d is None else d.strftime("%m/%d"),
+                label_visibility="collapsed",
+            )
 
-            x = line_df["Timestamp"]
-            y = line_df["Forecast_Chlorophyll_Kalman"]
+            if selected_line_date is None:
+                mask = (df_fore["date"] >= period_start) & (df_fore["date"] <= period_end)
+            else:
+                mask = df_fore["date"] == selected_line_date
 
-            y_good = y.where(y < 4)
-            y_warn = y.where((y >= 4) & (y < 8))
-            y_danger = y.where(y >= 8)
+            line_df = df_fore.loc[mask].copy().sort_values("Timestamp")
 
-            fig = go.Figure()
-            add_risk_bands_plotly(fig, y_max)
+            # ✅ 선택 기간(전체/하루) 기준으로 "최대 예보" 다시 계산
+            max_info_html = ""
+            if not line_df.empty and line_df["Forecast_Chlorophyll_Kalman"].notna().any():
+                idxmax = line_df["Forecast_Chlorophyll_Kalman"].idxmax()
+                max_future_value = line_df.loc[idxmax, "Forecast_Chlorophyll_Kalman"]
+                max_future_time = line_df.loc[idxmax, "Timestamp"]
 
-            fig.add_trace(go.Scatter(
-                x=x, y=y_good, mode="lines",
-                name="좋음 구간",
-                line=dict(width=2.0, color="#22c55e"),
-                hovertemplate="%{x}<br>클로로필: %{y:.2f} µg/L<extra></extra>",
-            ))
-            fig.add_trace(go.Scatter(
-                x=x, y=y_warn, mode="lines",
-                name="주의 구간",
-                line=dict(width=2.6, color="#f97316"),
-                hovertemplate="%{x}<br>클로로필: %{y:.2f} µg/L<extra></extra>",
-            ))
-            fig.add_trace(go.Scatter(
-                x=x, y=y_danger, mode="lines",
-                name="위험 구간",
-                line=dict(width=2.8, color="#ef4444"),
-                hovertemplate="%{x}<br>클로로필: %{y:.2f} µg/L<extra></extra>",
-            ))
+                if pd.notna(max_future_value) and pd.notna(max_future_time):
+                    lab, emo, _, _ = classify_chl(max_future_value)
+                    t_txt = max_future_time.strftime("%Y-%m-%d %H:%M")
 
-            # ✅ Plotly 내부 title 제거(“undefined”/잘림 방지), 텍스트는 Streamlit 마크다운으로 카드 상단에 표시
-            fig.update_layout(
-                height=290,
-                margin=dict(l=10, r=10, t=10, b=10),
-                showlegend=False,
-                title_text="",
-                paper_bgcolor="rgba(0,0,0,0)",
-                plot_bgcolor="rgba(0,0,0,0)",
-                font=dict(color="#ffffff"),
-                xaxis=dict(
-                    tickformat="%m-%d %H:%M",
-                    gridcolor="rgba(148,163,184,0.25)",
-                    zerolinecolor="rgba(148,163,184,0.35)",
-                    title="시간",
-                    title_font=dict(color="#ffffff", size=12),
-                    tickfont=dict(color="#ffffff", size=11),
-                ),
-                yaxis=dict(
-                    range=[0, y_max],
-                    gridcolor="rgba(148,163,184,0.25)",
-                    zerolinecolor="rgba(148,163,184,0.35)",
-                    title="클로로필 (µg/L)",
-                    title_font=dict(color="#ffffff", size=12),
-                    tickfont=dict(color="#ffffff", size=11),
-                ),
-            )
+                    prefix_txt = "이번주 전체 기간 중" if selected_line_date is None else f"{selected_line_date.strftime('%m/%d')} 기간 중"
 
-            # ✅ 텍스트+그래프를 "같은 박스"로 묶어서 출력
-            with st.container():
-                st.markdown('<div id="weekly-trend-anchor"></div>', unsafe_allow_html=True)
-                st.markdown('<div class="weekly-trend-title">이번주 시간별 조류 농도 추세</div>', unsafe_allow_html=True)
+                    date_color = "#60a5fa"
+                    value_color = "#f97316"
 
-                if max_info_html:
-                    st.markdown(f'<div class="weekly-trend-sub">{max_info_html}</div>', unsafe_allow_html=True)
-                else:
-                    st.markdown('<div class="weekly-trend-sub">최대 예보 정보를 계산할 수 없습니다.</div>', unsafe_allow_html=True)
+                    max_info_html = (
+                        f"<span style='color:{date_color}; font-weight:800;'>{prefix_txt}</span> 가장 조류 농도가 높게 예보된 시점은 "
+                        f"<span style='color:{date_color}; font-weight:800;'>{t_txt}</span>이며, "
+                        f"예측값은 약 <span style='color:{value_color}; font-weight:900;'>{max_future_value:.1f} µg/L</span>"
+                        f" ({emo} {lab}) 입니다."
+                    )
 
-                st.plotly_chart(fig, use_container_width=True)
+            # 시간별 예측 라인 그래프
+            if not line_df.empty:
+                y_max = max(line_df["Forecast_Chlorophyll_Kalman"].max(), 10)
 
-        else:
-            st.info("선택한 기간에 대한 예측 데이터가 없습니다.")
-
-        # ---------- 7일간 일별 예보 카드 ----------
-        week_rows_html = ""
-        for _, row in daily.iterrows():
-            d = row["date"]
+                x, y = get_forecast_line(
+                    line_df["Timestamp"].to_numpy(),
+                    line_df["Forecast_Chlorophyll_Kalman"].to_numpy(),
+                    FORECAST_CHART_WIDTH,
+                )
+                y = pd.Series(y)
+
+                y_good = y.where(y < 4)
+                y_warn = y.where((y >= 4) & (y < 8))
+                y_danger = y.where(y >= 8)
+
+                t_chart = time.perf_counter()
+                fig = go.Figure()
+                add_risk_bands_plotly(fig, y_max)
+
+                fig.add_trace(go.Scatter(
+                    x=x, y=y_good, mode="lines",
+                    name="좋음 구간",
+                    line=dict(width=2.0, color="#22c55e"),
+                    hovertemplate="%{x}<br>클로로필: %{y:.2f} µg/L<extra></extra>",
+                ))
+                fig.add_trace(go.Scatter(
+                    x=x, y=y_warn, mode="lines",
+                    name="주의 구간",
+                    line=dict(width=2.6, color="#f97316"),
+                    hovertemplate="%{x}<br>클로로필: %{y:.2f} µg/L<extra></extra>",
+                ))
+                fig.add_trace(go.Scatter(
+                    x=x, y=y_danger, mode="lines",
+                    name="위험 구간",
+                    line=dict(width=2.8, color="#ef4444"),
+                    hovertemplate="%{x}<br>클로로필: %{y:.2f} µg/L<extra></extra>",
+                ))
+
+                # ✅ Plotly 내부 title 제거(“undefined”/잘림 방지), 텍스트는 Streamlit 마크다운으로 카드 상단에 표시
+                fig.update_layout(
+                    height=290,
+                    margin=dict(l=10, r=10, t=10, b=10),
+                    showlegend=False,
+                    title_text="",
+                    paper_bgcolor="rgba(0,0,0,0)",
+                    plot_bgcolor="rgba(0,0,0,0)",
+                    font=dict(color="#ffffff"),
+                    xaxis=dict(
+                        tickformat="%m-%d %H:%M",
+                        gridcolor="rgba(148,163,184,0.25)",
+                        zerolinecolor="rgba(148,163,184,0.35)",
+                        title="시간",
+                        title_font=dict(color="#ffffff", size=12),
+                        tickfont=dict(color="#ffffff", size=11),
+                    ),
+                    yaxis=dict(
+                        range=[0, y_max],
+                        gridcolor="rgba(148,163,184,0.25)",
+                        zerolinecolor="rgba(148,163,184,0.35)",
+                        title="클로로필 (µg/L)",
+                        title_font=dict(color="#ffffff", size=12),
+                        tickfont=dict(color="#ffffff", size=11),
+                    ),
+                )
 
-            if today_date is not None and d == today_date:
-                day_label = f"오늘 ({d.strftime('%m/%d')})"
-            else:
-                wd = d.weekday()
-                day_label = f"{weekdays_kr[wd]} ({d.strftime('%m/%d')})"
+                # ✅ 텍스트+그래프를 "같은 박스"로 묶어서 출력
+                with st.container():
+                    st.markdown('<div id="weekly-trend-anchor"></div>', unsafe_allow_html=True)
+                    st.markdown('<div class="weekly-trend-title">이번주 시간별 조류 농도 추세</div>', unsafe_allow_html=True)
 
-            d_min = row["min"]
-            d_max = row["max"]
-            d_mean = row["mean"]
+                    if max_info_html:
+                        st.markdown(f'<div class="weekly-trend-sub">{max_info_html}</div>', unsafe_allow_html=True)
+                    else:
+                        st.markdown('<div class="weekly-trend-sub">최대 예보 정보를 계산할 수 없습니다.</div>', unsafe_allow_html=True)
 
-            mean_txt = "–" if pd.isna(d_mean) else f"{d_mean:.1f}"
-            label, emoji, color, _ = classify_chl(d_mean)
+                    st.plotly_chart(fig, use_container_width=True)
+                record_timing("weekly.chart", t_chart)
 
-            if denom is None or denom <= 0:
-                left_pct = 0
-                width_pct = 100
             else:
-                left_pct = (float(d_min) - float(global_min)) / float(denom) * 100
-                width_pct = (float(d_max) - float(d_min)) / float(denom) * 100
-                left_pct = max(0, min(left_pct, 100))
-                width_pct = max(5, min(width_pct, 100 - left_pct))
+                st.info("선택한 기간에 대한 예측 데이터가 없습니다.")
 
-            if denom is None or denom <= 0 or pd.isna(d_mean):
-                mean_marker_left = 50.0
-            else:
-                mean_marker_left = (float(d_mean) - float(global_min)) / float(denom) * 100
-                mean_marker_left = max(0, min(mean_marker_left, 100))
-
-            week_rows_html += f"""
-  <div class="week-row">
-    <div class="week-day">{day_label}</div>
-    <div class="week-status">
-      <span class="week-emoji">{emoji}</span>
-      <span class="week-status-text">{label}</span>
-    </div>
-    <div class="week-mean">{mean_txt}</div>
-    <div class="week-min">{d_min:.1f}</div>
-    <div class="week-range-track">
-      <div class="week-range-bar"
-           style="left:{left_pct:.1f}%; width:{width_pct:.1f}%; background-color:{color};"></div>
-      <div class="week-mean-marker"
-           style="left:{mean_marker_left:.1f}%;"
-           title="평균 {mean_txt} µg/L"></div>
-    </div>
-    <div class="week-max">{d_max:.1f}</div>
-  </div>
-"""
+            # ---------- 일별 예보 카드 ----------
+            week_rows_html = get_outlook_rows_html(site, forecast_ver, horizon_days, today_date)
 
-        week_card_html = f"""
+            week_card_html = f"""
 <div class="card">
   <div class="week-card-header">
-    <div class="week-card-title">7일간 일별 예보 (µg/L)</div>
+    <div class="week-card-title">{horizon_days}일간 일별 예보 (µg/L)</div>
     <div class="week-subtitle">예보 기간: {period_text}</div>
   </div>
   <div class="week-rows">
@@ -972,21 +1443,21 @@ else:
 </div>
 """
 
-        map_card_html = """
+            map_card_html = f"""
 <div class="card">
   <div class="week-card-header">
-    <div class="week-card-title">브리즈번 강 위치</div>
-    <div class="week-subtitle">Colmslie Buoy 기준</div>
+    <div class="week-card-title">{site_info.get("river") or site_info["name"]} 위치</div>
+    <div class="week-subtitle">{site_info["name"]} 기준</div>
   </div>
   <div style="position:relative; border-radius: 1.0rem; overflow: hidden; margin-top: 0.25rem;">
     <iframe
-        src="https://www.openstreetmap.org/export/embed.html?bbox=153.08047%2C-27.45170%2C153.08647%2C-27.44520&layer=mapnik&marker=-27.44920%2C153.08347"
+        src="{map_embed_url(site_info)}"
         style="border:0; width:100%; height:255px;"
         loading="lazy"
         referrerpolicy="no-referrer-when-downgrade">
     </iframe>
     <a
-        href="https://www.google.com/maps/@?api=1&map_action=pano&viewpoint=-27.449204719754594,153.0834701552862&heading=0&pitch=0&fov=80"
+        href="https://www.google.com/maps/@?api=1&map_action=pano&viewpoint={site_info["lat"]},{site_info["lon"]}&heading=0&pitch=0&fov=80"
         target="_blank"
         style="position:absolute; right:0.75rem; bottom:0.75rem; background:rgba(15,23,42,0.85); color:#f9fafb; font-size:0.78rem; padding:0.25rem 0.6rem; border-radius:999px; text-decoration:none;">
         로드뷰 열기
@@ -995,30 +1466,35 @@ else:
 </div>
 """
 
-        col_week_card, col_map_card = st.columns([3, 2])
-        with col_week_card:
-            st.markdown(week_card_html, unsafe_allow_html=True)
-        with col_map_card:
-            st.markdown(map_card_html, unsafe_allow_html=True)
+            col_week_card, col_map_card = st.columns([3, 2])
+            with col_week_card:
+                st.markdown(week_card_html, unsafe_allow_html=True)
+            with col_map_card:
+                st.markdown(map_card_html, unsafe_allow_html=True)
+
+
+render_weekly_section(site_info, forecast_ver, today_date)
 
 # ============================================================
 # 3. 전체 데이터 보기 + 시계열 그래프
 # ============================================================
-with st.expander("📊 전체 수집 데이터 보기", expanded=False):
-    st.markdown(
-        """
+@st.fragment
+@timed_section("explorer")
+def render_explorer_section(site, data_version, date_bounds):
+    """전체 데이터 탐색기. 기간 · 지표 · 다운로드 형식을 바꾸면 이 섹션만 다시 그린다."""
+    with st.expander("📊 전체 수집 데이터 보기", expanded=False):
+        st.markdown(
+            """
 <div class="expander-text">
 - 아래 표는 센서 보정값(Kalman)이 포함된 원시 데이터입니다.<br>
 - 원하는 기간과 지표를 선택해 시계열로 볼 수 있고, CSV로 내려받아 추가 분석에 활용할 수 있습니다.
 </div>
 """,
-        unsafe_allow_html=True,
-    )
+            unsafe_allow_html=True,
+        )
 
-    if not df.empty:
-        if "date" in df.columns and "Timestamp" in df.columns:
-            min_date = df["date"].min()
-            max_date = df["date"].max()
+        if date_bounds is not None:
+            min_date, max_date = date_bounds
 
             default_start = max_date - datetime.timedelta(days=2)
             if default_start < min_date:
@@ -1032,71 +1508,185 @@ with st.expander("📊 전체 수집 데이터 보기", expanded=False):
                 format="YYYY-MM-DD",
             )
 
-            mask_range = (df["date"] >= start_date) & (df["date"] <= end_date)
-            df_range = df.loc[mask_range].copy()
-        else:
-            df_range = df.copy()
+            # 지표 목록은 최신 조각에서, 표는 구간 끝쪽 조각만 읽어 만든다 (기간마다 한 번, 캐시)
+            numeric_cols = get_numeric_columns(site, data_version)
 
-        numeric_cols = [col for col in df_range.columns if pd.api.types.is_numeric_dtype(df_range[col])]
+            if numeric_cols:
+                default_idx = numeric_cols.index("Chlorophyll_Kalman") if "Chlorophyll_Kalman" in numeric_cols else 0
 
-        if numeric_cols:
-            default_idx = numeric_cols.index("Chlorophyll_Kalman") if "Chlorophyll_Kalman" in numeric_cols else 0
+                selected_series = st.selectbox(
+                    "시계열로 보고 싶은 지표",
+                    options=numeric_cols,
+                    index=default_idx,
+                )
 
-            selected_series = st.selectbox(
-                "시계열로 보고 싶은 지표",
-                options=numeric_cols,
-                index=default_idx,
-            )
+                # 긴 기간은 집계표에서, 짧은 기간은 원본을 차트 폭에 맞춰 줄인 점만 보낸다
+                level, x_hist, y_hist, y_lo, y_hi = get_explorer_series(
+                    site, data_version, selected_series, start_date, end_date, EXPLORER_CHART_WIDTH
+                )
 
-            df_ts = df_range.dropna(subset=["Timestamp"]).sort_values("Timestamp")
+                t_chart = time.perf_counter()
+                fig_hist = px.line(
+                    x=x_hist,
+                    y=y_hist,
+                    labels={"x": "시간", "y": selected_series},
+                )
+                if y_lo is not None:
+                    fig_hist.add_trace(go.Scatter(
+                        x=x_hist, y=y_hi, mode="lines", line=dict(width=0),
+                        showlegend=False, hoverinfo="skip",
+                    ))
+                    fig_hist.add_trace(go.Scatter(
+                        x=x_hist, y=y_lo, mode="lines", line=dict(width=0),
+                        fill="tonexty", fillcolor="rgba(96,165,250,0.25)",
+                        showlegend=False, hoverinfo="skip",
+                    ))
+                fig_hist.update_layout(
+                    height=260,
+                    margin=dict(l=10, r=10, t=35, b=10),
+                    paper_bgcolor="rgba(0,0,0,0)",
+                    plot_bgcolor="rgba(0,0,0,0)",
+                    font=dict(color="#ffffff"),
+                    xaxis=dict(
+                        gridcolor="rgba(148,163,184,0.25)",
+                        zerolinecolor="rgba(148,163,184,0.35)",
+                        title="시간",
+                        title_font=dict(color="#ffffff", size=12),
+                        tickfont=dict(color="#ffffff", size=11),
+                    ),
+                    yaxis=dict(
+                        gridcolor="rgba(148,163,184,0.25)",
+                        zerolinecolor="rgba(148,163,184,0.35)",
+                        title=selected_series,
+                        title_font=dict(color="#ffffff", size=12),
+                        tickfont=dict(color="#ffffff", size=11),
+                    ),
+                    title=dict(
+                        text=f"선택 지표 시계열 ({ROLLUP_LABELS[level]}{' 평균, 음영: 최소~최대' if level else ''})",
+                        x=0.01,
+                        xanchor="left",
+                        y=0.95,
+                        font=dict(size=14, color="#ffffff"),
+                    ),
+                )
 
-            fig_hist = px.line(
-                df_ts,
-                x="Timestamp",
-                y=selected_series,
-                labels={"Timestamp": "시간", selected_series: selected_series},
-            )
-            fig_hist.update_layout(
-                height=260,
-                margin=dict(l=10, r=10, t=35, b=10),
-                paper_bgcolor="rgba(0,0,0,0)",
-                plot_bgcolor="rgba(0,0,0,0)",
-                font=dict(color="#ffffff"),
-                xaxis=dict(
-                    gridcolor="rgba(148,163,184,0.25)",
-                    zerolinecolor="rgba(148,163,184,0.35)",
-                    title="시간",
-                    title_font=dict(color="#ffffff", size=12),
-                    tickfont=dict(color="#ffffff", size=11),
-                ),
-                yaxis=dict(
-                    gridcolor="rgba(148,163,184,0.25)",
-                    zerolinecolor="rgba(148,163,184,0.35)",
-                    title=selected_series,
-                    title_font=dict(color="#ffffff", size=12),
-                    tickfont=dict(color="#ffffff", size=11),
-                ),
-                title=dict(
-                    text="선택 지표 시계열",
-                    x=0.01,
-                    xanchor="left",
-                    y=0.95,
-                    font=dict(size=14, color="#ffffff"),
+                st.plotly_chart(fig_hist, use_container_width=True)
+                record_timing("explorer.chart", t_chart)
+            else:
+                st.info("시계열로 표시할 수 있는 수치형 지표가 없습니다.")
+
+            st.dataframe(get_explorer_table(site, data_version, start_date, end_date), use_container_width=True)
+
+            col_fmt, col_scope = st.columns([1, 1])
+            with col_fmt:
+                export_fmt = st.selectbox(
+                    "다운로드 형식",
+                    options=list(EXPORT_FORMATS),
+                    format_func={"csv": "CSV", "csv.gz": "CSV (gzip 압축)", "parquet": "Parquet"}.get,
+                )
+            with col_scope:
+                export_range = st.checkbox("선택 기간만 내려받기", value=False)
+
+            # 파일은 버튼을 누를 때만 만든다 (다시 그릴 때마다 전체 데이터를 직렬화하지 않음)
+            export_args = (site, data_version, export_fmt) + ((start_date, end_date) if export_range else ())
+            mime, ext = EXPORT_FORMATS[export_fmt]
+            scope_text = "선택 기간" if export_range else "전체"
+            st.download_button(
+                label=f"📥 {scope_text} 수질 데이터 다운로드 ({ext.lstrip('.').upper()})",
+                data=functools.partial(run_export, export_args, st.session_state.get("profiling", False)),
+                file_name=(
+                    f"{site}_water_{start_date:%Y%m%d}_{end_date:%Y%m%d}{ext}" if export_range
+                    else f"{site}_water_all{ext}"
                 ),
+                mime=mime,
+                on_click="ignore",
             )
-
-            st.plotly_chart(fig_hist, use_container_width=True)
         else:
-            st.info("시계열로 표시할 수 있는 수치형 지표가 없습니다.")
+            st.write("데이터가 없습니다.")
+
+
+render_explorer_section(site, data_version, date_bounds)
+
+# ============================================================
+# 4. 조류 등급 이력
+# ============================================================
+@st.fragment
+@timed_section("risk_timeline")
+def render_risk_timeline_section(site, data_version):
+    """
+    전체 기간 등급 비율 (일/주 단위). 집계 단위를 바꾸면 이 섹션만 다시 그린다.
+    전체 파티션을 읽어야 하므로 펼쳤을 때만 계산한다 (접힌 채로는 아무것도 읽지 않음).
+    """
+    with st.expander("🗓️ 조류 등급 이력 보기", expanded=False, key="risk_timeline_open", on_change="rerun") as box:
+        if not box.open:
+            return
+        st.markdown(
+            """
+<div class="expander-text">
+- 수집된 전체 기간에 대해 하루(또는 한 주) 중 각 조류 등급에 머문 시간 비율입니다.<br>
+- 등급 기준은 위 카드와 같습니다 (🟢 0–4 · 🟡 4–8 · 🔴 8 이상 µg/L).
+</div>
+""",
+            unsafe_allow_html=True,
+        )
 
-        st.dataframe(df_range.tail(300), use_container_width=True)
+        freq = st.radio(
+            "집계 단위",
+            options=["D", "W-MON"],
+            format_func={"D": "일별", "W-MON": "주별"}.get,
+            horizontal=True,
+        )
+        counts = get_risk_timeline(site, data_version, freq)
+        if counts.empty:
+            st.info("등급을 계산할 클로로필 데이터가 없습니다.")
+            return
+
+        share = counts.div(counts.sum(axis=1), axis=0) * 100
+        t_chart = time.perf_counter()
+        fig_risk = go.Figure()
+        for label, color in zip(CHL_LABELS, CHL_COLORS):
+            fig_risk.add_trace(go.Bar(
+                x=share.index, y=share[label], name=label, marker_color=color,
+                hovertemplate="%{x|%Y-%m-%d}<br>" + label + ": %{y:.1f}%<extra></extra>",
+            ))
+        fig_risk.update_layout(
+            barmode="stack",
+            bargap=0,
+            height=260,
+            margin=dict(l=10, r=10, t=10, b=10),
+            paper_bgcolor="rgba(0,0,0,0)",
+            plot_bgcolor="rgba(0,0,0,0)",
+            font=dict(color="#ffffff"),
+            legend=dict(orientation="h", y=1.08, x=0),
+            xaxis=dict(
+                gridcolor="rgba(148,163,184,0.25)",
+                title="기간",
+                title_font=dict(color="#ffffff", size=12),
+                tickfont=dict(color="#ffffff", size=11),
+            ),
+            yaxis=dict(
+                range=[0, 100],
+                gridcolor="rgba(148,163,184,0.25)",
+                title="시간 비율 (%)",
+                title_font=dict(color="#ffffff", size=12),
+                tickfont=dict(color="#ffffff", size=11),
+            ),
+        )
+        st.plotly_chart(fig_risk, use_container_width=True)
+        record_timing("risk_timeline.chart", t_chart)
 
-        csv_all = df.to_csv(index=False).encode("utf-8-sig")
-        st.download_button(
-            label="📥 전체 수질 데이터 다운로드 (CSV)",
-            data=csv_all,
-            file_name="brisbane_water_all.csv",
-            mime="text/csv",
+        total = counts.sum()
+        total_share = total / total.sum() * 100
+        st.markdown(
+            '<div class="info-text">전체 기간: '
+            + " · ".join(f"{emoji} {label} {total_share[label]:.1f}%" for label, emoji, _, _ in CHL_LEVELS)
+            + "</div>",
+            unsafe_allow_html=True,
         )
-    else:
-        st.write("데이터가 없습니다.")
+
+
+render_risk_timeline_section(site, data_version)
+
+if st.session_state.get("profiling"):
+    render_profile_panel()
+end_profile_run()
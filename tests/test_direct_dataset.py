@@ -0,0 +1,63 @@
+import math
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import train_offline as T  # noqa: E402
+
+
+FREQ = pd.Timedelta("10min")
+
+
+def make_training_frame(n=3000, gap=(1200, 1390), seed=0):
+    """10분 간격 데이터에서 gap 행 구간을 통째로 뺀 학습 프레임과 (결측 없는) 피처 행렬."""
+    rng = np.random.default_rng(seed)
+    idx = pd.date_range("2024-01-01", periods=n, freq=FREQ, name="Timestamp")
+    day = 2 * np.pi * np.arange(n) / 144
+    df = pd.DataFrame({T.TARGET_COL: 3 + np.sin(day) + rng.normal(0, 0.1, n)}, index=idx)
+    df.iloc[500:505, 0] = np.nan
+    df = df.drop(df.index[gap[0]:gap[1]])
+
+    X, names = T.build_feature_matrix(df, T.TARGET_COL, exog_cols=[])
+    valid = ~np.isnan(X).any(axis=1)
+    X_train = pd.DataFrame(X[valid], index=df.index[valid], columns=names)
+    return df, X_train
+
+
+def reference_pairs(df, X_train, n_steps):
+    """시작점마다 horizon h 의 목표를 시작점 시각 + (h-1) * FREQ 로 찾는 느린 기준 구현."""
+    y = df[T.TARGET_COL]
+    train_end = X_train.index[-1]
+    out = []
+    n_grid = math.ceil(n_steps / T.DIRECT_HORIZON_STRIDE)
+    for i, r in enumerate(range(0, len(X_train), T.DIRECT_ORIGIN_STRIDE)):
+        origin = X_train.index[r]
+        offset = i % T.DIRECT_HORIZON_STRIDE + 1
+        for g in range(n_grid):
+            h = offset + T.DIRECT_HORIZON_STRIDE * g
+            t = origin + (h - 1) * FREQ
+            if h > n_steps or t > train_end or t not in y.index or np.isnan(y[t]):
+                continue
+            out.append((r, h, t, y[t]))
+    return out
+
+
+def test_direct_targets_follow_timestamps_across_gaps():
+    df, X_train = make_training_frame()
+    n_steps = 144
+    X_dir, y_dir = T.make_direct_dataset(df, X_train, T.TARGET_COL, n_steps, FREQ)
+
+    expected = reference_pairs(df, X_train, n_steps)
+    assert len(X_dir) == len(expected)
+    rows = np.array([r for r, _, _, _ in expected])
+    np.testing.assert_array_equal(X_dir["horizon"].to_numpy(), [h for _, h, _, _ in expected])
+    np.testing.assert_array_equal(X_dir["target_hour"].to_numpy(), [t.hour for _, _, t, _ in expected])
+    np.testing.assert_array_equal(y_dir, [v for _, _, _, v in expected])
+    np.testing.assert_array_equal(
+        X_dir[list(X_train.columns)].to_numpy(), X_train.to_numpy(dtype=np.float32)[rows]
+    )
+
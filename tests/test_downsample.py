@@ -0,0 +1,113 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from downsample import _bucket_edges, downsample, lttb_indices, minmax_indices  # noqa: E402
+
+
+def make_series(n=10_000, nan_frac=0.0, seed=0):
+    rng = np.random.default_rng(seed)
+    x = pd.date_range("2024-01-01", periods=n, freq="10min").to_numpy()
+    y = np.sin(np.arange(n) / 150) + rng.normal(0, 0.1, n)
+    y[rng.integers(0, n, 20)] += 5       # 순간 피크
+    if nan_frac:
+        y[rng.random(n) < nan_frac] = np.nan
+        y[3000:3400] = np.nan            # 긴 결측 구간
+    return x, y
+
+
+# =====================================================================
+# 공통 성질
+# =====================================================================
+@pytest.mark.parametrize("method", ["minmax", "lttb"])
+@pytest.mark.parametrize("width", [4, 7, 100, 801, 1200])
+@pytest.mark.parametrize("nan_frac", [0.0, 0.05])
+def test_length_order_and_endpoints(method, width, nan_frac):
+    x, y = make_series(nan_frac=nan_frac)
+    xs, ys = downsample(x, y, width, method=method)
+
+    assert len(xs) == len(ys) <= width
+    assert np.all(np.diff(xs.astype(np.int64)) > 0)
+    # 고른 점은 원본의 (시각, 값) 쌍 그대로
+    pos = np.searchsorted(x, xs)
+    np.testing.assert_array_equal(y[pos], ys)
+
+    if method == "minmax":
+        assert xs[0] == x[0] and xs[-1] == x[-1]
+    else:
+        # LTTB 는 NaN 을 후보에서 빼므로 첫/마지막 유효 점을 남긴다
+        valid = np.flatnonzero(~np.isnan(y))
+        assert xs[0] == x[valid[0]] and xs[-1] == x[valid[-1]]
+        assert not np.isnan(ys).any()
+
+
+def test_short_input_is_returned_unchanged():
+    x, y = make_series(n=500)
+    xs, ys = downsample(x, y, 800)
+    np.testing.assert_array_equal(xs, x)
+    np.testing.assert_array_equal(ys, y)
+
+
+def test_unknown_method_raises():
+    x, y = make_series(n=2000)
+    with pytest.raises(ValueError):
+        downsample(x, y, 100, method="nearest")
+
+
+# =====================================================================
+# minmax
+# =====================================================================
+@pytest.mark.parametrize("nan_frac", [0.0, 0.05])
+def test_minmax_keeps_each_bucket_min_and_max(nan_frac):
+    _, y = make_series(nan_frac=nan_frac)
+    n_buckets = 150
+    idx = minmax_indices(y, n_buckets)
+    assert len(idx) <= 2 * n_buckets + 2
+
+    edges = _bucket_edges(len(y), n_buckets)
+    for lo, hi in zip(edges[:-1], edges[1:]):
+        bucket = y[lo:hi]
+        picked = idx[(idx >= lo) & (idx < hi)]
+        if np.isnan(bucket).all():
+            # 전부 NaN 인 구간은 NaN 점 하나를 남겨 선을 끊는다
+            assert lo in picked and np.isnan(y[picked]).all()
+            continue
+        assert np.nanmin(bucket) in y[picked]
+        assert np.nanmax(bucket) in y[picked]
+
+
+def test_minmax_keeps_global_peak():
+    x, y = make_series()
+    _, ys = downsample(x, y, 200, method="minmax")
+    assert ys.max() == y.max() and ys.min() == y.min()
+
+
+def test_minmax_all_nan():
+    y = np.full(1000, np.nan)
+    idx = minmax_indices(y, 10)
+    assert idx[0] == 0 and idx[-1] == 999 and len(idx) <= 22
+
+
+# =====================================================================
+# lttb
+# =====================================================================
+def test_lttb_picks_one_point_per_bucket():
+    x, y = make_series(n=5000)
+    n_out = 300
+    idx = lttb_indices(x.astype(np.int64).astype(float), y, n_out)
+    assert len(idx) == n_out and idx[0] == 0 and idx[-1] == len(y) - 1
+    edges = 1 + _bucket_edges(len(y) - 2, n_out - 2)
+    inner = idx[1:-1]
+    assert np.all((inner >= edges[:-1]) & (inner < edges[1:]))
+
+
+def test_lttb_with_fewer_valid_points_than_requested():
+    y = np.full(1000, np.nan)
+    y[[10, 500, 900]] = [1.0, 2.0, 3.0]
+    idx = lttb_indices(np.arange(1000.0), y, 100)
+    np.testing.assert_array_equal(idx, [10, 500, 900])
@@ -0,0 +1,112 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from numpy.lib.stride_tricks import sliding_window_view
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import train_offline as T  # noqa: E402
+
+
+EXOG_COLS = T.EXOG_COLS[:2]
+SPIKE = slice(2000, 2010)
+
+
+# =====================================================================
+# 테스트 데이터: 결측 구간 + 상수 구간 + 큰 값 (누적합 상쇄 오차가 나는 곳)
+# =====================================================================
+def make_sensor_frame(n=6000, seed=1):
+    rng = np.random.default_rng(seed)
+    idx = pd.date_range("2024-01-01", periods=n, freq="10min", name="Timestamp")
+    day = 2 * np.pi * np.arange(n) / 144
+
+    y = 3 + np.sin(day) + rng.normal(0, 0.05, n)
+    y[rng.random(n) < 0.03] = np.nan
+    y[700:760] = np.nan
+    y[1200:1400] = 2.5
+    y[SPIKE] = 1e4 + rng.normal(0, 1, SPIKE.stop - SPIKE.start)
+    y[4000:4300] = 5.0
+
+    cols = {T.TARGET_COL: y}
+    for i, col in enumerate(EXOG_COLS):
+        x = 10 + 3 * np.sin(day + i) + rng.normal(0, 0.5, n)
+        x[rng.random(n) < 0.03] = np.nan
+        x[3000:3200] = 7.0
+        cols[col] = x
+    return pd.DataFrame(cols, index=idx)
+
+
+def exact_rolling_std(values, win):
+    """shift(1).rolling(win).std() 를 창마다 두 번 지나는(two-pass) 방식으로 계산한 기준값."""
+    shifted = np.concatenate([[np.nan], values[:-1]])
+    out = np.full(len(values), np.nan)
+    if len(values) >= win:
+        out[win - 1:] = np.std(sliding_window_view(shifted, win), axis=1, ddof=1)
+    return out
+
+
+def std_reference(df, name):
+    """피처 이름(<col>_roll_std_<win>, <col>_diff_roll_std_<win>)에 맞는 기준 std."""
+    base, win = name.rsplit("_roll_std_", 1)
+    y = df[T.TARGET_COL].to_numpy(dtype=float)
+    values = np.diff(y, prepend=np.nan) if base.endswith("_diff") else y
+    return exact_rolling_std(values, int(win))
+
+
+@pytest.fixture(scope="module")
+def features():
+    df = make_sensor_frame()
+    ref, _ = T.make_features_with_diff(df, T.TARGET_COL, exog_cols=EXOG_COLS, dropna=False)
+    X, names = T.build_feature_matrix(df, T.TARGET_COL, exog_cols=EXOG_COLS, dtype=np.float64)
+    return df, ref, X, names
+
+
+# =====================================================================
+# 테스트
+# =====================================================================
+def test_same_columns_and_missing_rows(features):
+    _, ref, X, names = features
+    assert names == list(ref.columns)
+    np.testing.assert_array_equal(np.isnan(X), np.isnan(ref.to_numpy(dtype=float)))
+
+
+def test_non_std_features_match_pandas(features):
+    _, ref, X, names = features
+    cols = [j for j, name in enumerate(names) if "_roll_std_" not in name]
+    np.testing.assert_allclose(X[:, cols], ref.iloc[:, cols].to_numpy(dtype=float), rtol=1e-12, atol=1e-12)
+
+
+def test_rolling_std_is_exact(features):
+    # pandas 도 큰 값이 지나간 뒤에는 상쇄 오차가 남으므로 std 는 창별 두 번 계산과 비교한다
+    df, _, X, names = features
+    for j, name in enumerate(names):
+        if "_roll_std_" in name:
+            np.testing.assert_allclose(X[:, j], std_reference(df, name), rtol=1e-9, atol=1e-12, err_msg=name)
+
+
+def test_rolling_std_matches_pandas_before_spike(features):
+    # 상수 구간에서 pandas 는 0 대신 1e-7 정도의 잔차를 남긴다 (우리 쪽은 정확히 0)
+    _, ref, X, names = features
+    rows = slice(0, SPIKE.start)
+    for j, name in enumerate(names):
+        if "_roll_std_" in name:
+            np.testing.assert_allclose(X[rows, j], ref[name].to_numpy()[rows], rtol=1e-9, atol=2e-7, err_msg=name)
+
+
+def test_constant_runs_give_zero_std(features):
+    _, _, X, names = features
+    j = names.index(f"{T.TARGET_COL}_roll_std_144")
+    # 4000~4299 행이 상수라, shift(1) 뒤 144행 창이 그 안에만 걸치는 행
+    assert np.all(X[4000 + 145:4300, j] == 0.0)
+    j = names.index(f"{T.TARGET_COL}_diff_roll_std_6")
+    assert np.all(X[4000 + 8:4300, j] == 0.0)
+
+
+def test_float32_output_is_rounded_float64(features):
+    df, _, X64, _ = features
+    X32, _ = T.build_feature_matrix(df, T.TARGET_COL, exog_cols=EXOG_COLS)
+    assert X32.dtype == np.float32
+    np.testing.assert_array_equal(X32, X64.astype(np.float32))
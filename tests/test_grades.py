@@ -0,0 +1,65 @@
+import itertools
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from grades import (  # noqa: E402
+    CHL_LEVELS,
+    REC_LEVELS,
+    build_activity_recommendation,
+    build_activity_recommendation_array,
+    classify_chl,
+    classify_chl_array,
+    classify_chl_codes,
+    recommendation_codes,
+)
+
+
+# 경계값 바로 아래/위와 경계 자체, NaN
+CHL_VALUES = [np.nan, -1.0, 0.0, 3.999, 4.0, 4.001, 7.999, 8.0, 8.001, 1e4]
+TEMP_VALUES = [np.nan, 17.999, 18.0, 22.0, 26.0, 26.001]
+TURB_VALUES = [np.nan, 0.0, 49.999, 50.0, 79.999, 80.0, 500.0]
+
+
+# =====================================================================
+# 클로로필 등급
+# =====================================================================
+def test_chl_codes_match_scalar_classifier():
+    codes = classify_chl_codes(CHL_VALUES)
+    assert [CHL_LEVELS[c] for c in codes] == [classify_chl(v) for v in CHL_VALUES]
+
+
+def test_chl_band_edges():
+    np.testing.assert_array_equal(classify_chl_codes([3.999, 4.0, 7.999, 8.0, np.nan]), [0, 1, 1, 2, 3])
+
+
+def test_chl_array_keeps_series_index():
+    s = pd.Series(CHL_VALUES, index=pd.date_range("2024-01-01", periods=len(CHL_VALUES), freq="h"))
+    out = classify_chl_array(s)
+    assert out.index.equals(s.index)
+    assert list(out["label"]) == [classify_chl(v)[0] for v in CHL_VALUES]
+    assert list(out["color"]) == [classify_chl(v)[2] for v in CHL_VALUES]
+
+
+# =====================================================================
+# 활동 추천
+# =====================================================================
+def test_recommendation_codes_match_scalar_rules():
+    combos = list(itertools.product(CHL_VALUES, TEMP_VALUES, TURB_VALUES))
+    chl, temp, turb = (np.array(x) for x in zip(*combos))
+    codes = recommendation_codes(chl, temp, turb)
+    expected = [build_activity_recommendation(c, t, u, classify_chl(c)[0]) for c, t, u in combos]
+    assert [REC_LEVELS[k] for k in codes] == expected
+
+
+def test_recommendation_array_titles():
+    chl = pd.Series([3.0, 3.0, 9.0, 3.0, np.nan])
+    temp = [20.0, 30.0, 20.0, 20.0, 20.0]
+    turb = [10.0, 10.0, 10.0, 80.0, 10.0]
+    out = build_activity_recommendation_array(chl, temp, turb)
+    assert out.index.equals(chl.index)
+    assert list(out["title"]) == [REC_LEVELS[k][0] for k in [0, 1, 2, 2, 3]]
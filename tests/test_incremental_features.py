@@ -0,0 +1,116 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from lightgbm import LGBMRegressor
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import train_offline as T  # noqa: E402
+
+
+FREQ = pd.Timedelta("10min")
+EXOG_COLS = T.EXOG_COLS[:2]
+
+
+# =====================================================================
+# 테스트 데이터: 결측 구간 + 값이 변하지 않는 구간
+# =====================================================================
+def make_sensor_frame(n=600, seed=0):
+    rng = np.random.default_rng(seed)
+    idx = pd.date_range("2024-01-01", periods=n, freq=FREQ, name="Timestamp")
+    day = 2 * np.pi * np.arange(n) / 144
+
+    y = 3 + np.sin(day) + rng.normal(0, 0.1, n)
+    y[rng.random(n) < 0.05] = np.nan     # 드문드문 빠진 값
+    y[200:215] = np.nan                  # 긴 결측 구간
+    y[300:380] = 2.5                     # 상수 구간 (롤링 std 가 0 이 되는 곳)
+    y[420:430] = 1e4                     # 큰 값 뒤의 상쇄 오차
+
+    cols = {T.TARGET_COL: y}
+    for i, col in enumerate(EXOG_COLS):
+        x = 10 + 3 * np.sin(day + i) + rng.normal(0, 0.5, n)
+        x[rng.random(n) < 0.05] = np.nan
+        x[350:400] = 7.0
+        cols[col] = x
+    return pd.DataFrame(cols, index=idx)
+
+
+def rebuild_next_row(df, next_idx):
+    """기존 방식: 빈 행을 붙이고 전체 피처를 다시 만들어 마지막 줄을 꺼낸다."""
+    data = df.copy()
+    base_row = data.iloc[-1].copy()
+    base_row[T.TARGET_COL] = np.nan
+    data.loc[next_idx] = base_row
+    X_tmp, _ = T.make_features_with_diff(
+        data, T.TARGET_COL, exog_cols=EXOG_COLS, lag_list=[2], dropna=False
+    )
+    return X_tmp.loc[next_idx]
+
+
+def rebuild_recursive_forecast(df, model, n_steps, feature_means):
+    """user-001 이전의 recursive_forecast (스텝마다 전체 재계산)."""
+    data = df.copy()
+    preds = []
+    idxs = []
+
+    for _ in range(n_steps):
+        next_idx = data.index[-1] + FREQ
+
+        base_row = data.iloc[-1].copy()
+        base_row[T.TARGET_COL] = np.nan
+        data.loc[next_idx] = base_row
+
+        X_tmp, _ = T.make_features_with_diff(
+            data, T.TARGET_COL, exog_cols=EXOG_COLS, lag_list=[2], dropna=False
+        )
+        x_next = X_tmp.loc[[next_idx]].fillna(feature_means)
+        y_next = model.predict(x_next)[0]
+
+        data.loc[next_idx, T.TARGET_COL] = y_next
+        preds.append(y_next)
+        idxs.append(next_idx)
+
+    return pd.Series(preds, index=idxs)
+
+
+# =====================================================================
+# 테스트
+# =====================================================================
+@pytest.mark.parametrize("cut", [1, 3, 150, 210, 330, 390, 425, 440, 600])
+def test_next_features_match_rebuild(cut):
+    df = make_sensor_frame().iloc[:cut]
+    state = T.IncrementalFeatureState(df, T.TARGET_COL, exog_cols=EXOG_COLS, lag_list=[2])
+    next_idx = df.index[-1] + FREQ
+
+    expected = rebuild_next_row(df, next_idx)
+    assert state.feature_names == list(expected.index)
+    np.testing.assert_array_equal(state.next_features(next_idx), expected.to_numpy(dtype=float))
+
+
+def test_extend_matches_fresh_state():
+    df = make_sensor_frame()
+    state = T.IncrementalFeatureState(df.iloc[:250], T.TARGET_COL, exog_cols=EXOG_COLS, lag_list=[2])
+    state.extend(df.iloc[250:])
+    fresh = T.IncrementalFeatureState(df, T.TARGET_COL, exog_cols=EXOG_COLS, lag_list=[2])
+
+    next_idx = df.index[-1] + FREQ
+    np.testing.assert_array_equal(state.next_features(next_idx), fresh.next_features(next_idx))
+
+
+def test_recursive_forecast_matches_rebuild():
+    df = make_sensor_frame()
+    X, y = T.make_features_with_diff(df, T.TARGET_COL, exog_cols=EXOG_COLS, lag_list=[2], dropna=False)
+    keep = y.notna()
+    model = LGBMRegressor(n_estimators=20, num_leaves=7, min_child_samples=5, verbose=-1)
+    model.fit(X[keep], y[keep])
+    feature_means = X.mean()
+
+    for cut in [330, 600]:
+        hist = df.iloc[:cut]
+        got = T.recursive_forecast(hist, model, T.TARGET_COL, 12, FREQ, feature_means, EXOG_COLS)
+        expected = rebuild_recursive_forecast(hist, model, 12, feature_means)
+        pd.testing.assert_index_equal(got.index, expected.index)
+        np.testing.assert_array_equal(got.to_numpy(), expected.to_numpy())
@@ -0,0 +1,119 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import data_store as D  # noqa: E402
+from ingest import append_readings  # noqa: E402
+
+
+def make_readings(start, periods, seed=0):
+    rng = np.random.default_rng(seed)
+    ts = pd.date_range(start, periods=periods, freq="10min")
+    return pd.DataFrame({
+        "Timestamp": ts.strftime("%Y-%m-%d %H:%M:%S"),
+        "Chlorophyll_Kalman": rng.normal(3, 0.5, periods),
+        "Temperature_Kalman": rng.normal(20, 1, periods),
+    })
+
+
+def store_files(store):
+    return sorted(p.name for p in Path(store).iterdir())
+
+
+@pytest.fixture
+def store(tmp_path):
+    # 1월 마지막 이틀치가 이미 들어 있는 저장소
+    store = tmp_path / "sensor_store"
+    append_readings(make_readings("2024-01-30 00:00", 288), store)
+    return store
+
+
+# =====================================================================
+# 정상 추가 + manifest
+# =====================================================================
+def test_first_append_creates_partition_and_manifest(store):
+    manifest = D.read_manifest(store)
+    assert manifest["columns"] == ["Timestamp", "Chlorophyll_Kalman", "Temperature_Kalman"]
+    assert manifest["partitions"] == {
+        "2024-01": {"rows": 288, "start": "2024-01-30T00:00:00", "end": "2024-01-31T23:50:00"},
+    }
+    assert store_files(store) == ["2024-01.parquet", "manifest.json"]
+
+
+def test_append_across_month_boundary(store):
+    # 2월 1일 00:00 부터: 1월 파티션은 그대로, 2월 파티션이 새로 생긴다
+    n = append_readings(make_readings("2024-02-01 00:00", 300, seed=1), store)
+    assert n == 300
+    parts = D.read_manifest(store)["partitions"]
+    assert parts["2024-01"]["rows"] == 288
+    assert parts["2024-02"] == {"rows": 300, "start": "2024-02-01T00:00:00", "end": "2024-02-03T01:50:00"}
+
+    # 같은 달에 이어 붙이면 그 달 파티션의 행 수와 끝 시각만 바뀐다
+    append_readings(make_readings("2024-02-03 02:00", 10, seed=2), store)
+    parts = D.read_manifest(store)["partitions"]
+    assert parts["2024-02"] == {"rows": 310, "start": "2024-02-01T00:00:00", "end": "2024-02-03T03:30:00"}
+
+    df = D.load_partitions(partition_dir=store)
+    assert len(df) == 288 + 310
+    assert df["Timestamp"].is_monotonic_increasing and df["Timestamp"].is_unique
+
+
+def test_append_spanning_two_months_in_one_call(tmp_path):
+    store = tmp_path / "sensor_store"
+    append_readings(make_readings("2024-03-31 20:00", 48), store)
+    parts = D.read_manifest(store)["partitions"]
+    assert parts["2024-03"]["rows"] == 24 and parts["2024-03"]["end"] == "2024-03-31T23:50:00"
+    assert parts["2024-04"]["rows"] == 24 and parts["2024-04"]["start"] == "2024-04-01T00:00:00"
+
+
+def test_empty_input_writes_nothing(store):
+    before = D.manifest_path(store).read_text(encoding="utf-8")
+    assert append_readings(make_readings("2024-02-01", 0), store) == 0
+    assert D.manifest_path(store).read_text(encoding="utf-8") == before
+
+
+# =====================================================================
+# 거부되는 입력 (아무것도 쓰지 않아야 한다)
+# =====================================================================
+def assert_rejected(store, new, match):
+    before = {p.name: p.read_bytes() for p in Path(store).iterdir()}
+    with pytest.raises(ValueError, match=match):
+        append_readings(new, store)
+    assert {p.name: p.read_bytes() for p in Path(store).iterdir()} == before
+
+
+def test_rejects_duplicate_timestamps(store):
+    new = make_readings("2024-02-01", 5)
+    new.loc[3, "Timestamp"] = new.loc[2, "Timestamp"]
+    assert_rejected(store, new, "중복된 Timestamp")
+
+
+def test_rejects_non_monotonic_input(store):
+    new = make_readings("2024-02-01", 5).iloc[[0, 1, 3, 2, 4]].reset_index(drop=True)
+    assert_rejected(store, new, "증가 순서가 아닙니다")
+
+
+def test_rejects_overlap_with_stored_rows(store):
+    assert_rejected(store, make_readings("2024-01-31 23:50", 3), "이미 저장된 구간과 겹칩니다")
+
+
+def test_rejects_missing_timestamps(store):
+    new = make_readings("2024-02-01", 3)
+    new.loc[1, "Timestamp"] = None
+    assert_rejected(store, new, "비어 있는 Timestamp")
+
+
+def test_rejects_different_columns(store):
+    new = make_readings("2024-02-01", 3).drop(columns="Temperature_Kalman")
+    assert_rejected(store, new, "컬럼 구성이 저장소와 다릅니다")
+
+
+def test_reordered_columns_are_accepted(store):
+    new = make_readings("2024-02-01", 3)[["Temperature_Kalman", "Timestamp", "Chlorophyll_Kalman"]]
+    assert append_readings(new, store) == 3
+    assert list(D.load_partitions(partition_dir=store).columns) == D.read_manifest(store)["columns"]
@@ -0,0 +1,124 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from grades import classify_chl  # noqa: E402
+from outlook import render_outlook_rows  # noqa: E402
+
+
+def old_loop_rows(daily, today_date):
+    """벡터화 이전 앱의 iterrows 루프 (행 HTML 부분) 그대로. date 컬럼은 datetime.date."""
+    global_min = daily["min"].min()
+    global_max = daily["max"].max()
+    denom = (
+        global_max - global_min
+        if pd.notna(global_min) and pd.notna(global_max) and global_max > global_min
+        else None
+    )
+
+    weekdays_kr = ["월", "화", "수", "목", "금", "토", "일"]
+
+    week_rows_html = ""
+    for _, row in daily.iterrows():
+        d = row["date"]
+
+        if today_date is not None and d == today_date:
+            day_label = f"오늘 ({d.strftime('%m/%d')})"
+        else:
+            wd = d.weekday()
+            day_label = f"{weekdays_kr[wd]} ({d.strftime('%m/%d')})"
+
+        d_min = row["min"]
+        d_max = row["max"]
+        d_mean = row["mean"]
+
+        mean_txt = "–" if pd.isna(d_mean) else f"{d_mean:.1f}"
+        label, emoji, color, _ = classify_chl(d_mean)
+
+        if denom is None or denom <= 0:
+            left_pct = 0
+            width_pct = 100
+        else:
+            left_pct = (float(d_min) - float(global_min)) / float(denom) * 100
+            width_pct = (float(d_max) - float(d_min)) / float(denom) * 100
+            left_pct = max(0, min(left_pct, 100))
+            width_pct = max(5, min(width_pct, 100 - left_pct))
+
+        if denom is None or denom <= 0 or pd.isna(d_mean):
+            mean_marker_left = 50.0
+        else:
+            mean_marker_left = (float(d_mean) - float(global_min)) / float(denom) * 100
+            mean_marker_left = max(0, min(mean_marker_left, 100))
+
+        week_rows_html += f"""
+  <div class="week-row">
+    <div class="week-day">{day_label}</div>
+    <div class="week-status">
+      <span class="week-emoji">{emoji}</span>
+      <span class="week-status-text">{label}</span>
+    </div>
+    <div class="week-mean">{mean_txt}</div>
+    <div class="week-min">{d_min:.1f}</div>
+    <div class="week-range-track">
+      <div class="week-range-bar"
+           style="left:{left_pct:.1f}%; width:{width_pct:.1f}%; background-color:{color};"></div>
+      <div class="week-mean-marker"
+           style="left:{mean_marker_left:.1f}%;"
+           title="평균 {mean_txt} µg/L"></div>
+    </div>
+    <div class="week-max">{d_max:.1f}</div>
+  </div>
+"""
+    return week_rows_html
+
+
+def make_daily(n_days, seed=0):
+    """앱의 get_daily_outlook 과 같은 모양 (date 는 그날 0시 datetime64). 평균이 등급 경계를 지나간다."""
+    rng = np.random.default_rng(seed)
+    mean = rng.uniform(1, 11, n_days)
+    mean[:4] = [3.99, 4.0, 7.99, 8.0]
+    spread = rng.uniform(0.1, 3, n_days)
+    return pd.DataFrame({
+        "date": pd.date_range("2024-07-29", periods=n_days, freq="D"),
+        "min": mean - spread,
+        "max": mean + rng.uniform(0.1, 3, n_days),
+        "mean": mean,
+    })
+
+
+def assert_same_html(daily, today_date):
+    old = daily.assign(date=daily["date"].dt.date)
+    assert render_outlook_rows(daily, today_date) == old_loop_rows(old, today_date)
+
+
+# =====================================================================
+# 옛 루프와 같은 HTML
+# =====================================================================
+@pytest.mark.parametrize("n_days", [7, 30, 90])
+def test_matches_old_loop(n_days):
+    daily = make_daily(n_days)
+    assert_same_html(daily, daily["date"][2].date())
+
+
+@pytest.mark.parametrize("n_days", [7, 30, 90])
+def test_matches_old_loop_with_nan_days(n_days):
+    daily = make_daily(n_days, seed=1)
+    daily.loc[1::5, "mean"] = np.nan                        # 평균만 빈 날
+    daily.loc[3, ["min", "max", "mean"]] = np.nan           # 예측값이 전부 빈 날
+    assert_same_html(daily, None)
+
+
+def test_flat_range_and_today_outside_period():
+    daily = make_daily(7).assign(min=5.0, max=5.0)
+    assert_same_html(daily, pd.Timestamp("2030-01-01").date())
+
+
+def test_all_nan_days():
+    daily = make_daily(7)
+    daily[["min", "max", "mean"]] = np.nan
+    assert_same_html(daily, daily["date"][0].date())
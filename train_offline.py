@@ -1,7 +1,27 @@
 import pandas as pd
 import numpy as np
 from pathlib import Path
+from collections import deque
+from numpy.lib.stride_tricks import sliding_window_view
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import argparse
+import contextlib
+import copy
+import hashlib
+import json
+import math
+import os
 import random
+import shutil
+import socket
+import sys
+import threading
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
 
 from lightgbm import LGBMRegressor
 import lightgbm as lgb
@@ -10,6 +30,19 @@ from sklearn.metrics import mean_absolute_error, mean_squared_error
 
 import optuna
 from optuna.logging import set_verbosity, ERROR as OPTUNA_ERROR
+from optuna.trial import TrialState
+
+from data_store import (
+    get_site,
+    iter_sensor_chunks,
+    load_sensor_data,
+    memory_report,
+    read_sites,
+    sensor_data_bounds,
+    sensor_data_source,
+    site_dir,
+    site_paths,
+)
 
 # Optuna 로그 최소화
 set_verbosity(OPTUNA_ERROR)
@@ -17,13 +50,22 @@ set_verbosity(OPTUNA_ERROR)
 # =====================================================================
 # 1. 설정값
 # =====================================================================
-DATA_PATH = Path(__file__).parent / "data" / "df_final.csv"
+# 기본 지점의 산출물 경로. 다른 지점은 같은 이름으로 지점 폴더 아래에 둔다 (site_output_paths)
 OUT_PATH  = Path(__file__).parent / "data" / "future_week_forecast.csv"
+REPORT_PATH = OUT_PATH.with_name("train_run_report.json")   # 단계별 시간/메모리 (마지막 실행)
+FEATURE_CACHE_DIR = Path(__file__).parent / "data" / "feature_cache"
+OPTUNA_STORAGE    = Path(__file__).parent / "data" / "optuna_journal.log"
+MODEL_DIR         = Path(__file__).parent / "data" / "models"   # 버전별 모델 폴더 + LATEST
 
 TARGET_COL  = "Chlorophyll_Kalman"   # 모델 타깃
 RAW_COL     = "Chlorophyll"          # 원본 클로로필 컬럼
 TEST_DAYS   = 30                     # 최근 30일을 테스트로 사용
 N_TRIALS    = 30                     # Optuna 탐색 횟수 (너무 길면 20~30 정도)
+N_WORKERS   = 1                      # Optuna 병렬 워커 수 (프로세스)
+PRUNER      = "median"               # 폴드 단위 가지치기: median / hyperband / none
+STALE_GRACE_SECONDS = 60             # 소유 프로세스를 적기 전의 RUNNING trial 은 이 시간 동안 살아 있다고 본다
+STRATEGY    = "recursive"            # 7일 예측 방식: recursive / direct
+FORECAST_DAYS = 7                    # 예측 기간(일). 대시보드 카드는 7/30/90일을 지원
 SEED        = 42
 
 random.seed(SEED)
@@ -35,6 +77,29 @@ EXOG_COLS = [
     "W_Shortwave Radiation", "W_Temperature"
 ]
 
+# 차분/외생변수 피처 구성
+DIFF_LAGS         = [1, 2]
+DIFF_ROLL_WINDOWS = [6, 72]
+EXOG_LAGS         = [6, 72, 144]      # 1시간, 12시간, 1일
+EXOG_ROLL_WINDOWS = [72, 144]         # 12시간, 1일
+
+# 직접(다중 horizon) 예측 학습 샘플 구성
+DIRECT_ORIGIN_STRIDE  = 36            # 6시간마다 예측 시작점 하나
+DIRECT_HORIZON_STRIDE = 6             # 시작점마다 1시간 간격 horizon (offset 을 돌려 전 스텝을 덮음)
+DIRECT_EXTRA_COLS     = ["horizon", "target_hour", "target_dayofweek"]
+
+# 피처 한 줄을 계산하는 데 필요한 최소 과거 길이 (가장 긴 창/lag + 차분 1 + 여유 1)
+HISTORY_SPAN = max([144] + DIFF_ROLL_WINDOWS + EXOG_LAGS + EXOG_ROLL_WINDOWS) + 2
+
+# 피처 생성 로직이 바뀌면 올려서 기존 캐시를 무효화
+FEATURE_VERSION = 2
+
+ROLL_BLOCK_ROWS = 8192   # 롤링 누적합을 새로 시작하는 행 수 (오차가 계열 길이만큼 쌓이지 않도록)
+ROLL_STD_RTOL   = 1e-10  # 롤링 std 의 누적합 상쇄 오차 허용치 (넘는 창만 창마다 직접 계산)
+
+# 모델 아티팩트(meta.json) 형식이 바뀌면 올린다
+ARTIFACT_VERSION = 1
+
 
 def mean_abs_percentage_error(y_true, y_pred, eps=1e-6):
     y_true = np.asarray(y_true, dtype=float)
@@ -76,11 +141,11 @@ def make_features_with_diff(
         )
 
     # Diff lag
-    for lag in [1, 2]:
+    for lag in DIFF_LAGS:
         feats[f"{diff_col}_lag{lag}"] = data[diff_col].shift(lag)
 
     # Diff rolling
-    for win in [6, 72]:
+    for win in DIFF_ROLL_WINDOWS:
         feats[f"{diff_col}_roll_mean_{win}"] = (
             data[diff_col].shift(1).rolling(win).mean()
         )
@@ -89,17 +154,14 @@ def make_features_with_diff(
         )
 
     # 외생변수 Lag + Rolling
-    exog_lags = [6, 72, 144]          # 1시간, 12시간, 1일
-    exog_roll_windows = [72, 144]     # 12시간, 1일
-
     for col in exog_cols:
         if col not in data.columns:
             continue
 
-        for lag in exog_lags:
+        for lag in EXOG_LAGS:
             feats[f"{col}_lag{lag}"] = data[col].shift(lag)
 
-        for win in exog_roll_windows:
+        for win in EXOG_ROLL_WINDOWS:
             feats[f"{col}_roll_mean_{win}"] = (
                 data[col].shift(1).rolling(win).mean()
             )
@@ -117,70 +179,730 @@ def make_features_with_diff(
         return feats, data[target_col]
 
 
+def feature_names(target_col, exog_cols, lag_list=[2], roll_windows=[6, 72, 144]):
+    """make_features_with_diff 와 같은 순서의 피처 컬럼 이름 목록."""
+    diff_col = f"{target_col}_diff"
+    names = [f"{target_col}_lag{lag}" for lag in lag_list]
+    for win in roll_windows:
+        names += [f"{target_col}_roll_mean_{win}", f"{target_col}_roll_std_{win}"]
+    names += [f"{diff_col}_lag{lag}" for lag in DIFF_LAGS]
+    for win in DIFF_ROLL_WINDOWS:
+        names += [f"{diff_col}_roll_mean_{win}", f"{diff_col}_roll_std_{win}"]
+    for col in exog_cols:
+        names += [f"{col}_lag{lag}" for lag in EXOG_LAGS]
+        names += [f"{col}_roll_mean_{win}" for win in EXOG_ROLL_WINDOWS]
+    names += ["hour", "dayofweek"]
+    return names
+
+
+def _shift_into(out, values, lag):
+    out[:lag] = np.nan
+    if len(values) > lag:
+        out[lag:] = values[:len(values) - lag]
+
+
+def _rolling_into(X, j, values, windows, want_std):
+    """
+    shift(1).rolling(win) 의 mean(/std) 를 X[:, j:] 에 차례로 기록하고 다음 컬럼 위치를 돌려준다.
+    창 안에 결측이 하나라도 있으면 NaN (min_periods=win 과 동일).
+
+    정밀도: 누적합은 ROLL_BLOCK_ROWS 행 묶음마다 묶음 평균을 빼고 새로 시작하므로 오차가 계열 길이와 무관하다.
+    std 는 누적 제곱합으로 구하되, 상쇄 오차 한계가 ROLL_STD_RTOL 을 넘는 창(주변보다 잔잔한 구간)만
+    창 평균을 뺀 편차로 다시 계산한다(두 번 훑기). 값이 모두 같은 창은 pandas 처럼 정확히 0.
+    """
+    n = len(values)
+    valid = np.isfinite(values)
+    cn = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(valid, out=cn[1:])
+    if want_std:
+        # 이웃한 두 값이 다른 횟수의 누적합 → 창 안에서 값이 한 번도 안 바뀌면 상수 구간
+        cd = np.zeros(n, dtype=np.int64)
+        np.cumsum(values[1:] != values[:-1], out=cd[1:])
+
+    for win in windows:
+        X[:min(win, n), j:j + (2 if want_std else 1)] = np.nan
+        if n <= win:
+            j += 2 if want_std else 1
+            continue
+        # k 번째 창 = values[k:k + win] → 행 k + win 의 피처 (shift(1)). 묶음 [lo, hi) 는 창 번호 범위
+        view = sliding_window_view(values[:n - 1], win)
+        for lo in range(0, n - win, ROLL_BLOCK_ROWS):
+            hi = min(lo + ROLL_BLOCK_ROWS, n - win)
+            rows = slice(win + lo, win + hi)
+            seg_valid = valid[lo:hi + win - 1]
+            seg = values[lo:hi + win - 1]
+            center = seg[seg_valid].mean() if seg_valid.any() else 0.0
+            v = np.where(seg_valid, seg - center, 0.0)
+            c1 = np.zeros(len(v) + 1)
+            np.cumsum(v, out=c1[1:])
+            s1 = c1[win:win + hi - lo] - c1[:hi - lo]
+            partial = (cn[lo + win:hi + win] - cn[lo:hi]) != win
+            mean = s1 / win + center
+            mean[partial] = np.nan
+            X[rows, j] = mean
+            if not want_std:
+                continue
+
+            c2 = np.zeros(len(v) + 1)
+            np.cumsum(v * v, out=c2[1:])
+            ss = c2[win:win + hi - lo] - c2[:hi - lo] - s1 * s1 / win
+            # 누적합 두 개의 뺄셈에서 생기는 오차 한계. 창 편차 제곱합보다 충분히 작지 않으면 직접 계산
+            bound = 4 * np.finfo(np.float64).eps * (c2[-1] + s1 * s1 / win)
+            redo = np.flatnonzero((bound > ROLL_STD_RTOL * ss) & ~partial)
+            if len(redo):
+                w = view[lo + redo]
+                dev = w - w.mean(axis=1, keepdims=True)
+                ss[redo] = np.einsum("ij,ij->i", dev, dev)
+            std = np.sqrt(np.maximum(ss, 0.0) / (win - 1))
+            std[(cd[lo + win - 1:hi + win - 1] - cd[lo:hi] == 0) & ~partial] = 0.0
+            std[partial] = np.nan
+            X[rows, j + 1] = std
+        j += 2 if want_std else 1
+    return j
+
+
+def build_feature_matrix(
+    df: pd.DataFrame,
+    target_col: str,
+    exog_cols=None,
+    lag_list=[2],
+    roll_windows=[6, 72, 144],
+    dtype=np.float32,
+):
+    """
+    make_features_with_diff 와 같은 피처를 NumPy 배열 위에서 한 번에 계산해
+    미리 할당한 (n, p) 행렬과 컬럼 이름 목록으로 돌려준다 (결측 행 포함).
+    """
+    if exog_cols is None:
+        exog_cols = []
+    exog_cols = [c for c in exog_cols if c in df.columns]
+
+    names = feature_names(target_col, exog_cols, lag_list, roll_windows)
+    n = len(df)
+    # 컬럼 단위로 채우므로 열 우선(F) 배열로 잡아 각 열을 연속 메모리로 쓴다
+    X = np.empty((n, len(names)), dtype=dtype, order="F")
+    j = 0
+
+    y = df[target_col].to_numpy(dtype=np.float64)
+    d = np.empty(n)
+    d[:1] = np.nan
+    np.subtract(y[1:], y[:-1], out=d[1:])
+
+    # 타깃 Lag + Rolling
+    for lag in lag_list:
+        _shift_into(X[:, j], y, lag)
+        j += 1
+    j = _rolling_into(X, j, y, roll_windows, want_std=True)
+
+    # Diff Lag + Rolling
+    for lag in DIFF_LAGS:
+        _shift_into(X[:, j], d, lag)
+        j += 1
+    j = _rolling_into(X, j, d, DIFF_ROLL_WINDOWS, want_std=True)
+
+    # 외생변수 Lag + Rolling
+    for col in exog_cols:
+        x = df[col].to_numpy(dtype=np.float64)
+        for lag in EXOG_LAGS:
+            _shift_into(X[:, j], x, lag)
+            j += 1
+        j = _rolling_into(X, j, x, EXOG_ROLL_WINDOWS, want_std=False)
+
+    # 시간 피처
+    X[:, j] = df.index.hour
+    X[:, j + 1] = df.index.dayofweek
+
+    return X, names
+
+
+# =====================================================================
+# 2. 피처 행렬 캐시
+# =====================================================================
+def _file_digest(path, chunk_size=1 << 20):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def feature_cache_key(data_path, target_col, exog_cols, lag_list=[2], roll_windows=[6, 72, 144], site=None):
+    """
+    원본 파일 내용 + 피처 설정 (+ 지점 id) 으로 만든 캐시 키.
+    파티션 저장소는 manifest 내용이 키가 되므로, 기간이 같은 두 지점이 섞이지 않게 지점 id 도 넣는다.
+    """
+    config = {
+        "version": FEATURE_VERSION,
+        "site": site,
+        "source": _file_digest(data_path),
+        "target_col": target_col,
+        "exog_cols": list(exog_cols),
+        "lag_list": list(lag_list),
+        "roll_windows": list(roll_windows),
+        "diff_lags": DIFF_LAGS,
+        "diff_roll_windows": DIFF_ROLL_WINDOWS,
+        "exog_lags": EXOG_LAGS,
+        "exog_roll_windows": EXOG_ROLL_WINDOWS,
+    }
+    blob = json.dumps(config, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(blob).hexdigest()[:16]
+
+
+def load_cached_features(key, cache_dir=FEATURE_CACHE_DIR):
+    """캐시가 있으면 (X_all, y_all) 을 메모리 맵으로 읽고, 없으면 None."""
+    entry = Path(cache_dir) / key
+    schema_path = entry / "schema.json"
+    if not schema_path.exists():
+        return None
+
+    schema = json.loads(schema_path.read_text(encoding="utf-8"))
+    X = np.load(entry / "X.npy", mmap_mode="r")
+    y = np.load(entry / "y.npy", mmap_mode="r")
+    index = pd.DatetimeIndex(np.load(entry / "index.npy"), name=schema["index_name"])
+
+    X_all = pd.DataFrame(X, index=index, columns=schema["columns"], copy=False)
+    y_all = pd.Series(y, index=index, name=schema["target_col"], copy=False)
+    return X_all, y_all
+
+
+def save_cached_features(key, X_all, y_all, cache_dir=FEATURE_CACHE_DIR):
+    entry = Path(cache_dir) / key
+    tmp = Path(cache_dir) / f".{key}.tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+
+    # 열 우선으로 저장해야 DataFrame 으로 감쌀 때 복사가 생기지 않는다
+    np.save(tmp / "X.npy", np.asfortranarray(X_all.to_numpy()))
+    np.save(tmp / "y.npy", y_all.to_numpy())
+    np.save(tmp / "index.npy", X_all.index.to_numpy(dtype="datetime64[ns]"))
+    schema = {
+        "columns": list(X_all.columns),
+        "index_name": X_all.index.name,
+        "target_col": y_all.name,
+        "shape": list(X_all.shape),
+        "dtype": str(X_all.dtypes.iloc[0]),
+    }
+    (tmp / "schema.json").write_text(json.dumps(schema, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    # 완성된 디렉터리만 캐시로 보이도록 마지막에 이름을 바꾼다
+    shutil.rmtree(entry, ignore_errors=True)
+    tmp.rename(entry)
+
+
+def get_feature_matrix(df, key, target_col, exog_cols, cache_dir=FEATURE_CACHE_DIR):
+    """캐시 키가 같으면 저장된 피처 행렬을, 아니면 새로 만들어 저장 후 돌려준다."""
+    cached = load_cached_features(key, cache_dir)
+    if cached is not None:
+        print("피처 캐시 사용:", key)
+        return cached
+
+    X_mat, names = build_feature_matrix(df, target_col, exog_cols=exog_cols)
+    valid = ~np.isnan(X_mat).any(axis=1)
+    X_all = pd.DataFrame(X_mat[valid], index=df.index[valid], columns=names)
+    y_all = df.loc[valid, target_col]
+
+    save_cached_features(key, X_all, y_all, cache_dir)
+    print("피처 캐시 저장:", key)
+    return X_all, y_all
+
+
+# ---------------------------------------------------------------------
+# 디스크 피처 행렬 (메모리에 전체 피처 프레임을 만들지 않는 학습 경로)
+# ---------------------------------------------------------------------
+class OnDiskFeatures:
+    """
+    write_features_out_of_core 가 쓴 행 우선 float32 피처 행렬(X.f32) / 타깃(y.f32) / 시각(index.npy).
+    X, y 는 메모리 맵이라 읽는 부분만 올라온다. [start, stop) 행만 보는 가벼운 뷰를 만들 수 있고,
+    프로세스로 넘길 때는 경로와 범위만 직렬화해 받는 쪽에서 다시 연다.
+    """
+
+    def __init__(self, path, start=0, stop=None):
+        self.path = Path(path)
+        self.schema = json.loads((self.path / "schema.json").read_text(encoding="utf-8"))
+        self.columns = self.schema["columns"]
+        n, p = self.schema["shape"]
+        self.start, self.stop = start, n if stop is None else stop
+
+        X = np.memmap(self.path / "X.f32", dtype=np.float32, mode="r", shape=(n, p)) if n else np.empty((0, p), np.float32)
+        y = np.memmap(self.path / "y.f32", dtype=np.float32, mode="r", shape=(n,)) if n else np.empty(0, np.float32)
+        self.X = X[self.start:self.stop]
+        self.y = y[self.start:self.stop]
+        self.index = pd.DatetimeIndex(np.load(self.path / "index.npy")[self.start:self.stop], name="Timestamp")
+
+    def __len__(self):
+        return self.stop - self.start
+
+    @property
+    def shape(self):
+        return (len(self), len(self.columns))
+
+    def __getstate__(self):
+        return {"path": self.path, "start": self.start, "stop": self.stop}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def rows(self, start, stop):
+        return OnDiskFeatures(self.path, self.start + start, self.start + stop)
+
+    def column_means(self, batch_rows=100_000):
+        """컬럼 평균 (feature_means). batch_rows 행씩 float64 로 더한다."""
+        total = np.zeros(len(self.columns))
+        for lo in range(0, len(self), batch_rows):
+            total += self.X[lo:lo + batch_rows].sum(axis=0, dtype=np.float64)
+        return pd.Series(total / max(len(self), 1), index=self.columns)
+
+
+def _train_data(X, y, sl):
+    """
+    X[sl] 학습 입력과 라벨. OnDiskFeatures 면 메모리 맵 행렬을 그대로 넘긴다.
+    행 우선 float32 연속 구간이라 LightGBM 이 복사 없이 포인터로 읽는다
+    (lgb.Sequence 는 float64 로 바꾼 표본을 파이썬 쪽에 따로 만들어 오히려 메모리를 더 쓴다).
+    """
+    if isinstance(X, OnDiskFeatures):
+        # DataFrame 입력일 때 LightGBM 이 하는 것처럼 공백을 밑줄로 바꿔 둔다 (경고 없이 같은 이름)
+        names = [c.replace(" ", "_") for c in X.columns]
+        return X.X[sl], np.asarray(X.y[sl]), names
+    return X.iloc[sl], np.asarray(y)[sl], "auto"
+
+
+def write_features_out_of_core(chunks, out_dir, target_col, exog_cols):
+    """
+    시간 순 원본 조각(chunks)마다 피처를 계산해 결측 없는 행만 out_dir 에 이어 쓴다.
+    앞 조각의 마지막 HISTORY_SPAN 행을 겹쳐 붙여 계산하므로 전체 테이블로 만든 피처와 같다.
+    메모리에는 조각 하나(+ 겹침)의 피처만 올라온다. 첫 조각에서 추정한 간격을 schema 의 freq 로 남긴다.
+    """
+    out_dir = Path(out_dir)
+    tmp = out_dir.with_name(f".{out_dir.name}.tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+
+    carry = None          # 앞 조각 꼬리 (겹침 구간)
+    freq_td = None
+    names = None
+    n_rows = 0
+    with open(tmp / "X.f32", "wb") as fx, open(tmp / "y.f32", "wb") as fy, open(tmp / "index.i8", "wb") as fi:
+        for chunk in chunks:
+            chunk = chunk.set_index("Timestamp") if "Timestamp" in chunk.columns else chunk
+            if chunk.empty:
+                continue
+            if carry is not None and chunk.index[0] <= carry.index[-1]:
+                raise ValueError(
+                    f"원본 조각이 시간 순서가 아닙니다: {carry.index[-1]} 다음에 {chunk.index[0]} "
+                    "(CSV 는 정렬한 뒤 Parquet 저장소로 변환하세요)"
+                )
+            if freq_td is None:
+                freq_td = chunk.index.to_series().diff().dropna().mode()[0]
+
+            frame = chunk if carry is None else pd.concat([carry, chunk])
+            n_new = len(chunk)
+            X_mat, names = build_feature_matrix(frame, target_col, exog_cols=exog_cols)
+            # 겹침 구간 행은 앞 조각에서 이미 썼다
+            X_new = X_mat[-n_new:]
+            valid = ~np.isnan(X_new).any(axis=1)
+
+            np.ascontiguousarray(X_new[valid], dtype=np.float32).tofile(fx)
+            chunk[target_col].to_numpy(dtype=np.float32)[valid].tofile(fy)
+            chunk.index[valid].to_numpy(dtype="datetime64[ns]").view(np.int64).tofile(fi)
+            n_rows += int(valid.sum())
+
+            carry = frame.iloc[-HISTORY_SPAN:]
+
+    if names is None:
+        raise ValueError("피처를 만들 원본 데이터가 없습니다.")
+
+    np.save(tmp / "index.npy", np.fromfile(tmp / "index.i8", dtype=np.int64).view("datetime64[ns]"))
+    (tmp / "index.i8").unlink()
+    schema = {
+        "columns": names,
+        "target_col": target_col,
+        "shape": [n_rows, len(names)],
+        "dtype": "float32",
+        "order": "C",
+        "freq": freq_td.isoformat(),
+    }
+    (tmp / "schema.json").write_text(json.dumps(schema, ensure_ascii=False, indent=2), encoding="utf-8")
+    shutil.rmtree(out_dir, ignore_errors=True)
+    tmp.rename(out_dir)
+    return OnDiskFeatures(out_dir)
+
+
+# =====================================================================
+# 3. 재귀 예측용 증분 피처 상태
+# =====================================================================
+# pandas rolling(cython) 커널과 같은 순서·같은 보정항으로 누적해야
+# make_features_with_diff 결과와 비트 단위까지 일치한다.
+_INV_COND_TOL = np.finfo(np.float64).eps * 1e3
+
+
+def _is_missing(val):
+    # rolling 은 inf 도 NaN 으로 취급한다
+    return val != val or math.isinf(val)
+
+
+class _RollingMean:
+    """shift(1).rolling(win).mean() 의 마지막 값을 O(1)로 갱신 (Kahan 합)."""
+
+    def __init__(self, win):
+        self.win = win
+        self.buf = deque()
+        self.nobs = 0
+        self.neg_ct = 0
+        self.sum_x = 0.0
+        self.comp_add = 0.0
+        self.comp_remove = 0.0
+        self.n_same = 0
+        self.prev_value = np.nan
+
+    def push(self, val):
+        if len(self.buf) == self.win:
+            old = self.buf.popleft()
+            if not _is_missing(old):
+                self.nobs -= 1
+                y = -old - self.comp_remove
+                t = self.sum_x + y
+                self.comp_remove = t - self.sum_x - y
+                self.sum_x = t
+                if math.copysign(1.0, old) < 0:
+                    self.neg_ct -= 1
+
+        self.buf.append(val)
+        if not _is_missing(val):
+            self.nobs += 1
+            y = val - self.comp_add
+            t = self.sum_x + y
+            self.comp_add = t - self.sum_x - y
+            self.sum_x = t
+            if math.copysign(1.0, val) < 0:
+                self.neg_ct += 1
+            self.n_same = self.n_same + 1 if val == self.prev_value else 1
+            self.prev_value = val
+
+    def value(self):
+        if self.nobs < self.win:
+            return np.nan
+        result = self.sum_x / self.nobs
+        if self.n_same >= self.nobs:
+            return self.prev_value
+        if self.neg_ct == 0 and result < 0:
+            return 0.0
+        if self.neg_ct == self.nobs and result > 0:
+            return 0.0
+        return result
+
+
+class _RollingStd:
+    """shift(1).rolling(win).std() 의 마지막 값을 O(1)로 갱신 (Welford 제곱합)."""
+
+    def __init__(self, win):
+        self.win = win
+        self.buf = deque()
+        self._reset()
+
+    def _reset(self):
+        self.nobs = 0.0
+        self.mean_x = 0.0
+        self.ssqdm_x = 0.0
+        self.comp_add = 0.0
+        self.comp_remove = 0.0
+        self.unstable = False
+
+    def _add(self, val):
+        if _is_missing(val):
+            return
+        prev_m2 = self.ssqdm_x
+        self.nobs += 1
+        prev_mean = self.mean_x - self.comp_add
+        y = val - self.comp_add
+        t = y - self.mean_x
+        self.comp_add = t + self.mean_x - y
+        self.mean_x = self.mean_x + t / self.nobs
+        self.ssqdm_x = self.ssqdm_x + (val - prev_mean) * (val - self.mean_x)
+        if prev_m2 * _INV_COND_TOL > self.ssqdm_x:
+            self.unstable = True
+
+    def _remove(self, val):
+        if _is_missing(val):
+            return
+        prev_m2 = self.ssqdm_x
+        self.nobs -= 1
+        if self.nobs:
+            prev_mean = self.mean_x - self.comp_remove
+            y = val - self.comp_remove
+            t = y - self.mean_x
+            self.comp_remove = t + self.mean_x - y
+            self.mean_x = self.mean_x - t / self.nobs
+            self.ssqdm_x = self.ssqdm_x - (val - prev_mean) * (val - self.mean_x)
+            if prev_m2 * _INV_COND_TOL > self.ssqdm_x:
+                self.unstable = True
+        else:
+            self.mean_x = 0.0
+            self.ssqdm_x = 0.0
+            self.unstable = False
+
+    def push(self, val):
+        if len(self.buf) == self.win:
+            self._remove(self.buf.popleft())
+        self.buf.append(val)
+        self._add(val)
+
+        # 상쇄 오차가 커지면 pandas 와 같이 현재 창 전체로 다시 계산
+        if self.unstable:
+            self._reset()
+            for v in self.buf:
+                self._add(v)
+            self.unstable = False
+
+    def value(self):
+        if self.nobs < self.win or self.nobs <= 1:
+            return np.nan
+        var = self.ssqdm_x / (self.nobs - 1.0)
+        return math.sqrt(var) if var >= 0 else 0.0
+
+
+class IncrementalFeatureState:
+    """
+    make_features_with_diff(dropna=False) 의 '다음 시점' 피처 한 줄만
+    링 버퍼와 누적 합으로 계산하는 상태 객체.
+    """
+
+    def __init__(self, df, target_col, exog_cols=None, lag_list=[2], roll_windows=[6, 72, 144]):
+        if exog_cols is None:
+            exog_cols = []
+
+        self.target_col = target_col
+        self.lag_list = list(lag_list)
+        self.roll_windows = list(roll_windows)
+        self.exog_cols = [c for c in exog_cols if c in df.columns]
+        self.last_idx = df.index[-1]
+        self.feature_names = feature_names(
+            target_col, self.exog_cols, self.lag_list, self.roll_windows
+        )
+
+        # 링 버퍼 (lag 용) + 롤링 커널
+        self.y_hist = deque(maxlen=max(self.lag_list + [1]))
+        self.d_hist = deque(maxlen=max(DIFF_LAGS))
+        self.y_rolls = [(_RollingMean(w), _RollingStd(w)) for w in self.roll_windows]
+        self.d_rolls = [(_RollingMean(w), _RollingStd(w)) for w in DIFF_ROLL_WINDOWS]
+        self.x_hist = {c: deque(maxlen=max(EXOG_LAGS)) for c in self.exog_cols}
+        self.x_rolls = {c: [_RollingMean(w) for w in EXOG_ROLL_WINDOWS] for c in self.exog_cols}
+
+        # shift(1) 로 생기는 첫 NaN 자리
+        for kernels in self.y_rolls + self.d_rolls:
+            for k in kernels:
+                k.push(np.nan)
+        for kernels in self.x_rolls.values():
+            for k in kernels:
+                k.push(np.nan)
+
+        y_vals = df[target_col].to_numpy(dtype=float)
+        x_vals = {c: df[c].to_numpy(dtype=float) for c in self.exog_cols}
+        for i in range(len(df)):
+            self._push(y_vals[i], {c: x_vals[c][i] for c in self.exog_cols})
+
+    def _push(self, y, exog):
+        prev_y = self.y_hist[-1] if self.y_hist else np.nan
+        d = y - prev_y
+
+        self.y_hist.append(y)
+        self.d_hist.append(d)
+        for k_mean, k_std in self.y_rolls:
+            k_mean.push(y)
+            k_std.push(y)
+        for k_mean, k_std in self.d_rolls:
+            k_mean.push(d)
+            k_std.push(d)
+        for col in self.exog_cols:
+            self.x_hist[col].append(exog[col])
+            for k in self.x_rolls[col]:
+                k.push(exog[col])
+
+    @staticmethod
+    def _lag(buf, lag):
+        return buf[-lag] if len(buf) >= lag else np.nan
+
+    def next_features(self, next_idx):
+        row = [self._lag(self.y_hist, lag) for lag in self.lag_list]
+        for k_mean, k_std in self.y_rolls:
+            row += [k_mean.value(), k_std.value()]
+        row += [self._lag(self.d_hist, lag) for lag in DIFF_LAGS]
+        for k_mean, k_std in self.d_rolls:
+            row += [k_mean.value(), k_std.value()]
+        for col in self.exog_cols:
+            row += [self._lag(self.x_hist[col], lag) for lag in EXOG_LAGS]
+            row += [k.value() for k in self.x_rolls[col]]
+        row += [next_idx.hour, next_idx.dayofweek]
+        return np.array(row, dtype=float)
+
+    def append(self, next_idx, y_next):
+        # 외생변수는 기존 구현처럼 마지막 행 값을 그대로 이어 붙인다
+        exog = {c: self.x_hist[c][-1] for c in self.exog_cols}
+        self._push(y_next, exog)
+        self.last_idx = next_idx
+
+    def extend(self, df):
+        """새로 관측된 행(df, 시간 순)을 이어 붙인다. 처음부터 전체 df 로 만든 상태와 같아진다."""
+        if df.empty:
+            return
+        y_vals = df[self.target_col].to_numpy(dtype=float)
+        x_vals = {c: df[c].to_numpy(dtype=float) for c in self.exog_cols}
+        for i in range(len(df)):
+            self._push(y_vals[i], {c: x_vals[c][i] for c in self.exog_cols})
+        self.last_idx = df.index[-1]
+
+
 def recursive_forecast(df, model, target_col, n_steps, freq_td, feature_means, exog_cols):
-    data = df.copy()
+    state = IncrementalFeatureState(df, target_col, exog_cols=exog_cols, lag_list=[2])
+    return roll_forward(state, model, n_steps, freq_td, feature_means)
+
+
+def roll_forward(state, model, n_steps, freq_td, feature_means):
+    """state 의 마지막 시점부터 n_steps 를 한 스텝씩 예측한다 (state 는 예측값으로 갱신됨)."""
+    means = feature_means.reindex(state.feature_names).to_numpy(dtype=float)
+    # 한 줄 예측은 DataFrame 변환 비용이 예측보다 커서 부스터에 ndarray 를 바로 넘긴다
+    booster = getattr(model, "booster_", model)
+
     preds = []
     idxs = []
 
     for _ in range(n_steps):
-        last_idx = data.index[-1]
-        next_idx = last_idx + freq_td
-
-        base_row = data.iloc[-1].copy()
-        base_row[target_col] = np.nan
-        data.loc[next_idx] = base_row
-
-        X_tmp, _ = make_features_with_diff(
-            data,
-            target_col,
-            exog_cols=exog_cols,
-            lag_list=[2],
-            dropna=False,
-        )
+        next_idx = state.last_idx + freq_td
 
-        x_next = X_tmp.loc[[next_idx]].fillna(feature_means)
-        y_next = model.predict(x_next)[0]
+        x_vec = state.next_features(next_idx)
+        x_vec = np.where(np.isnan(x_vec), means, x_vec)
+        y_next = booster.predict(x_vec[None, :])[0]
 
-        data.loc[next_idx, target_col] = y_next
+        state.append(next_idx, y_next)
         preds.append(y_next)
         idxs.append(next_idx)
 
     return pd.Series(preds, index=idxs)
 
 
-def main():
-    print("데이터 로드:", DATA_PATH)
-    df = pd.read_csv(DATA_PATH, parse_dates=["Timestamp"])
-    df = df.sort_values("Timestamp").set_index("Timestamp")
+# =====================================================================
+# 4. 직접(다중 horizon) 예측
+# =====================================================================
+def _with_horizon(X_origin, horizons, target_times):
+    """시작점 피처 행 옆에 horizon / 목표 시각 피처를 붙인다."""
+    return np.column_stack([
+        X_origin,
+        horizons,
+        target_times.hour,
+        target_times.dayofweek,
+    ]).astype(np.float32)
 
-    freq_td = df.index.to_series().diff().dropna().mode()[0]
-    steps_week = int(pd.Timedelta("7D") / freq_td)
-    print("추정 간격:", freq_td, " / 1주일 스텝 수:", steps_week)
 
-    X_all, y_all = make_features_with_diff(
-        df,
-        TARGET_COL,
-        exog_cols=EXOG_COLS
-    )
-    print("전체 피처 크기:", X_all.shape)
+def make_direct_dataset(df, X_train, target_col, n_steps, freq_td):
+    """
+    학습 구간의 시작점마다 여러 horizon 의 목표값을 붙인 학습 행렬.
+    horizon h 의 목표는 시작점 시각 + (h-1) * freq_td 의 관측값이며 학습 구간을 넘지 않는다.
+    direct_forecast 와 같은 정규 시각으로 맞추므로, 그 시각에 관측이 없는(빠진 구간) 칸은 뺀다.
+    """
+    y_full = df[target_col].to_numpy(dtype=float)
+    origin_times = X_train.index.to_numpy()
 
-    cutoff_time = X_all.index.max() - pd.Timedelta(days=TEST_DAYS)
-    X_train = X_all[X_all.index <= cutoff_time]
-    y_train = y_all.loc[X_train.index]
+    sel = np.arange(0, len(origin_times), DIRECT_ORIGIN_STRIDE)
+    offsets = (np.arange(len(sel)) % DIRECT_HORIZON_STRIDE) + 1
+    grid = DIRECT_HORIZON_STRIDE * np.arange(math.ceil(n_steps / DIRECT_HORIZON_STRIDE))
+    horizons = offsets[:, None] + grid[None, :]
+    target_times = origin_times[sel][:, None] + (horizons - 1) * pd.Timedelta(freq_td).to_timedelta64()
+    target_pos = df.index.get_indexer(target_times.ravel()).reshape(target_times.shape)
 
-    X_test  = X_all[X_all.index > cutoff_time]
-    y_test  = y_all.loc[X_test.index]
+    ok = (horizons <= n_steps) & (target_pos >= 0) & (target_times <= origin_times[-1])
+    y = y_full[np.where(ok, target_pos, 0)]
+    ok &= ~np.isnan(y)
 
-    print("Train:", X_train.shape, "Test:", X_test.shape)
+    rows, cols = np.nonzero(ok)
+    X_origin = X_train.to_numpy()[sel[rows]]
+    X = _with_horizon(X_origin, horizons[rows, cols], pd.DatetimeIndex(target_times[rows, cols]))
+
+    names = list(X_train.columns) + DIRECT_EXTRA_COLS
+    return pd.DataFrame(X, columns=names), y[rows, cols]
+
+
+def fit_direct_model(df, X_train, target_col, n_steps, freq_td, params):
+    X_dir, y_dir = make_direct_dataset(df, X_train, target_col, n_steps, freq_td)
+    print("직접 예측 학습 행렬:", X_dir.shape)
+    model = LGBMRegressor(**params)
+    model.fit(X_dir, y_dir)
+    return model
+
+
+def direct_forecast(df, model, target_col, n_steps, freq_td, feature_means, exog_cols):
+    """다음 시점 피처 한 줄을 horizon 수만큼 펼쳐 한 번의 predict 로 전체 기간을 예측."""
+    next_idx = df.index[-1] + freq_td
+
+    # 다음 시점 피처는 가장 긴 창/lag 만큼의 꼬리 구간만 있으면 된다
+    tail = df.iloc[-HISTORY_SPAN:]
+    tail = tail.reindex(tail.index.append(pd.DatetimeIndex([next_idx])))
+    X_tail, names = build_feature_matrix(tail, target_col, exog_cols=exog_cols)
+
+    means = feature_means.reindex(names).to_numpy(dtype=float)
+    x0 = np.where(np.isnan(X_tail[-1]), means, X_tail[-1])
+
+    horizons = np.arange(1, n_steps + 1)
+    times = pd.DatetimeIndex(next_idx + (horizons - 1) * freq_td)
+    X = _with_horizon(np.tile(x0, (n_steps, 1)), horizons, times)
+
+    preds = model.predict(pd.DataFrame(X, columns=names + DIRECT_EXTRA_COLS))
+    return pd.Series(preds, index=times)
+
+
+# =====================================================================
+# 5. Optuna 탐색 (병렬 + 영속 스터디)
+# =====================================================================
+def make_fold_datasets(X_train, y_train, n_splits=5):
+    """
+    TimeSeriesSplit 각 폴드의 lgb.Dataset 을 한 번만 만들어(히스토그램 bin 포함)
+    모든 trial 이 재사용하도록 돌려준다.
+    X_train 이 OnDiskFeatures 면 y_train 은 무시하고, 폴드마다 디스크에서 배치로 읽어 만든다.
+    """
+    ds_params = {
+        "verbose": -1,
+        "seed": SEED,
+        # trial 마다 min_child_samples 가 달라지므로 bin 사전 필터링은 끈다
+        "feature_pre_filter": False,
+    }
+    folds = []
+    # 폴드는 연속 구간이라 슬라이스(복사 없는 뷰)로 자른다
+    for tr_idx, val_idx in TimeSeriesSplit(n_splits=n_splits).split(np.empty((len(X_train), 0))):
+        tr = slice(tr_idx[0], tr_idx[-1] + 1)
+        va = slice(val_idx[0], val_idx[-1] + 1)
+        tr_data, tr_label, names = _train_data(X_train, y_train, tr)
+        va_data, y_val, _ = _train_data(X_train, y_train, va)
+        X_val = X_train.X[va] if isinstance(X_train, OnDiskFeatures) else va_data
+
+        train_set = lgb.Dataset(
+            tr_data, label=tr_label, feature_name=names,
+            params=ds_params, free_raw_data=True,
+        ).construct()
+        val_set = lgb.Dataset(
+            va_data, label=y_val, reference=train_set, feature_name=names,
+            params=ds_params, free_raw_data=True,
+        ).construct()
+        folds.append((train_set, val_set, X_val, y_val))
+    return folds
+
+
+def make_objective(X_train, y_train, n_jobs=None):
+    folds = None
 
-    # Optuna 목적함수
     def objective(trial):
+        nonlocal folds
+        claim_trial(trial)
+        if folds is None:
+            t0 = time.perf_counter()
+            folds = make_fold_datasets(X_train, y_train)
+            trial.set_user_attr("fold_setup_seconds", time.perf_counter() - t0)
+
+        # LGBMRegressor(**params) 와 같은 설정을 네이티브 API 이름으로 넘긴다
         params = {
             "objective": "regression",
             "metric": "mae",
             "boosting_type": "gbdt",
-            "random_state": SEED,
+            "seed": SEED,
             "verbose": -1,
+            "feature_pre_filter": False,
             "learning_rate":    trial.suggest_float("learning_rate", 0.01, 0.2),
             "num_leaves":       trial.suggest_int("num_leaves", 20, 200),
             "max_depth":        trial.suggest_int("max_depth", -1, 20),
@@ -190,36 +912,577 @@ def main():
             "colsample_bytree": trial.suggest_float("colsample_bytree", 0.6, 1.0),
             "reg_alpha":        trial.suggest_float("reg_alpha", 0.0, 2.0),
             "reg_lambda":       trial.suggest_float("reg_lambda", 0.0, 2.0),
-            "n_estimators":     1000,
         }
+        if n_jobs is not None:
+            params["num_threads"] = n_jobs
 
-        tscv = TimeSeriesSplit(n_splits=5)
         maes = []
+        fold_seconds = []
 
-        for tr_idx, val_idx in tscv.split(X_train):
-            X_tr, X_val = X_train.iloc[tr_idx], X_train.iloc[val_idx]
-            y_tr, y_val = y_train.iloc[tr_idx], y_train.iloc[val_idx]
-
-            model = LGBMRegressor(**params)
-            model.fit(
-                X_tr, y_tr,
-                eval_set=[(X_val, y_val)],
-                eval_metric="mae",
+        for step, (train_set, val_set, X_val, y_val) in enumerate(folds):
+            t0 = time.perf_counter()
+            booster = lgb.train(
+                params,
+                train_set,
+                num_boost_round=1000,
+                valid_sets=[val_set],
                 callbacks=[
                     lgb.early_stopping(50, verbose=False),
                     lgb.log_evaluation(period=0),
                 ],
             )
 
-            pred = model.predict(X_val)
+            pred = booster.predict(X_val, num_iteration=booster.best_iteration)
             mae = mean_absolute_error(y_val, pred)
             maes.append(mae)
+            fold_seconds.append(time.perf_counter() - t0)
+            trial.set_user_attr("fold_seconds", fold_seconds)
+
+            # 폴드가 끝날 때마다 누적 평균 MAE 를 보고해 나쁜 trial 은 일찍 끊는다
+            trial.report(np.mean(maes), step)
+            if trial.should_prune():
+                raise optuna.TrialPruned()
 
         return np.mean(maes)
 
-    sampler = optuna.samplers.TPESampler(seed=SEED)
-    study = optuna.create_study(direction="minimize", sampler=sampler)
-    study.optimize(objective, n_trials=N_TRIALS)
+    return objective
+
+
+def make_pruner(kind=PRUNER):
+    if kind == "median":
+        # 첫 폴드는 학습 구간이 짧아 변동이 크므로 두 번째 폴드부터 판단
+        return optuna.pruners.MedianPruner(n_startup_trials=5, n_warmup_steps=1)
+    if kind == "hyperband":
+        return optuna.pruners.HyperbandPruner(min_resource=1, max_resource=5)
+    return optuna.pruners.NopPruner()
+
+
+def make_storage(path):
+    """여러 프로세스가 함께 쓰는 로컬 파일 기반 Optuna 저장소."""
+    try:
+        from optuna.storages.journal import JournalFileBackend
+    except ImportError:  # optuna < 4.0
+        from optuna.storages import JournalFileStorage as JournalFileBackend
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    return optuna.storages.JournalStorage(JournalFileBackend(str(path)))
+
+
+def claim_trial(trial):
+    """trial 을 돌리는 프로세스(기기 이름 + pid)를 남긴다. 다른 실행이 죽은 trial 을 가려낼 때 쓴다."""
+    trial.set_user_attr("owner", {"host": socket.gethostname(), "pid": os.getpid()})
+
+
+def _trial_owner_alive(trial):
+    owner = trial.user_attrs.get("owner")
+    if owner is None:
+        # 막 시작해 소유자를 아직 못 적은 trial 일 수 있다
+        started = pd.Timestamp(trial.datetime_start)
+        return pd.Timestamp.now(tz=started.tz) - started < pd.Timedelta(seconds=STALE_GRACE_SECONDS)
+    if owner["host"] != socket.gethostname() or os.name == "nt":
+        # 다른 기기의 프로세스나 Windows(os.kill(pid, 0) 이 신호 확인이 아님)는 확인할 수 없으니 살아 있다고 본다
+        return True
+    try:
+        os.kill(owner["pid"], 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def fail_stale_trials(study):
+    """
+    소유 프로세스가 끝난 RUNNING trial(중단된 실행의 흔적)만 실패 처리하고 같은 파라미터로 다시 넣는다.
+    다른 프로세스가 아직 돌리고 있는 trial 은 건드리지 않는다. 처리한 trial 수를 돌려준다.
+    JournalStorage 는 Optuna 하트비트를 지원하지 않아 소유 프로세스가 살아 있는지로 판단한다.
+    """
+    n = 0
+    for t in study.get_trials(deepcopy=False, states=(TrialState.RUNNING,)):
+        if _trial_owner_alive(t):
+            continue
+        try:
+            study.tell(t.number, state=TrialState.FAIL)
+        except ValueError:
+            continue   # 동시에 시작한 다른 실행이 먼저 처리함
+        # skip_if_exists 는 방금 실패 처리한 trial 자신과도 겹쳐 보므로 쓰지 않는다
+        study.enqueue_trial(t.params)
+        n += 1
+    return n
+
+
+def _tuning_worker(worker_id, storage_path, study_name, X_train, y_train, n_trials, n_jobs, pruner):
+    set_verbosity(OPTUNA_ERROR)
+    # 워커마다 시드를 달리해야 초기 랜덤 탐색이 겹치지 않는다
+    sampler = optuna.samplers.TPESampler(seed=SEED + worker_id)
+    study = optuna.load_study(
+        study_name=study_name, storage=make_storage(storage_path),
+        sampler=sampler, pruner=make_pruner(pruner),
+    )
+    study.optimize(make_objective(X_train, y_train, n_jobs=n_jobs), n_trials=n_trials)
+
+
+def run_study(X_train, y_train, study_name, storage_path=OPTUNA_STORAGE,
+              n_trials=N_TRIALS, n_workers=N_WORKERS, pruner=PRUNER, n_threads=None):
+    """
+    저장소에 스터디를 만들거나 이어서 열고, 목표 trial 수까지 남은 만큼만 탐색한다.
+    n_workers > 1 이면 프로세스마다 LightGBM 스레드를 나눠 준다 (n_threads: 나눌 전체 스레드, 기본 CPU 수).
+    """
+    storage = make_storage(storage_path)
+    study = optuna.create_study(
+        study_name=study_name,
+        storage=storage,
+        direction="minimize",
+        sampler=optuna.samplers.TPESampler(seed=SEED),
+        pruner=make_pruner(pruner),
+        load_if_exists=True,
+    )
+
+    # 중단된 실행에서 남은 RUNNING trial 만 다시 넣는다 (함께 돌고 있는 다른 실행의 trial 은 그대로)
+    n_stale = fail_stale_trials(study)
+    if n_stale:
+        print(f"중단된 trial {n_stale}개를 다시 넣었습니다.")
+
+    n_done = len(study.get_trials(deepcopy=False, states=(TrialState.COMPLETE, TrialState.PRUNED)))
+    remaining = max(0, n_trials - n_done)
+    print(f"Optuna 스터디: {study_name} (완료 {n_done}/{n_trials}, 워커 {n_workers})")
+
+    if remaining == 0:
+        return study
+
+    if n_workers <= 1:
+        study.optimize(make_objective(X_train, y_train, n_jobs=n_threads), n_trials=remaining)
+        return study
+
+    n_jobs = max(1, (n_threads or os.cpu_count() or 1) // n_workers)
+    per_worker = [remaining // n_workers + (i < remaining % n_workers) for i in range(n_workers)]
+    with ProcessPoolExecutor(max_workers=n_workers) as pool:
+        futures = [
+            pool.submit(_tuning_worker, i, str(storage_path), study_name,
+                        X_train, y_train, k, n_jobs, pruner)
+            for i, k in enumerate(per_worker) if k > 0
+        ]
+        for f in futures:
+            f.result()
+
+    return optuna.load_study(study_name=study_name, storage=storage)
+
+
+# =====================================================================
+# 6. 모델 아티팩트 (학습 / 예측 분리)
+# =====================================================================
+def save_model_artifact(model, meta, model_dir=MODEL_DIR):
+    """
+    부스터(model.txt)와 메타데이터(meta.json)를 새 버전 폴더에 쓰고 LATEST 를 그 버전으로 바꾼다.
+    meta 에는 피처 순서, feature_means, freq 등 예측에 필요한 값이 모두 들어 있어야 한다.
+    """
+    model_dir = Path(model_dir)
+    version = f"{pd.Timestamp.now():%Y%m%d-%H%M%S}-{meta['data_key'][:8]}"
+    final = model_dir / version
+    tmp = model_dir / (version + ".tmp")
+    if tmp.exists():
+        shutil.rmtree(tmp)
+    tmp.mkdir(parents=True)
+
+    booster = getattr(model, "booster_", model)
+    booster.save_model(str(tmp / "model.txt"))
+    meta = {
+        "artifact_version": ARTIFACT_VERSION,
+        "feature_version": FEATURE_VERSION,
+        "model_version": version,
+        "created_at": pd.Timestamp.now().isoformat(),
+        **meta,
+    }
+    (tmp / "meta.json").write_text(json.dumps(meta, ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(tmp, final)
+
+    latest_tmp = model_dir / "LATEST.tmp"
+    latest_tmp.write_text(version, encoding="utf-8")
+    os.replace(latest_tmp, model_dir / "LATEST")
+    return final
+
+
+def load_model_artifact(model_dir=MODEL_DIR, version=None):
+    """(lgb.Booster, meta). version 을 주지 않으면 LATEST 가 가리키는 버전."""
+    model_dir = Path(model_dir)
+    if version is None:
+        latest = model_dir / "LATEST"
+        if not latest.exists():
+            raise FileNotFoundError(f"저장된 모델이 없습니다: {latest} (먼저 학습을 실행하세요)")
+        version = latest.read_text(encoding="utf-8").strip()
+
+    path = model_dir / version
+    meta = json.loads((path / "meta.json").read_text(encoding="utf-8"))
+    if meta.get("artifact_version") != ARTIFACT_VERSION or meta.get("feature_version") != FEATURE_VERSION:
+        raise ValueError(
+            f"모델 {version} 은 현재 코드와 형식이 다릅니다 "
+            f"(artifact {meta.get('artifact_version')}/{ARTIFACT_VERSION}, "
+            f"feature {meta.get('feature_version')}/{FEATURE_VERSION}). 다시 학습하세요."
+        )
+    booster = lgb.Booster(model_file=str(path / "model.txt"))
+    return booster, meta
+
+
+def forecast_from_artifact(df, booster, meta, n_steps=None):
+    """저장된 모델로 df 마지막 시점 이후 n_steps 를 예측한다 (재학습 없음)."""
+    freq_td = pd.Timedelta(meta["freq"])
+    if n_steps is None:
+        n_steps = meta["n_steps"]
+    if meta["strategy"] == "direct" and n_steps > meta["n_steps"]:
+        raise ValueError(f"직접 예측 모델은 학습한 {meta['n_steps']} 스텝까지만 예측할 수 있습니다.")
+
+    fn = direct_forecast if meta["strategy"] == "direct" else recursive_forecast
+    return fn(
+        df=df,
+        model=booster,
+        target_col=meta["target_col"],
+        n_steps=n_steps,
+        freq_td=freq_td,
+        feature_means=pd.Series(meta["feature_means"]),
+        exog_cols=meta["exog_cols"],
+    )
+
+
+class LiveForecaster:
+    """
+    저장된 모델 + 관측 이력의 증분 피처 상태.
+    처음 update 는 마지막 HISTORY_SPAN 행만으로 상태를 만들고 (전체 이력을 넘길 필요 없음),
+    이후 update 로 새 측정값만 밀어 넣는다. forecast 는 상태 사본에서 굴리므로 여러 번 불러도 된다.
+    대시보드처럼 여러 스레드가 공유하는 경우를 위해 잠금을 건다.
+    """
+
+    def __init__(self, booster, meta):
+        self.booster = booster
+        self.meta = meta
+        self.freq_td = pd.Timedelta(meta["freq"])
+        self.feature_means = pd.Series(meta["feature_means"])
+        self.state = None
+        self.tail = None      # 직접 예측용 마지막 HISTORY_SPAN 행
+        self.lock = threading.Lock()
+
+    @property
+    def last_idx(self):
+        return None if self.tail is None else self.tail.index[-1]
+
+    def update(self, df):
+        """df 중 지금까지 본 마지막 시각 이후 행만 반영한다. 반영한 행 수를 돌려준다."""
+        with self.lock:
+            if self.tail is not None:
+                df = df[df.index > self.tail.index[-1]]
+            if df.empty:
+                return 0
+
+            if self.meta["strategy"] != "direct":
+                if self.state is None:
+                    # 다음 피처 한 줄은 마지막 HISTORY_SPAN 행으로 정해진다
+                    self.state = IncrementalFeatureState(
+                        df.iloc[-HISTORY_SPAN:], self.meta["target_col"],
+                        exog_cols=self.meta["exog_cols"], lag_list=[2],
+                    )
+                else:
+                    self.state.extend(df)
+            tail = df if self.tail is None else pd.concat([self.tail, df])
+            self.tail = tail.iloc[-HISTORY_SPAN:]
+            return len(df)
+
+    def forecast(self, n_steps=None):
+        with self.lock:
+            if self.tail is None:
+                raise ValueError("update 로 관측값을 먼저 넣어야 합니다.")
+            tail = self.tail
+            state = copy.deepcopy(self.state)
+
+        if self.meta["strategy"] == "direct":
+            return forecast_from_artifact(tail, self.booster, self.meta, n_steps)
+        if n_steps is None:
+            n_steps = self.meta["n_steps"]
+        return roll_forward(state, self.booster, n_steps, self.freq_td, self.feature_means)
+
+
+# =====================================================================
+# 7. 실행 리포트 (단계별 시간 / 메모리)
+# =====================================================================
+def peak_rss_mb(children=False):
+    """
+    지금까지의 최대 RSS (MB). children=True 면 끝난 자식 프로세스(Optuna 워커) 중 최대.
+    resource 모듈이 없는 환경(Windows)에서는 None.
+    """
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF)
+    # ru_maxrss 단위: Linux 는 KB, macOS 는 바이트
+    scale = 1 if sys.platform == "darwin" else 1024
+    return usage.ru_maxrss * scale / 1e6
+
+
+class RunReport:
+    """
+    단계별 소요 시간과 그 단계가 끝났을 때의 최대 RSS 를 모아 JSON 으로 쓴다.
+    최대 RSS 는 프로세스 전체의 최고점이라, 그 단계에서 최고점을 올린 양(peak_rss_growth_mb)도 함께 남긴다.
+    """
+
+    def __init__(self, cmd):
+        self.started_at = pd.Timestamp.now()
+        self.t0 = time.perf_counter()
+        self.info = {"cmd": cmd}
+        self.stages = []
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """with 블록 하나를 한 단계로 잰다. 블록 안에서 돌려받은 dict 에 단계별 부가 정보를 넣을 수 있다."""
+        extra = {}
+        rss0 = peak_rss_mb()
+        t0 = time.perf_counter()
+        try:
+            yield extra
+        finally:
+            seconds = time.perf_counter() - t0
+            rss = peak_rss_mb()
+            self.stages.append({
+                "stage": name,
+                "seconds": seconds,
+                "peak_rss_mb": rss,
+                "peak_rss_growth_mb": None if rss is None else rss - rss0,
+                **extra,
+            })
+            rss_txt = "" if rss is None else f" / 최대 RSS {rss:,.0f} MB"
+            print(f"단계 {name}: {seconds:.2f} s{rss_txt}")
+
+    def write(self, path=REPORT_PATH):
+        report = {
+            **self.info,
+            "started_at": self.started_at.isoformat(),
+            "finished_at": pd.Timestamp.now().isoformat(),
+            "total_seconds": time.perf_counter() - self.t0,
+            "peak_rss_mb": peak_rss_mb(),
+            "children_peak_rss_mb": peak_rss_mb(children=True),
+            "stages": self.stages,
+        }
+        path = Path(path)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps(report, ensure_ascii=False, indent=2, default=str), encoding="utf-8")
+        os.replace(tmp, path)
+        return path
+
+
+def trial_timings(study, since):
+    """since 이후 시작한 trial 들의 상태/점수/소요 시간/폴드별 시간 (이번 실행분)."""
+    rows = []
+    for t in study.get_trials(deepcopy=False):
+        if t.datetime_start is None or t.datetime_start < since:
+            continue
+        end = t.datetime_complete
+        rows.append({
+            "number": t.number,
+            "state": t.state.name,
+            "value": t.value,
+            "seconds": None if end is None else (end - t.datetime_start).total_seconds(),
+            "fold_seconds": t.user_attrs.get("fold_seconds", []),
+            "fold_setup_seconds": t.user_attrs.get("fold_setup_seconds"),
+        })
+    return rows
+
+
+# =====================================================================
+# 8. 실행
+# =====================================================================
+def site_output_paths(site=None, model_dir=None):
+    """
+    지점별 산출물 경로 {model_dir, out_path, report_path}. 기본 지점은 위 설정값(data/ 바로 아래)과 같다.
+    model_dir 을 주면 기본 모델 폴더 대신 그 폴더를 쓴다.
+    """
+    root = site_dir(site)
+    return {
+        "model_dir": root / MODEL_DIR.name if model_dir is None else Path(model_dir),
+        "out_path": root / OUT_PATH.name,
+        "report_path": root / REPORT_PATH.name,
+    }
+
+
+def load_training_frame(report=None, site=None):
+    """지점의 센서 테이블 (Timestamp 인덱스, float64) + 데이터 경로 + 추정 간격."""
+    if report is None:
+        report = RunReport(None)
+    paths = site_paths(site)
+
+    with report.stage("load") as info:
+        source = sensor_data_source(**paths)
+        print("데이터 로드:", source)
+        df = load_sensor_data(**paths).set_index("Timestamp")
+        print("센서 테이블:", memory_report(df))
+        # 저장소는 float32 이지만 학습은 float64 로 (차분·롤링 누적 오차, 증분 예측기와의 일치)
+        float_cols = df.select_dtypes(include="float32").columns
+        df[float_cols] = df[float_cols].astype(np.float64)
+        info.update(source=str(source), rows=len(df))
+
+    with report.stage("infer_freq"):
+        freq_td = df.index.to_series().diff().dropna().mode()[0]
+    return df, source, freq_td
+
+
+def load_features_out_of_core(report, chunk_rows=200_000, site=None):
+    """
+    --out-of-core 학습 입력. 원본을 조각으로 읽어 디스크 피처 행렬을 만들고(같은 데이터면 재사용),
+    테스트 구간 평가와 예측 시작 상태에 필요한 최근 원본만 메모리에 올린다.
+    (OnDiskFeatures, 최근 원본 DataFrame, 데이터 경로, 추정 간격, 캐시 키) 를 돌려준다.
+    """
+    paths = site_paths(site)
+    source = sensor_data_source(**paths)
+    cache_key = feature_cache_key(source, TARGET_COL, EXOG_COLS, site=get_site(site)["id"])
+    out_dir = FEATURE_CACHE_DIR / f"{cache_key}-rows"
+
+    with report.stage("features") as info:
+        if (out_dir / "schema.json").exists():
+            print("디스크 피처 사용:", out_dir)
+            features = OnDiskFeatures(out_dir)
+        else:
+            print("디스크 피처 생성:", source, "→", out_dir)
+            chunks = iter_sensor_chunks(**paths, chunk_rows=chunk_rows)
+            features = write_features_out_of_core(chunks, out_dir, TARGET_COL, EXOG_COLS)
+        info.update(source=str(source), shape=list(features.shape), out_of_core=True)
+    freq_td = pd.Timedelta(features.schema["freq"])
+
+    with report.stage("load") as info:
+        last = sensor_data_bounds(**paths)[1]
+        start = last - pd.Timedelta(days=TEST_DAYS + 1) - HISTORY_SPAN * freq_td
+        df = load_sensor_data(**paths, start=start).set_index("Timestamp")
+        float_cols = df.select_dtypes(include="float32").columns
+        df[float_cols] = df[float_cols].astype(np.float64)
+        info.update(rows=len(df), start=start.isoformat())
+    print("최근 원본:", memory_report(df))
+    return features, df, source, freq_td, cache_key
+
+
+def write_forecast(future, out_path=OUT_PATH):
+    future.index.name = "Timestamp"
+    future.to_frame(name="Forecast_Chlorophyll_Kalman").to_csv(
+        out_path,
+        index=True,
+        encoding="utf-8-sig"
+    )
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="클로로필 예측 모델 학습(train) / 저장된 모델로 예측만 다시 생성(forecast)"
+    )
+    parser.add_argument("cmd", nargs="?", choices=["train", "forecast"], default="train",
+                        help="train: 탐색+학습+모델 저장+예측 (기본값) / forecast: 저장된 모델로 예측만")
+    parser.add_argument("--site", action="append", default=None,
+                        help="관측 지점 id (data/sites.json). 여러 번 줄 수 있고 all 이면 전체 지점. "
+                             "기본: 첫 지점")
+    parser.add_argument("--site-workers", type=int, default=None,
+                        help="지점 여러 곳을 동시에 돌리는 프로세스 수 (기본: 지점 수와 CPU 수 중 작은 값)")
+    parser.add_argument("--workers", type=int, default=N_WORKERS,
+                        help="지점마다 Optuna 병렬 워커(프로세스) 수")
+    parser.add_argument("--n-trials", type=int, default=N_TRIALS,
+                        help="스터디 전체 목표 trial 수 (이전 실행분 포함)")
+    parser.add_argument("--storage", type=Path, default=OPTUNA_STORAGE,
+                        help="Optuna 저널 파일 경로 (지점끼리 공유, 스터디 이름에 데이터 키가 들어감)")
+    parser.add_argument("--pruner", choices=["median", "hyperband", "none"], default=PRUNER,
+                        help="폴드 단위 trial 가지치기 방식")
+    parser.add_argument("--strategy", choices=["recursive", "direct"], default=STRATEGY,
+                        help="7일 예측 방식 (재귀 1스텝 / horizon 피처를 쓴 직접 예측)")
+    parser.add_argument("--horizon-days", type=int, default=None,
+                        help=f"예측 기간(일). 기본: 학습 {FORECAST_DAYS}일 / forecast 는 모델 학습 시 기간. "
+                             "30/90 으로 주면 대시보드에서 장기 예보 카드를 볼 수 있다")
+    parser.add_argument("--model-dir", type=Path, default=None,
+                        help="모델 아티팩트 폴더 (버전별 하위 폴더 + LATEST). "
+                             "기본: 지점 폴더의 models, 지점이 여럿이면 <폴더>/<지점 id>")
+    parser.add_argument("--model-version", default=None,
+                        help="forecast 에 쓸 모델 버전 (기본: LATEST, 지점 하나일 때만)")
+    parser.add_argument("--out-of-core", action="store_true",
+                        help="원본을 조각으로 읽어 디스크(float32 메모리 맵)에 피처를 쓰고 거기서 학습 "
+                             "(전체 피처 프레임을 메모리에 만들지 않음, recursive 전용)")
+    parser.add_argument("--chunk-rows", type=int, default=200_000,
+                        help="--out-of-core 에서 단일 Parquet/CSV 를 읽는 조각 크기 (파티션 저장소는 월 단위)")
+    return parser.parse_args(argv)
+
+
+def resolve_sites(names):
+    """--site 값 → 지점 id 목록 (중복 제거, 입력 순서). 없으면 기본 지점 하나."""
+    sites = read_sites()
+    if not names:
+        return [sites[0]["id"]]
+    if "all" in names:
+        return [site["id"] for site in sites]
+    return list(dict.fromkeys(get_site(name, sites)["id"] for name in names))
+
+
+def run_forecast(args, site=None, threads=None):
+    """저장된 모델로 지점의 최신 데이터 이후를 예측해 예측 파일에 쓴다 (Optuna 탐색/재학습 없음)."""
+    out = site_output_paths(site, args.model_dir)
+    report = RunReport("forecast")
+    report.info["site"] = get_site(site)["id"]
+    with report.stage("load_model"):
+        booster, meta = load_model_artifact(out["model_dir"], args.model_version)
+    print("모델:", meta["model_version"], f"({meta['strategy']}, 학습 데이터 ~{meta['trained_until']})")
+    report.info["model_version"] = meta["model_version"]
+
+    df, _, freq_td = load_training_frame(report, site)
+    if freq_td != pd.Timedelta(meta["freq"]):
+        raise ValueError(f"데이터 간격 {freq_td} 가 모델 학습 간격 {meta['freq']} 과 다릅니다.")
+
+    n_steps = None
+    if args.horizon_days is not None:
+        n_steps = int(pd.Timedelta(days=args.horizon_days) / freq_td)
+    with report.stage(f"{meta['strategy']}_forecast") as info:
+        future = forecast_from_artifact(df, booster, meta, n_steps)
+        info["steps"] = len(future)
+    with report.stage("write_csv"):
+        write_forecast(future, out["out_path"])
+    print(f'{df.index[-1]} 이후 {len(future)} 스텝 예측값을 "{out["out_path"]}" 파일로 저장했습니다.')
+    print("실행 리포트:", report.write(out["report_path"]))
+    return {"model_version": meta["model_version"], "steps": len(future), "out_path": str(out["out_path"])}
+
+
+def run_training(args, site=None, threads=None):
+    """
+    지점 하나의 탐색 + 학습 + 모델 저장 + 예측. threads 를 주면 LightGBM 스레드를 그 수로 묶는다
+    (여러 지점을 동시에 돌릴 때 CPU 를 나눠 쓰도록).
+    """
+    site_id = get_site(site)["id"]
+    out = site_output_paths(site, args.model_dir)
+    report = RunReport("train")
+    report.info["site"] = site_id
+    horizon_days = args.horizon_days or FORECAST_DAYS
+    if args.out_of_core:
+        if args.strategy == "direct":
+            raise ValueError("--out-of-core 는 recursive 전략만 지원합니다 (직접 예측 학습 샘플은 전체 이력이 필요).")
+        X_all, df, source, freq_td, cache_key = load_features_out_of_core(report, args.chunk_rows, site)
+    else:
+        df, source, freq_td = load_training_frame(report, site)
+    n_steps = int(pd.Timedelta(days=horizon_days) / freq_td)
+    print("추정 간격:", freq_td, f" / {horizon_days}일 스텝 수:", n_steps)
+
+    if not args.out_of_core:
+        with report.stage("features") as info:
+            cache_key = feature_cache_key(source, TARGET_COL, EXOG_COLS, site=site_id)
+            X_all, y_all = get_feature_matrix(df, cache_key, TARGET_COL, EXOG_COLS)
+            info["shape"] = list(X_all.shape)
+    print("전체 피처 크기:", X_all.shape)
+
+    cutoff_time = X_all.index.max() - pd.Timedelta(days=TEST_DAYS)
+    if args.out_of_core:
+        # 디스크 행렬은 시간 순이라 경계 위치 하나로 나눈다 (학습 구간은 경로만 가진 뷰)
+        k = X_all.index.searchsorted(cutoff_time, side="right")
+        X_train, y_train = X_all.rows(0, k), None
+        X_test, y_test = X_all.X[k:], X_all.y[k:]
+    else:
+        X_train = X_all[X_all.index <= cutoff_time]
+        y_train = y_all.loc[X_train.index]
+
+        X_test  = X_all[X_all.index > cutoff_time]
+        y_test  = y_all.loc[X_test.index]
+
+    print("Train:", X_train.shape, "Test:", X_test.shape)
+
+    study_name = f"lgbm_{cache_key}_test{TEST_DAYS}"
+    tuning_start = pd.Timestamp.now()
+    with report.stage("tuning") as info:
+        study = run_study(X_train, y_train, study_name, args.storage,
+                          args.n_trials, args.workers, args.pruner, n_threads=threads)
+        info["workers"] = args.workers
+        info["trials"] = trial_timings(study, tuning_start)
 
     print("\nBest Params:", study.best_params)
     print("Best CV MAE:", study.best_value)
@@ -233,20 +1496,32 @@ def main():
         "verbose": -1,
         "n_estimators": 1000,
     })
+    # 스레드 수는 실행 환경 설정이라 모델 메타데이터(params)에는 남기지 않는다
+    fit_params = best_params if threads is None else {**best_params, "n_jobs": threads}
 
-    final_model = LGBMRegressor(**best_params)
-    final_model.fit(X_train, y_train)
+    with report.stage("final_fit"):
+        if args.out_of_core:
+            data, label, names = _train_data(X_train, None, slice(None))
+            params = {k: v for k, v in fit_params.items() if k != "n_estimators"}
+            final_model = lgb.train(
+                params, lgb.Dataset(data, label=label, feature_name=names, params={"verbose": -1}),
+                num_boost_round=best_params["n_estimators"],
+            )
+        else:
+            final_model = LGBMRegressor(**fit_params)
+            final_model.fit(X_train, y_train)
 
-    y_pred = final_model.predict(X_test)
-    mae_test  = mean_absolute_error(y_test, y_pred)
-    rmse_test = np.sqrt(mean_squared_error(y_test, y_pred))
-    mape_test = mean_abs_percentage_error(y_test.values, y_pred)
+    with report.stage("backtest"):
+        y_pred = final_model.predict(X_test)
+        mae_test  = mean_absolute_error(y_test, y_pred)
+        rmse_test = np.sqrt(mean_squared_error(y_test, y_pred))
+        mape_test = mean_abs_percentage_error(np.asarray(y_test), y_pred)
 
-    bt_pair = df.loc[df.index > cutoff_time, [RAW_COL, TARGET_COL]].dropna()
-    mape_raw_vs_kalman = mean_abs_percentage_error(
-        bt_pair[RAW_COL].values,
-        bt_pair[TARGET_COL].values
-    )
+        bt_pair = df.loc[df.index > cutoff_time, [RAW_COL, TARGET_COL]].dropna()
+        mape_raw_vs_kalman = mean_abs_percentage_error(
+            bt_pair[RAW_COL].values,
+            bt_pair[TARGET_COL].values
+        )
 
     print("\n=== Test(백테스트) 성능 ===")
     print(f"[모델 vs Kalman 타깃] MAE  : {mae_test:.4f}")
@@ -254,25 +1529,108 @@ def main():
     print(f"[모델 vs Kalman 타깃] MAPE : {mape_test:.2f}%")
     print(f"[원본 vs Kalman     ] MAPE : {mape_raw_vs_kalman:.2f}%")
 
-    feature_means = X_train.mean()
-    future_week = recursive_forecast(
-        df=df,
-        model=final_model,
-        target_col=TARGET_COL,
-        n_steps=steps_week,
-        freq_td=freq_td,
-        feature_means=feature_means,
-        exog_cols=EXOG_COLS,
-    )
+    feature_means = X_train.column_means() if args.out_of_core else X_train.mean()
+    if args.strategy == "direct":
+        with report.stage("direct_fit"):
+            model = fit_direct_model(df, X_train, TARGET_COL, n_steps, freq_td, fit_params)
+        names = list(X_train.columns) + DIRECT_EXTRA_COLS
+    else:
+        model = final_model
+        names = list(X_train.columns)
 
-    future_week.index.name = "Timestamp"
-    future_week.to_frame(name="Forecast_Chlorophyll_Kalman").to_csv(
-        OUT_PATH,
-        index=True,
-        encoding="utf-8-sig"
-    )
+    # 예측에 필요한 모든 값을 모델과 함께 저장 → 이후에는 `forecast` 로 재학습 없이 예측
+    metrics = {"mae": mae_test, "rmse": float(rmse_test), "mape": mape_test}
+    with report.stage("save_model"):
+        artifact = save_model_artifact(model, {
+            "site": site_id,
+            "strategy": args.strategy,
+            "target_col": TARGET_COL,
+            "exog_cols": EXOG_COLS,
+            "feature_names": names,
+            "feature_means": {k: float(v) for k, v in feature_means.items()},
+            "freq": freq_td.isoformat(),
+            "n_steps": n_steps,
+            "trained_until": X_train.index.max().isoformat(),
+            "data_source": str(source),
+            "data_key": cache_key,
+            "params": best_params,
+            "metrics": metrics,
+        }, out["model_dir"])
+    print("\n모델 저장:", artifact)
+
+    with report.stage(f"{args.strategy}_forecast"):
+        booster, meta = load_model_artifact(out["model_dir"])
+        future_week = forecast_from_artifact(df, booster, meta)
+    with report.stage("write_csv"):
+        write_forecast(future_week, out["out_path"])
+
+    print(f'\n{horizon_days}일 미래 예측값을 "{out["out_path"]}" 파일로 저장했습니다.')
+    report.info.update(model_version=meta["model_version"], strategy=args.strategy, metrics=metrics)
+    print("실행 리포트:", report.write(out["report_path"]))
+    return {"model_version": meta["model_version"], "metrics": metrics, "out_path": str(out["out_path"])}
+
+
+def _run_site(fn, args, site, threads):
+    print(f"=== 지점 {site} 시작 ===")
+    return fn(args, site, threads)
+
+
+def run_sites(fn, site_args, site_workers=None):
+    """
+    지점마다 fn(args, site, threads) 를 프로세스 풀에서 동시에 돌린다 (피처·탐색·예측 모두 지점 안에서).
+    site_args 는 {지점 id: 그 지점의 실행 인자}. CPU 는 지점 프로세스끼리 나눠 LightGBM 스레드 수로 넘긴다.
+    한 지점이 실패해도 나머지는 끝까지 돌리고, 마지막에 실패한 지점을 모아 알린다.
+    """
+    sites = list(site_args)
+    n_workers = max(1, min(len(sites), site_workers or os.cpu_count() or 1))
+    threads = max(1, (os.cpu_count() or 1) // n_workers)
+    print(f"지점 {len(sites)}곳: {', '.join(sites)} (동시 {n_workers}곳, 지점당 LightGBM 스레드 {threads})")
+
+    results, failed = {}, {}
+    with ProcessPoolExecutor(max_workers=n_workers) as pool:
+        futures = {pool.submit(_run_site, fn, site_args[site], site, threads): site for site in sites}
+        for fut in as_completed(futures):
+            site = futures[fut]
+            try:
+                results[site] = fut.result()
+            except Exception as e:
+                failed[site] = e
+                print(f"=== 지점 {site} 실패: {type(e).__name__}: {e}")
+            else:
+                print(f"=== 지점 {site} 완료")
+
+    print("\n=== 지점별 결과 ===")
+    for site in sites:
+        if site in failed:
+            print(f"{site:<16} 실패: {failed[site]}")
+            continue
+        res = results[site]
+        metrics = res.get("metrics")
+        score = f"MAE {metrics['mae']:.4f} · MAPE {metrics['mape']:.2f}%  " if metrics else ""
+        print(f"{site:<16} {res['model_version']}  {score}→ {res['out_path']}")
+    if failed:
+        raise RuntimeError(f"{len(failed)}개 지점 실패: {', '.join(sorted(failed))}")
+    return results
+
+
+def main(args=None):
+    if args is None:
+        args = parse_args()
+    sites = resolve_sites(args.site)
+    fn = run_forecast if args.cmd == "forecast" else run_training
 
-    print(f'\n일주일 미래 예측값을 "{OUT_PATH}" 파일로 저장했습니다.')
+    if len(sites) == 1:
+        fn(args, sites[0])
+        return
+    if args.model_version is not None:
+        raise ValueError("--model-version 은 지점을 하나만 고를 때 쓸 수 있습니다.")
+    site_args = {}
+    for site in sites:
+        site_args[site] = args
+        if args.model_dir is not None:
+            # 지점끼리 모델 폴더(LATEST)를 나눠 쓰지 않도록 지점별 하위 폴더로
+            site_args[site] = argparse.Namespace(**{**vars(args), "model_dir": args.model_dir / site})
+    run_sites(fn, site_args, args.site_workers)
 
 
 if __name__ == "__main__":